@@ -10,6 +10,7 @@ import argparse
 import json
 import re
 import sys
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import NamedTuple
@@ -34,6 +35,12 @@ ARCH_RULES: dict[str, list[str]] = {
     "src/content/": ["src/render/"],
 }
 
+# Every prefix ARCH_RULES mentions, protected or forbidden.  A tuple lets
+# ``str.startswith`` reject unrelated paths in a single C-level call.
+_ARCH_PREFIXES: tuple[str, ...] = tuple(
+    sorted({p for k, v in ARCH_RULES.items() for p in (k, *v)})
+)
+
 # All recognized task-level field keys.
 _ALL_TASK_FIELDS = frozenset(
     {
@@ -57,6 +64,12 @@ _DEPLOY_BLOCK_FIELDS = frozenset({"enabled", "script", "env"})
 # Recognised keys inside the top-level "git" block.
 _GIT_BLOCK_FIELDS = frozenset({"enabled"})
 
+# Title characters that may not survive branch-name slugification.
+_TITLE_UNSAFE_RE = re.compile(r"[^a-zA-Z0-9 \-/+]")
+
+# Backticked task numbers on "Target task/point" lines in the preamble.
+_CHECKPOINT_REF_RE = re.compile(r"[Tt]arget (?:task|point)[^`\n]*`(\d+)`")
+
 
 # ---------------------------------------------------------------------------
 # Data model
@@ -69,7 +82,7 @@ class Issue(NamedTuple):
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     number: int
     title: str
@@ -81,6 +94,27 @@ class Task:
     ecosystem: str = ""
 
 
+@dataclass(frozen=True)
+class CheckContext:
+    """Per-roadmap lookups shared by the checks, built once per validation run."""
+
+    numbers: frozenset[int]
+    # Tasks grouped by dependency signature (tasks that may run in parallel).
+    by_deps: dict[frozenset[int], list[Task]]
+
+    @classmethod
+    def from_tasks(cls, tasks: list[Task]) -> CheckContext:
+        by_deps: dict[frozenset[int], list[Task]] = defaultdict(list)
+        for t in tasks:
+            by_deps[frozenset(t.depends_on)].append(t)
+        return cls(frozenset(t.number for t in tasks), dict(by_deps))
+
+
+def _context(tasks: list[Task], ctx: CheckContext | None) -> CheckContext:
+    """Return *ctx*, or build one for callers that invoke a check directly."""
+    return ctx if ctx is not None else CheckContext.from_tasks(tasks)
+
+
 # ---------------------------------------------------------------------------
 # Parsing
 # ---------------------------------------------------------------------------
@@ -108,26 +142,31 @@ def parse_roadmap(data: dict) -> tuple[str, list[Task]]:
         if task_id is None:
             continue
 
-        t = Task(
-            number=int(task_id),
-            title=str(title).strip(),
-            raw=entry,
-        )
-
-        # Extract fields
+        # Normalise every field first so each Task is constructed exactly once.
         outputs = entry.get("outputs", [])
         if isinstance(outputs, str):
-            t.outputs = [p.strip() for p in outputs.split(",") if p.strip()]
+            outputs = [p.strip() for p in outputs.split(",") if p.strip()]
         elif isinstance(outputs, list):
-            t.outputs = [str(o).strip() for o in outputs if str(o).strip()]
+            outputs = [str(o).strip() for o in outputs if str(o).strip()]
+        else:
+            outputs = []
 
         deps = entry.get("depends_on", [])
         if isinstance(deps, list):
-            t.depends_on = [int(d) for d in deps if isinstance(d, (int, float))]
+            deps = [int(d) for d in deps if isinstance(d, (int, float))]
+        else:
+            deps = []
 
-        t.acceptance = str(entry.get("acceptance", "")).strip()
-        t.agent = str(entry.get("agent", "")).strip()
-        t.ecosystem = str(entry.get("ecosystem", "")).strip()
+        t = Task(
+            number=int(task_id),
+            title=str(title).strip(),
+            raw=entry,
+            outputs=outputs,
+            depends_on=deps,
+            acceptance=str(entry.get("acceptance", "")).strip(),
+            agent=str(entry.get("agent", "")).strip(),
+            ecosystem=str(entry.get("ecosystem", "")).strip(),
+        )
 
         tasks.append(t)
 
@@ -139,7 +178,9 @@ def parse_roadmap(data: dict) -> tuple[str, list[Task]]:
 # ---------------------------------------------------------------------------
 
 
-def check_preamble(data: dict, _tasks: list[Task]) -> list[Issue]:
+def check_preamble(
+    data: dict, _tasks: list[Task], _ctx: CheckContext | None = None
+) -> list[Issue]:
     issues: list[Issue] = []
     eco = data.get("ecosystem", "")
     if eco and eco not in VALID_ECOSYSTEMS:
@@ -153,7 +194,9 @@ def check_preamble(data: dict, _tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_deploy_block(data: dict, tasks: list[Task]) -> list[Issue]:
+def check_deploy_block(
+    data: dict, tasks: list[Task], _ctx: CheckContext | None = None
+) -> list[Issue]:
     """Validate the optional top-level ``deploy`` block and per-task ``deploy`` flags."""
     issues: list[Issue] = []
     deploy = data.get("deploy")
@@ -187,7 +230,9 @@ def check_deploy_block(data: dict, tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_git_block(data: dict, _tasks: list[Task]) -> list[Issue]:
+def check_git_block(
+    data: dict, _tasks: list[Task], _ctx: CheckContext | None = None
+) -> list[Issue]:
     """Validate the optional top-level ``git`` block."""
     issues: list[Issue] = []
     git = data.get("git")
@@ -205,7 +250,9 @@ def check_git_block(data: dict, _tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_numbering(_data: dict, tasks: list[Task]) -> list[Issue]:
+def check_numbering(
+    _data: dict, tasks: list[Task], _ctx: CheckContext | None = None
+) -> list[Issue]:
     issues: list[Issue] = []
     if not tasks:
         issues.append(Issue("ERROR", "000", "No tasks found in file"))
@@ -227,13 +274,16 @@ def check_numbering(_data: dict, tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_fields(_data: dict, tasks: list[Task]) -> list[Issue]:
+def check_fields(
+    _data: dict, tasks: list[Task], _ctx: CheckContext | None = None
+) -> list[Issue]:
     issues: list[Issue] = []
     for t in tasks:
-        tag = f"{t.number:03d}"
-        # Milestone tasks don't require outputs or acceptance.
+        # Milestone tasks don't require outputs or acceptance; skip them before
+        # any per-task work (including formatting the tag).
         if t.agent == "milestone":
             continue
+        tag = f"{t.number:03d}"
         if not t.outputs:
             issues.append(Issue("ERROR", tag, "Missing required 'outputs' field"))
         if not t.acceptance:
@@ -267,7 +317,9 @@ def check_fields(_data: dict, tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_titles(_data: dict, tasks: list[Task]) -> list[Issue]:
+def check_titles(
+    _data: dict, tasks: list[Task], _ctx: CheckContext | None = None
+) -> list[Issue]:
     issues: list[Issue] = []
     for t in tasks:
         tag = f"{t.number:03d}"
@@ -280,7 +332,7 @@ def check_titles(_data: dict, tasks: list[Task]) -> list[Issue]:
                     f"Title is {word_count} words (max {MAX_TITLE_WORDS}): '{t.title}'",
                 )
             )
-        if re.search(r"[^a-zA-Z0-9 \-/+]", t.title):
+        if _TITLE_UNSAFE_RE.search(t.title):
             issues.append(
                 Issue(
                     "WARNING",
@@ -291,9 +343,11 @@ def check_titles(_data: dict, tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_depends_on(_data: dict, tasks: list[Task]) -> list[Issue]:
+def check_depends_on(
+    _data: dict, tasks: list[Task], ctx: CheckContext | None = None
+) -> list[Issue]:
     issues: list[Issue] = []
-    all_nums = {t.number for t in tasks}
+    all_nums = _context(tasks, ctx).numbers
     for t in tasks:
         tag = f"{t.number:03d}"
         for ref in t.depends_on:
@@ -320,18 +374,16 @@ def check_depends_on(_data: dict, tasks: list[Task]) -> list[Issue]:
 
 def _task_output_namespaces(task: Task) -> set[str]:
     """Set of all ARCH_RULES-relevant prefixes that appear in task outputs."""
-    all_prefixes = set(ARCH_RULES.keys())
-    for deps in ARCH_RULES.values():
-        all_prefixes.update(deps)
     ns: set[str] = set()
     for out in task.outputs:
-        for prefix in all_prefixes:
-            if out.startswith(prefix):
-                ns.add(prefix)
+        if out.startswith(_ARCH_PREFIXES):
+            ns.update(p for p in _ARCH_PREFIXES if out.startswith(p))
     return ns
 
 
-def check_architecture(_data: dict, tasks: list[Task]) -> list[Issue]:
+def check_architecture(
+    _data: dict, tasks: list[Task], _ctx: CheckContext | None = None
+) -> list[Issue]:
     """Tasks in a protected namespace must not depend on tasks in forbidden namespaces."""
     issues: list[Issue] = []
     task_ns: dict[int, set[str]] = {t.number: _task_output_namespaces(t) for t in tasks}
@@ -357,12 +409,14 @@ def check_architecture(_data: dict, tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_checkpoint_refs(data: dict, tasks: list[Task]) -> list[Issue]:
+def check_checkpoint_refs(
+    data: dict, tasks: list[Task], ctx: CheckContext | None = None
+) -> list[Issue]:
     """Warn if backtick numbers in 'Target task/point' lines don't exist as tasks."""
     issues: list[Issue] = []
-    all_nums = {t.number for t in tasks}
+    all_nums = _context(tasks, ctx).numbers
     preamble = _resolve_text(data.get("preamble", ""))
-    for m in re.finditer(r"[Tt]arget (?:task|point)[^`\n]*`(\d+)`", preamble):
+    for m in _CHECKPOINT_REF_RE.finditer(preamble):
         ref = int(m.group(1))
         if ref not in all_nums:
             issues.append(
@@ -375,7 +429,9 @@ def check_checkpoint_refs(data: dict, tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_single_root_task(_data: dict, tasks: list[Task]) -> list[Issue]:
+def check_single_root_task(
+    _data: dict, tasks: list[Task], _ctx: CheckContext | None = None
+) -> list[Issue]:
     """Exactly one task must have depends_on: [] (the project root / layer 0)."""
     issues: list[Issue] = []
     roots = [t for t in tasks if not t.depends_on]
@@ -400,34 +456,42 @@ def check_single_root_task(_data: dict, tasks: list[Task]) -> list[Issue]:
     return issues
 
 
-def check_disjoint_parallel_outputs(_data: dict, tasks: list[Task]) -> list[Issue]:
+def check_disjoint_parallel_outputs(
+    _data: dict, tasks: list[Task], ctx: CheckContext | None = None
+) -> list[Issue]:
     """Tasks that can run in parallel (same dependency set) must have disjoint outputs."""
     issues: list[Issue] = []
-    # Group tasks by their dependency signature (sorted tuple).
-    from collections import defaultdict
-
-    dep_groups: dict[tuple[int, ...], list[Task]] = defaultdict(list)
-    for t in tasks:
-        key = tuple(sorted(t.depends_on))
-        dep_groups[key].append(t)
-
-    for _key, group in dep_groups.items():
+    for group in _context(tasks, ctx).by_deps.values():
         if len(group) < 2:
             continue
-        # Pair-wise output overlap check within the group.
-        for i, a in enumerate(group):
-            for b in group[i + 1 :]:
-                overlap = set(a.outputs) & set(b.outputs)
-                if overlap:
-                    files = ", ".join(sorted(overlap))
-                    issues.append(
-                        Issue(
-                            "ERROR",
-                            f"{a.number:03d}",
-                            f"Parallel tasks {a.number:03d} and {b.number:03d} "
-                            f"share outputs: {files}",
-                        )
-                    )
+        # One counting pass per group; most groups have no duplicates at all.
+        counts: Counter[str] = Counter()
+        for t in group:
+            counts.update(set(t.outputs))
+        dupes = {out for out, n in counts.items() if n > 1}
+        if not dupes:
+            continue
+        # Map each duplicated output back to the tasks (by group index) owning it.
+        owners: dict[str, list[int]] = defaultdict(list)
+        for idx, t in enumerate(group):
+            for out in dupes.intersection(t.outputs):
+                owners[out].append(idx)
+        shared: dict[tuple[int, int], set[str]] = defaultdict(set)
+        for out, idxs in owners.items():
+            for pos, i in enumerate(idxs):
+                for j in idxs[pos + 1 :]:
+                    shared[(i, j)].add(out)
+        for i, j in sorted(shared):
+            a, b = group[i], group[j]
+            files = ", ".join(sorted(shared[(i, j)]))
+            issues.append(
+                Issue(
+                    "ERROR",
+                    f"{a.number:03d}",
+                    f"Parallel tasks {a.number:03d} and {b.number:03d} "
+                    f"share outputs: {files}",
+                )
+            )
     return issues
 
 
@@ -459,23 +523,32 @@ CHECKS: list[tuple[str, object]] = [
 def run_checks(path: Path) -> int:
     """Validate *path* (ROADMAP.json) and print a report; return 0 (clean) or 1 (errors found)."""
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
     except json.JSONDecodeError as exc:
         print(f"ERROR: Invalid JSON in {path}: {exc}")
         return 1
 
+    return run_checks_dict(data, source=str(path))
+
+
+def run_checks_dict(data: dict, source: str = "<dict>") -> int:
+    """Validate already-parsed ROADMAP *data* and print a report; return 0 or 1.
+
+    *source* is only used as the label in the report header.
+    """
     preamble, tasks = parse_roadmap(data)
 
     nums = sorted(t.number for t in tasks) if tasks else []
     range_str = f"{nums[0]:03d} to {nums[-1]:03d}" if nums else "n/a"
 
-    print(f"Checking : {path}")
+    print(f"Checking : {source}")
     print(f"Tasks    : {len(tasks)}  ({range_str})")
     print()
 
+    ctx = CheckContext.from_tasks(tasks)
     all_issues: list[Issue] = []
     for name, fn in CHECKS:
-        issues: list[Issue] = fn(data, tasks)  # type: ignore[operator]
+        issues: list[Issue] = fn(data, tasks, ctx)  # type: ignore[operator]
         errors_in = [i for i in issues if i.level == "ERROR"]
         warnings_in = [i for i in issues if i.level == "WARNING"]
         if errors_in:
@@ -4,6 +4,7 @@ import json
 import os
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 from rich import (
@@ -37,8 +38,7 @@ _console = Console(force_terminal=True, legacy_windows=False)
 
 # ── Budget constants ───────────────────────────────────────────────────────────
 
-with open("budget.json", encoding="utf-8") as _f:
-    _budget = json.load(_f)
+_budget = json.loads(Path("budget.json").read_bytes())
 
 MAX_ATTEMPTS: int = _budget["max_attempts_per_task"]
 MAX_PARALLEL_AGENTS: int = _budget.get("max_parallel_agents", 1)
@@ -63,6 +63,20 @@ PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 # ── Prompt rendering ───────────────────────────────────────────────────────────
 
 
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+@lru_cache(maxsize=128)
+def _load_template(path: str, mtime_ns: int, size: int) -> str:
+    """Read a template; cached per ``(path, mtime_ns, size)`` so edits are picked up."""
+    return Path(path).read_text(encoding="utf-8")
+
+
+def _clear_cache() -> None:
+    """Drop the memoised prompt templates."""
+    _load_template.cache_clear()
+
+
 def render_prompt(name: str, **kwargs: str) -> str:
     """Load ``prompts/<name>.md`` and replace ``{{KEY}}`` placeholders with *kwargs*.
 
@@ -74,23 +88,28 @@ def render_prompt(name: str, **kwargs: str) -> str:
         Rendered prompt string.
     """
     template_path = PROMPTS_DIR / f"{name}.md"
-    if not template_path.exists():
+    try:
+        st = template_path.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Prompt template not found: {template_path}\n"
             f"Expected one of: {sorted(p.stem for p in PROMPTS_DIR.glob('*.md'))}"
-        )
-    text = template_path.read_text(encoding="utf-8")
-    for key, value in kwargs.items():
-        text = text.replace(f"{{{{{key}}}}}", value)
-    return text
+        ) from None
+    text = _load_template(str(template_path), st.st_mtime_ns, st.st_size)
+    # One pass over the template; unknown placeholders are left as-is, and
+    # substituted values are never rescanned for further placeholders.
+    return _PLACEHOLDER_RE.sub(lambda m: kwargs.get(m.group(1), m.group(0)), text)
 
 
 # ── Utilities ──────────────────────────────────────────────────────────────────
 
 
+_SLUG_NONALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
 def slugify(task: str) -> str:
     """Convert a ``## NNN - Title`` heading to a lowercase safe slug for branch names."""
-    return re.sub(r"[^a-z0-9]+", "-", task.lower().lstrip("#").strip()).strip("-")
+    return _SLUG_NONALNUM_RE.sub("-", task.lower().lstrip("#").strip()).strip("-")
 
 
 # ── Verbosity mode ─────────────────────────────────────────────────────────────
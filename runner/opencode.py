@@ -1,18 +1,19 @@
 """opencode.py — All opencode invocations, model connectivity check, and budget guards."""
 
+import codecs
 import datetime
+import io
 import json
+import os
 import re
 import subprocess
 import sys
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 
-import questionary
-
 from runner.config import (
     _LOG_TAIL_LINES,
-    _PRICES,
     MONTHLY_LIMIT_TOKENS,
     PROJECTS_ROOT,
     ROADMAP_FILENAME,
@@ -20,6 +21,7 @@ from runner.config import (
     is_verbose,
     rbox,
     render_prompt,
+    slugify,
 )
 from runner.roadmap import (
     _detect_test_command,
@@ -30,6 +32,7 @@ from runner.roadmap import (
     get_tasks,
 )
 from runner.state import (
+    _BLENDED_USD_PER_TOKEN,
     _format_duration,
     _format_tokens,
     _load_budget_state,
@@ -42,10 +45,12 @@ from runner.state import (
     record_project_spend,
 )
 from runner.workspace import (
+    _file_key,
     _pkg_name,
-    _project_status,
+    _resolve_argv,
     get_roadmap_project_context,
     list_projects,
+    project_statuses,
     src_dir,
     tests_dir,
 )
@@ -63,20 +68,32 @@ _ANSI_RE = re.compile(
 
 
 def _strip_ansi(text: str) -> str:
-    """Remove all ANSI escape codes from *text*."""
+    """Remove all ANSI escape codes from *text*.
+
+    Every sequence starts with ESC, so lines without one (the vast majority of
+    agent output) skip the regex engine after a single C-level scan.
+    """
+    if "\x1b" not in text:
+        return text
     return _ANSI_RE.sub("", text)
 
 
-def _run_with_log(cmd: str, log_path: Path, *, echo: bool) -> int:
-    """Run *cmd* in a shell, write all output to *log_path*, and optionally echo to stdout.
+# Maximum number of bytes taken from the agent's stdout pipe per read.
+_PIPE_READ_SIZE = 65536
+
 
-    Uses ``stdout=PIPE`` + ``stderr=STDOUT`` to unify streams.  In sequential
-    mode (``echo=True``) each line is printed in real time so the user still
-    sees live progress.  In parallel mode (``echo=False``) output is captured
-    silently; the caller is responsible for printing a summary.
+def _run_with_log(cmd: str | list[str], log_path: Path, *, echo: bool) -> int:
+    """Run *cmd*, write all output to *log_path*, and optionally echo to stdout.
+
+    Uses ``stdout=PIPE`` + ``stderr=STDOUT`` to unify streams.  The pipe is
+    drained with ``os.read`` in blocks of whatever is available, and complete
+    lines are written out one block at a time rather than one line at a time.
+    In sequential mode (``echo=True``) each block is printed in real time so the
+    user still sees live progress.  In parallel mode (``echo=False``) output is
+    captured silently; the caller is responsible for printing a summary.
 
     Args:
-        cmd:      Shell command to execute.
+        cmd:      Argument vector to execute directly, or a shell command string.
         log_path: Destination log file (parent dirs created automatically).
         echo:     Stream each output line to stdout as it arrives.
 
@@ -87,23 +104,63 @@ def _run_with_log(cmd: str, log_path: Path, *, echo: bool) -> int:
     with log_path.open("w", encoding="utf-8", errors="replace") as log_fh:
         proc = subprocess.Popen(
             cmd,
-            shell=True,
+            shell=isinstance(cmd, str),
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
+            bufsize=0,
         )
         assert proc.stdout is not None
-        for line in proc.stdout:
-            log_fh.write(_strip_ansi(line))
+        # Same decoding as a text-mode pipe: UTF-8 with replacement, universal
+        # newlines translated to "\n".
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+        )
+        fd = proc.stdout.fileno()
+        pending = ""
+        final = False
+        while not final:
+            chunk = os.read(fd, _PIPE_READ_SIZE)
+            final = not chunk
+            text = pending + decoder.decode(chunk, final=final)
+            # Hold back a trailing partial line until its newline arrives.
+            cut = len(text) if final else text.rfind("\n") + 1
+            text, pending = text[:cut], text[cut:]
+            if not text:
+                continue
+            log_fh.write(_strip_ansi(text))
             log_fh.flush()
             if echo:
-                print(line, end="", flush=True)
+                print(text, end="", flush=True)
+        proc.stdout.close()
         proc.wait()
     return proc.returncode
 
 
+# Block size used when reading a log backwards from its end.
+_LOG_TAIL_CHUNK = 8192
+
+
+def _read_tail_lines(log_path: Path, count: int) -> list[str]:
+    """Return the last *count* lines of *log_path*.
+
+    Reads backwards from the end in ``_LOG_TAIL_CHUNK`` blocks until enough
+    newlines have been seen, so the cost is bounded by the tail rather than the
+    size of the log.
+    """
+    with open(log_path, "rb") as f:
+        pos = f.seek(0, 2)
+        tail = b""
+        while pos > 0 and tail.count(b"\n") <= count:
+            step = min(_LOG_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+    if pos > 0:
+        # Drop the partial line the first block started in the middle of.
+        tail = tail[tail.index(b"\n") + 1 :]
+    return tail.decode("utf-8", errors="replace").splitlines()[-count:]
+
+
 def _tail_log(log_path: Path) -> None:
     """Print the last ``_LOG_TAIL_LINES`` lines of *log_path* inside a red Rich panel.
 
@@ -113,9 +170,7 @@ def _tail_log(log_path: Path) -> None:
     from rich.panel import Panel  # noqa: PLC0415
 
     try:
-        text = log_path.read_text(encoding="utf-8", errors="replace")
-        lines = text.splitlines()
-        shown = lines[-_LOG_TAIL_LINES:] if len(lines) > _LOG_TAIL_LINES else lines
+        shown = _read_tail_lines(log_path, _LOG_TAIL_LINES)
         tail_text = "\n".join(shown)
         _console.print(
             Panel(
@@ -189,12 +244,8 @@ def check_monthly_budget(project_dir: Path | None = None) -> None:
         proj_calls = proj_data.get("total_calls", len(proj_data["sessions"]))
         if show_price:
             proj_usd = (
-                sum(
-                    s["tokens"] * (sum(_PRICES[k] for k in _PRICES) / len(_PRICES))
-                    for s in proj_data["sessions"]
-                    if "tokens" in s
-                )
-                / 1_000_000
+                sum(s["tokens"] for s in proj_data["sessions"] if "tokens" in s)
+                * _BLENDED_USD_PER_TOKEN
             )
             _proj_cost = f" · ~${proj_usd:.4f} est."
         else:
@@ -259,6 +310,8 @@ def check_monthly_budget(project_dir: Path | None = None) -> None:
 
 def select_project() -> Path:
     """Interactively prompt the user to select a project with arrow-key navigation."""
+    import questionary  # noqa: PLC0415
+
     projects = list_projects()
     if not projects:
         _console.print(f"[red]No projects found in {PROJECTS_ROOT}/.[/]")
@@ -274,7 +327,7 @@ def select_project() -> Path:
         "not started": "○",
         "no tasks": "?",
     }
-    statuses = [_project_status(p) for p in projects]
+    statuses = project_statuses(projects)
     badge_w = max(len(b) for b, _ in statuses)
     name_w = max(len(p.name) for p in projects)
 
@@ -298,6 +351,10 @@ def select_project() -> Path:
 # ── Core opencode invocation ───────────────────────────────────────────────────
 
 
+# ``## 001 - Title`` → ("001", "Title") for the per-invocation task label.
+_TASK_LABEL_RE = re.compile(r"^##\s*(\d+)\s*-\s*(.+)$")
+
+
 def _invoke_opencode(
     prompt: str,
     *,
@@ -322,7 +379,7 @@ def _invoke_opencode(
     stats_before = get_token_stats()
 
     # ── Build a human-readable task label ────────────────────────────────
-    m = re.match(r"^##\s*(\d+)\s*-\s*(.+)$", (task or "").strip())
+    m = _TASK_LABEL_RE.match((task or "").strip())
     task_display = (
         f"{m.group(1)} · {m.group(2)[:55]}" if m else (task or "unknown")[:60]
     )
@@ -335,18 +392,22 @@ def _invoke_opencode(
 
     rc = 1  # default so it's defined after the try block
     try:
-        dir_path = Path(project_dir).resolve().as_posix()
-        tmpfile_posix = Path(tmpfile).resolve().as_posix()
-        flags = f'--agent {agent} --dir "{dir_path}"' + (
-            " --continue" if continue_session else ""
-        )
-        cmd = f'opencode run "Execute the task in the attached file." {flags} -f "{tmpfile_posix}"'
+        cmd = _resolve_argv([
+            "opencode",
+            "run",
+            "Execute the task in the attached file.",
+            "--agent",
+            agent,
+            "--dir",
+            Path(project_dir).resolve().as_posix(),
+            *(["--continue"] if continue_session else []),
+            "-f",
+            Path(tmpfile).resolve().as_posix(),
+        ])
 
         # ── Per-invocation log file (timestamp-first for natural sort order) ─
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        task_slug = re.sub(
-            r"[^a-z0-9]+", "-", (task or "unknown").lower().lstrip("#").strip()
-        ).strip("-")[:50]
+        task_slug = slugify(task or "unknown")[:50]
         log_name = f"{timestamp}_{phase}_a{attempt}.log"
         log_path = project_dir / "logs" / task_slug / log_name
         log_rel = f"logs/{task_slug}/{log_name}"
@@ -575,6 +636,46 @@ def run_opencode_static_fix(task: str, project_dir: Path, check_output: str) ->
     )
 
 
+# Directories left out of the milestone prompt's project file listing.
+_LISTING_SKIP_DIRS = frozenset(
+    {
+        ".git",
+        "__pycache__",
+        ".pytest_cache",
+        "node_modules",
+        ".venv",
+        "dist",
+        "build",
+    }
+)
+
+
+def _list_project_files(project_dir: Path) -> list[str]:
+    """Return project-relative POSIX paths of files under *project_dir*, sorted.
+
+    Directories named in ``_LISTING_SKIP_DIRS`` are pruned when they are met,
+    so nothing inside ``.git`` or ``node_modules`` is ever stat'ed.  Unreadable
+    directories are skipped.
+    """
+    files: list[str] = []
+    stack = [(project_dir, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    rel = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _LISTING_SKIP_DIRS:
+                            stack.append((entry.path, rel + "/"))
+                    elif entry.is_file():
+                        files.append(rel)
+        except OSError:
+            continue
+    files.sort(key=lambda rel: rel.split("/"))
+    return files
+
+
 def run_opencode_milestone(task: str, version: str, project_dir: Path) -> int:
     """Invoke the milestone agent to review the project before tagging; return token delta.
 
@@ -590,21 +691,7 @@ def run_opencode_milestone(task: str, version: str, project_dir: Path) -> int:
     roadmap = (project_dir / ROADMAP_FILENAME).read_text(encoding="utf-8")
     task_spec = get_task_body(task, project_dir)
 
-    file_listing: list[str] = []
-    _SKIP_DIRS = {
-        ".git",
-        "__pycache__",
-        ".pytest_cache",
-        "node_modules",
-        ".venv",
-        "dist",
-        "build",
-    }
-    for path in sorted(project_dir.rglob("*")):
-        if any(part in _SKIP_DIRS for part in path.parts):
-            continue
-        if path.is_file():
-            file_listing.append(f"  {path.relative_to(project_dir).as_posix()}")
+    file_listing = [f"  {rel}" for rel in _list_project_files(project_dir)]
     listing_text = "\n".join(file_listing) if file_listing else "  (empty)"
 
     prompt = render_prompt(
@@ -634,43 +721,78 @@ _CRITICAL_AGENTS = {"build", "fix"}
 
 
 def _strip_jsonc_comments(text: str) -> str:
-    """Remove ``//`` line comments from JSONC text (string-aware)."""
+    """Remove ``//`` line comments from JSONC text (string-aware).
+
+    Jumps between interesting characters with ``str.find`` (a C-level scan)
+    instead of stepping through the text one character at a time; input with
+    no ``//`` at all is returned as-is without being copied.
+    """
+    if "//" not in text:
+        return text
+    find = text.find
+    n = len(text)
     out: list[str] = []
-    i = 0
-    in_string = False
-    while i < len(text):
-        c = text[i]
-        if in_string:
-            if c == "\\":
-                out.append(c)
-                i += 1
-                if i < len(text):
-                    out.append(text[i])
-            elif c == '"':
-                in_string = False
-                out.append(c)
-            else:
-                out.append(c)
-        else:
-            if c == '"':
-                in_string = True
-                out.append(c)
-            elif c == "/" and i + 1 < len(text) and text[i + 1] == "/":
-                while i < len(text) and text[i] != "\n":
-                    i += 1
-                continue
-            else:
-                out.append(c)
-        i += 1
+    pos = 0
+    next_quote = find('"')
+    next_comment = find("//")
+    while next_comment != -1:
+        if next_quote != -1 and next_quote < next_comment:
+            # Skip over the string literal: jump between quotes, honouring escapes.
+            end = next_quote + 1
+            while True:
+                end = find('"', end)
+                if end == -1:
+                    end = n
+                    break
+                backslashes = 0
+                k = end - 1
+                while text[k] == "\\":
+                    backslashes += 1
+                    k -= 1
+                if not backslashes & 1:
+                    end += 1
+                    break
+                end += 1
+            if end >= n:
+                break
+            next_quote = find('"', end)
+            if next_comment < end:
+                next_comment = find("//", end)
+            continue
+        out.append(text[pos:next_comment])
+        pos = find("\n", next_comment)
+        if pos == -1:
+            return "".join(out)
+        next_comment = find("//", pos)
+        if next_quote != -1 and next_quote < pos:
+            next_quote = find('"', pos)
+    out.append(text[pos:])
     return "".join(out)
 
 
-def _load_opencode_config() -> dict:
-    """Parse ``opencode.jsonc`` into a plain dict, tolerating ``//`` comments."""
-    raw = Path("opencode.jsonc").read_text(encoding="utf-8")
+@lru_cache(maxsize=4)
+def _parse_opencode_config(path: str, key: tuple[int, int] | None) -> dict:
+    """Strip and decode the JSONC file at *path*; memoised on its stat *key*."""
+    raw = Path(path).read_text(encoding="utf-8")
     return json.loads(_strip_jsonc_comments(raw))
 
 
+def _clear_cache() -> None:
+    """Drop the memoised ``opencode.jsonc`` parses."""
+    _parse_opencode_config.cache_clear()
+
+
+def _load_opencode_config() -> dict:
+    """Parse ``opencode.jsonc`` into a plain dict, tolerating ``//`` comments.
+
+    Re-parsed only when the file's ``(mtime_ns, size)`` changes, so the price
+    check after every agent call costs a ``stat``.  Treat the result as
+    read-only.
+    """
+    path = Path.cwd() / "opencode.jsonc"
+    return _parse_opencode_config(str(path), _file_key(path))
+
+
 def _is_copilot_only() -> bool:
     """Return True if every configured model uses the ``github-copilot/`` provider.
 
@@ -21,6 +21,7 @@ from runner.opencode import (
     select_project,
 )
 from runner.roadmap import (
+    _task_number,
     get_ready_tasks,
     get_task_body,
     get_task_ecosystem,
@@ -34,6 +35,7 @@ from runner.roadmap import (
 )
 from runner.state import (
     _format_tokens,
+    completed_task_set,
     load_project_budget,
     load_runner_state,
     mark_done,
@@ -202,10 +204,8 @@ def process_milestone(task: str, project_dir: Path) -> None:
     version = get_task_version(task, project_dir)
     if not version:
         # Derive a fallback version from the task number.
-        import re  # noqa: PLC0415
-
-        m = re.match(r"^## (\d{3}) - ", task)
-        version = f"0.0.{int(m.group(1))}" if m else "0.0.0"
+        number = _task_number(task)
+        version = f"0.0.{number}" if number >= 0 else "0.0.0"
 
     check_monthly_budget(project_dir=project_dir)
     _console.print(f"\n[bold][1/2] Milestone review[/]  [dim](v{version})[/]")
@@ -420,8 +420,9 @@ def main() -> None:
     first_task = all_tasks[0] if all_tasks else None
 
     # Print completed tasks.
+    completed = completed_task_set(project_dir)
     for task in all_tasks:
-        if task_done(task, project_dir):
+        if task in completed:
             _console.print(f"[dim]✓ Skipping (done):[/] {task}")
 
     # Handle resume — process the interrupted task sequentially, then continue
@@ -442,7 +443,9 @@ def main() -> None:
 
     # ── Graph-based scheduling loop ────────────────────────────────────────
     while True:
-        done_set = {t for t in all_tasks if task_done(t, project_dir)}
+        # One state read per scheduling round, not one per task.
+        completed = completed_task_set(project_dir)
+        done_set = {t for t in all_tasks if t in completed}
         ready = get_ready_tasks(all_tasks, graph, done_set, project_dir)
 
         if not ready:
@@ -1,20 +1,26 @@
 """roadmap.py -- ROADMAP.json parsing, and prompt-block helpers."""
 
 import json
-import re
 import subprocess
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 
 from runner.config import ROADMAP_FILENAME, _console
-from runner.workspace import _detect_ecosystem
+from runner.workspace import _detect_ecosystem, _file_key, _parse_roadmap_file
 
 # -- JSON ROADMAP loading -----------------------------------------------------
 
 
 def _load_roadmap(project_dir: Path) -> dict:
-    """Load and return the parsed ROADMAP.json."""
-    with open(project_dir / ROADMAP_FILENAME, encoding="utf-8") as f:
-        return json.load(f)
+    """Load and return the parsed ROADMAP.json.
+
+    The parse is shared with ``runner.workspace`` and redone only when the
+    file's ``(mtime_ns, size)`` changes, so callers must treat the result as
+    read-only.  A missing or malformed file raises as before.
+    """
+    path = project_dir / ROADMAP_FILENAME
+    return _parse_roadmap_file(str(path), _file_key(path))
 
 
 def _task_heading(task_data: dict) -> str:
@@ -22,12 +28,49 @@ def _task_heading(task_data: dict) -> str:
     return f"## {task_data['id']:03d} - {task_data['title']}"
 
 
-def _find_task(roadmap: dict, heading: str) -> dict | None:
-    """Find a task dict matching the `## NNN - Title` heading."""
-    for t in roadmap.get("tasks", []):
-        if _task_heading(t) == heading:
-            return t
-    return None
+@lru_cache(maxsize=64)
+def _task_entries(
+    project_dir: Path, key: tuple[int, int] | None
+) -> tuple[tuple[str, dict], ...]:
+    """``(heading, task)`` for every task in ROADMAP order; memoised on *key*."""
+    tasks = _load_roadmap(project_dir).get("tasks", [])
+    return tuple((_task_heading(t), t) for t in tasks)
+
+
+def _entries(project_dir: Path) -> tuple[tuple[str, dict], ...]:
+    """``(heading, task)`` pairs for *project_dir*, formatted once per ROADMAP."""
+    return _task_entries(project_dir, _file_key(project_dir / ROADMAP_FILENAME))
+
+
+@lru_cache(maxsize=64)
+def _task_index(project_dir: Path, key: tuple[int, int] | None) -> dict[str, dict]:
+    """Map each `## NNN - Title` heading to its task dict; memoised on *key*."""
+    index: dict[str, dict] = {}
+    for heading, t in _task_entries(project_dir, key):
+        index.setdefault(heading, t)
+    return index
+
+
+def _find_task(project_dir: Path, heading: str) -> dict | None:
+    """Find the task dict matching the `## NNN - Title` heading.
+
+    The heading index is rebuilt only when ROADMAP.json's ``(mtime_ns, size)``
+    changes.  The returned dict is shared between calls — treat it as read-only.
+    """
+    key = _file_key(project_dir / ROADMAP_FILENAME)
+    return _task_index(project_dir, key).get(heading)
+
+
+def _clear_cache() -> None:
+    """Drop this module's memoised heading lists, indexes and task graphs.
+
+    The caches key on ``(mtime_ns, size)``; a rewrite that keeps both (same
+    length, within the filesystem's timestamp granularity) is only picked up
+    after this (and ``workspace._clear_cache`` for the parse) is called.
+    """
+    _task_entries.cache_clear()
+    _task_index.cache_clear()
+    _task_graph.cache_clear()
 
 
 def _resolve_text(value) -> str:
@@ -44,8 +87,7 @@ def _resolve_text(value) -> str:
 
 def get_tasks(project_dir: Path) -> list[str]:
     """Return all `## NNN - Title` task headings from ROADMAP.json."""
-    roadmap = _load_roadmap(project_dir)
-    return [_task_heading(t) for t in roadmap.get("tasks", [])]
+    return [heading for heading, _ in _entries(project_dir)]
 
 
 def get_task_body(task: str, project_dir: Path) -> str:
@@ -54,8 +96,7 @@ def get_task_body(task: str, project_dir: Path) -> str:
     Reconstructs metadata lines in the same format the LLM agents expect,
     followed by the description text.
     """
-    roadmap = _load_roadmap(project_dir)
-    t = _find_task(roadmap, task)
+    t = _find_task(project_dir, task)
     if not t:
         return ""
 
@@ -110,8 +151,7 @@ def get_task_body(task: str, project_dir: Path) -> str:
 
 def get_task_ecosystem(task: str, project_dir: Path) -> str:
     """Return the ecosystem for a task (task-level override or project default)."""
-    roadmap = _load_roadmap(project_dir)
-    t = _find_task(roadmap, task)
+    t = _find_task(project_dir, task)
     if t:
         eco = t.get("ecosystem", "")
         if eco:
@@ -121,8 +161,7 @@ def get_task_ecosystem(task: str, project_dir: Path) -> str:
 
 def get_task_context_files(task: str, project_dir: Path) -> dict[str, str]:
     """Parse the `context` field and return `{relative_path: content}` for each file."""
-    roadmap = _load_roadmap(project_dir)
-    t = _find_task(roadmap, task)
+    t = _find_task(project_dir, task)
     if not t:
         return {}
 
@@ -132,9 +171,10 @@ def get_task_context_files(task: str, project_dir: Path) -> dict[str, str]:
 
     result: dict[str, str] = {}
     for rel in ctx:
-        full = project_dir / rel
-        if full.exists():
-            result[rel] = full.read_text(encoding="utf-8")
+        try:
+            result[rel] = (project_dir / rel).read_text(encoding="utf-8")
+        except (FileNotFoundError, NotADirectoryError):
+            continue
     return result
 
 
@@ -143,8 +183,7 @@ def get_task_context_files(task: str, project_dir: Path) -> dict[str, str]:
 
 def get_task_agent(task: str, project_dir: Path) -> str:
     """Return the `agent` value from a task, defaulting to `'build'`."""
-    roadmap = _load_roadmap(project_dir)
-    t = _find_task(roadmap, task)
+    t = _find_task(project_dir, task)
     if t:
         return t.get("agent", "build") or "build"
     return "build"
@@ -152,8 +191,7 @@ def get_task_agent(task: str, project_dir: Path) -> str:
 
 def get_task_version(task: str, project_dir: Path) -> str | None:
     """Return the `version` value from a task, or None if absent."""
-    roadmap = _load_roadmap(project_dir)
-    t = _find_task(roadmap, task)
+    t = _find_task(project_dir, task)
     if t:
         v = t.get("version", "")
         return v if v else None
@@ -167,8 +205,7 @@ def is_milestone_task(task: str, project_dir: Path) -> bool:
 
 def is_deploy_task(task: str, project_dir: Path) -> bool:
     """Return True if *task* has `"deploy": true`."""
-    roadmap = _load_roadmap(project_dir)
-    t = _find_task(roadmap, task)
+    t = _find_task(project_dir, task)
     if t:
         return t.get("deploy", False) is True
     return False
@@ -197,30 +234,35 @@ def get_deploy_config(project_dir: Path) -> dict:
             "script": deploy.get("script"),
             "env": deploy.get("env", {}),
         }
-    # Backward compat: check for deploy.json at project root.
-    cfg_path = project_dir / "deploy.json"
-    if cfg_path.exists():
-        try:
-            raw = json.loads(cfg_path.read_text(encoding="utf-8"))
-            if raw.get("deploy") is False:
-                return {"enabled": False, "script": None, "env": {}}
-            env = {k: v for k, v in raw.items() if k != "deploy"}
-            return {"enabled": True, "script": None, "env": env}
-        except Exception:  # noqa: BLE001
-            pass
+    # Backward compat: check for deploy.json at project root.  Only reached when
+    # the ROADMAP has no deploy block; a missing file is just another exception,
+    # so there is no separate exists() stat before the read.
+    try:
+        raw = json.loads((project_dir / "deploy.json").read_bytes())
+        if raw.get("deploy") is False:
+            return {"enabled": False, "script": None, "env": {}}
+        env = {k: v for k, v in raw.items() if k != "deploy"}
+        return {"enabled": True, "script": None, "env": env}
+    except Exception:  # noqa: BLE001
+        pass
     return {"enabled": False, "script": None, "env": {}}
 
 
 def _task_number(heading: str) -> int:
     """Extract the 3-digit task number from a '## NNN - Title' heading."""
-    m = re.match(r"^## (\d{3}) - ", heading)
-    return int(m.group(1)) if m else -1
+    digits = heading[3:6]
+    if (
+        heading.startswith("## ")
+        and heading.startswith(" - ", 6)
+        and digits.isdecimal()
+    ):
+        return int(digits)
+    return -1
 
 
 def get_task_outputs(task: str, project_dir: Path) -> list[str]:
     """Return the list of output file paths for a task."""
-    roadmap = _load_roadmap(project_dir)
-    t = _find_task(roadmap, task)
+    t = _find_task(project_dir, task)
     if not t:
         return []
     outputs = t.get("outputs", [])
@@ -229,53 +271,61 @@ def get_task_outputs(task: str, project_dir: Path) -> list[str]:
     return list(outputs)
 
 
-def parse_task_graph(project_dir: Path) -> dict[str, list[str]]:
-    """Build `{task_heading: [dependency_headings]}` from `depends_on` fields."""
-    roadmap = _load_roadmap(project_dir)
-    tasks = roadmap.get("tasks", [])
-    num_to_heading = {t["id"]: _task_heading(t) for t in tasks}
+@lru_cache(maxsize=64)
+def _task_graph(
+    project_dir: Path, key: tuple[int, int] | None
+) -> dict[str, list[str]]:
+    """Dependency graph of *project_dir*; memoised on the ROADMAP stat *key*."""
+    entries = _task_entries(project_dir, key)
+    num_to_heading = {t["id"]: heading for heading, t in entries}
 
     graph: dict[str, list[str]] = {}
-    for t in tasks:
-        heading = _task_heading(t)
+    for heading, t in entries:
         dep_nums = t.get("depends_on", [])
         graph[heading] = [num_to_heading[n] for n in dep_nums if n in num_to_heading]
     return graph
 
 
+def parse_task_graph(project_dir: Path) -> dict[str, list[str]]:
+    """Build `{task_heading: [dependency_headings]}` from `depends_on` fields.
+
+    Rebuilt only when ROADMAP.json's ``(mtime_ns, size)`` changes.  The
+    returned dict is shared between calls — treat it as read-only.
+    """
+    return _task_graph(project_dir, _file_key(project_dir / ROADMAP_FILENAME))
+
+
 def get_task_layers(
     all_tasks: list[str],
     graph: dict[str, list[str]],
     project_dir: Path,
 ) -> list[list[str]]:
     """Group tasks into topological layers. Milestones are placed in their own individual layers."""
-    layers: list[list[str]] = []
+    return list(_iter_task_layers(all_tasks, graph, project_dir))
+
+
+def _iter_task_layers(
+    all_tasks: list[str],
+    graph: dict[str, list[str]],
+    project_dir: Path,
+) -> Iterator[list[str]]:
+    """Yield the layers of ``get_task_layers`` one at a time, lowest first."""
+    milestone = {t: is_milestone_task(t, project_dir) for t in all_tasks}
     remaining = list(all_tasks)
     placed: set[str] = set()
     while remaining:
-        candidates = [
-            t for t in remaining if all(d in placed for d in graph.get(t, []))
-        ]
+        candidates = [t for t in remaining if placed.issuperset(graph.get(t, ()))]
         if not candidates:
             # Fallback for cycles or disconnected graphs
             candidates = list(remaining)
 
-        milestones = [t for t in candidates if is_milestone_task(t, project_dir)]
-        non_milestones = [
-            t for t in candidates if not is_milestone_task(t, project_dir)
-        ]
+        milestones = [t for t in candidates if milestone[t]]
+        layer = [milestones[0]] if milestones else candidates
 
-        if milestones:
-            layer = [milestones[0]]
-        else:
-            layer = non_milestones
-
-        layers.append(layer)
+        yield layer
         placed.update(layer)
         remaining = [t for t in remaining if t not in placed]
 
-    return layers
-
 
 def get_ready_tasks(
     all_tasks: list[str],
@@ -283,23 +333,27 @@ def get_ready_tasks(
     done: set[str],
     project_dir: Path,
 ) -> list[str]:
-    """Return undone tasks from the lowest incomplete layer whose dependencies are satisfied."""
-    layers = get_task_layers(all_tasks, graph, project_dir)
-    for layer in layers:
+    """Return undone tasks from the lowest incomplete layer whose dependencies are satisfied.
+
+    Layers are generated lazily, so only those up to the first incomplete one are
+    built.
+    """
+    for layer in _iter_task_layers(all_tasks, graph, project_dir):
         undone = [t for t in layer if t not in done]
         if undone:
             # Return tasks in this layer that have all dependencies met
-            return [t for t in undone if all(d in done for d in graph.get(t, []))]
+            return [t for t in undone if done.issuperset(graph.get(t, ()))]
     return []
 
 
 def print_dependency_graph(project_dir: Path) -> None:
     """Print a colour-coded dependency graph for the project's ROADMAP tasks."""
-    from runner.state import task_done  # noqa: PLC0415
+    from runner.state import completed_task_set  # noqa: PLC0415
 
     tasks = get_tasks(project_dir)
     graph = parse_task_graph(project_dir)
-    done_set = {t for t in tasks if task_done(t, project_dir)}
+    completed = completed_task_set(project_dir)
+    done_set = {t for t in tasks if t in completed}
     ready = get_ready_tasks(tasks, graph, done_set, project_dir)
 
     layers = get_task_layers(tasks, graph, project_dir)
@@ -360,7 +414,7 @@ def _detect_test_command(project_dir: Path, eco: str | None = None) -> tuple[str
         return "deno test --allow-all", "deno test"
     if eco == "node":
         try:
-            pkg = json.loads((project_dir / "package.json").read_text(encoding="utf-8"))
+            pkg = json.loads((project_dir / "package.json").read_bytes())
             if "test" in pkg.get("scripts", {}):
                 return "pnpm test", "pnpm test"
         except (json.JSONDecodeError, OSError):
@@ -477,7 +531,7 @@ def _detect_active_test_suites(project_dir: Path) -> list[tuple[str, str]]:
     # Node
     if (project_dir / "package.json").exists():
         try:
-            pkg = json.loads((project_dir / "package.json").read_text(encoding="utf-8"))
+            pkg = json.loads((project_dir / "package.json").read_bytes())
             if "test" in pkg.get("scripts", {}):
                 suites.append(("pnpm test", "pnpm test"))
         except (json.JSONDecodeError, OSError):
@@ -4,6 +4,7 @@ import json
 import re
 import subprocess
 from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 from runner.config import (
@@ -11,6 +12,22 @@ from runner.config import (
     _PRICES,
 )
 
+# ── JSON files ─────────────────────────────────────────────────────────────────
+
+
+def _dump_json(path: Path, data: dict, *, indent: int | None = None) -> None:
+    """Write *data* to *path* as JSON in a single binary write.
+
+    Compact by default (runner state is only read back by the runner); pass
+    *indent* for files users open to read, such as the budget files.
+    ``json.dumps`` escapes non-ASCII by default, so the text is pure ASCII and
+    can be encoded without going through a text-mode file wrapper.
+    """
+    separators = None if indent is not None else (",", ":")
+    text = json.dumps(data, indent=indent, separators=separators)
+    path.write_bytes(text.encode("ascii"))
+
+
 # ── Token / cost ───────────────────────────────────────────────────────────────
 
 
@@ -24,6 +41,16 @@ def _parse_tokens(value: str) -> float:
     return float(v)
 
 
+# One pass over ``opencode stats`` output picks up every counter we report.
+_STATS_RE = re.compile(r"(Input|Output|Cache Read|Cache Write)\s+([\d.]+[KM]?)\b")
+_STATS_KEYS = {
+    "Input": "input",
+    "Output": "output",
+    "Cache Read": "cache_read",
+    "Cache Write": "cache_write",
+}
+
+
 def get_token_stats() -> dict:
     """Return cumulative token counts from ``opencode stats``.
 
@@ -37,24 +64,23 @@ def get_token_stats() -> dict:
         encoding="utf-8",
         errors="replace",
     )
-    out = result.stdout
-
-    def _find(label: str) -> int:
-        m = re.search(rf"{re.escape(label)}\s+([\d.]+[KM]?)\b", out)
-        return int(_parse_tokens(m.group(1))) if m else 0
-
-    stats = {
-        "input": _find("Input"),
-        "output": _find("Output"),
-        "cache_read": _find("Cache Read"),
-        "cache_write": _find("Cache Write"),
-    }
+    stats = dict.fromkeys(_STATS_KEYS.values(), 0)
+    seen: set[str] = set()
+    for m in _STATS_RE.finditer(result.stdout or ""):
+        key = _STATS_KEYS[m.group(1)]
+        if key not in seen:  # first occurrence wins
+            seen.add(key)
+            stats[key] = int(_parse_tokens(m.group(2)))
     stats["total"] = (
         stats["input"] + stats["output"] + stats["cache_read"] + stats["cache_write"]
     )
     return stats
 
 
+# Flat per-token rate (mean of the price table) for totals with no category split.
+_BLENDED_USD_PER_TOKEN: float = sum(_PRICES.values()) / len(_PRICES) / 1_000_000
+
+
 def _tokens_to_usd(stats: dict) -> float:
     """Estimate USD cost from a token-stats dict using the price table."""
     return round(
@@ -97,13 +123,13 @@ def _format_duration(seconds: float) -> str:
 def _load_budget_state() -> dict:
     """Load the persisted monthly budget baseline from disk."""
     if _BUDGET_STATE_FILE.exists():
-        return json.loads(_BUDGET_STATE_FILE.read_text(encoding="utf-8"))
+        return json.loads(_BUDGET_STATE_FILE.read_bytes())
     return {}
 
 
 def _save_budget_state(state: dict) -> None:
     """Persist the monthly budget baseline to disk."""
-    _BUDGET_STATE_FILE.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    _dump_json(_BUDGET_STATE_FILE, state, indent=2)
 
 
 def _month_key() -> str:
@@ -148,7 +174,7 @@ def load_project_budget(project_dir: Path) -> dict:
     """
     path = project_budget_path(project_dir)
     if path.exists():
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         # Back-compat: old files before total_calls was added.
         data.setdefault("total_calls", len(data.get("sessions", [])))
         return data
@@ -162,9 +188,7 @@ def load_project_budget(project_dir: Path) -> dict:
 
 def save_project_budget(project_dir: Path, data: dict) -> None:
     """Write the per-project budget data back to disk."""
-    project_budget_path(project_dir).write_text(
-        json.dumps(data, indent=2), encoding="utf-8"
-    )
+    _dump_json(project_budget_path(project_dir), data, indent=2)
 
 
 def record_project_spend(
@@ -230,7 +254,7 @@ def _raw_state(project_dir: Path) -> dict:
     data: dict = {}
     if path.exists():
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = json.loads(path.read_bytes())
         except json.JSONDecodeError:
             pass
     # Back-compat: old format used 'task' key instead of 'current_task'.
@@ -250,9 +274,7 @@ def _raw_state(project_dir: Path) -> dict:
 
 def _write_state(project_dir: Path, state: dict) -> None:
     """Write *state* to the project's ``.runner_state.json``."""
-    runner_state_path(project_dir).write_text(
-        json.dumps(state, indent=2), encoding="utf-8"
-    )
+    _dump_json(runner_state_path(project_dir), state)
 
 
 def save_runner_state(
@@ -297,9 +319,42 @@ def _completed_tasks(state: dict) -> set[str]:
     return result
 
 
+@lru_cache(maxsize=64)
+def _snapshot_for_key(
+    project_dir: Path, key: tuple[int, int] | None
+) -> tuple[dict, frozenset[str]]:
+    """Raw state and completed headings of *project_dir*, memoised on the state file's stat *key*."""
+    state = _raw_state(project_dir)
+    return state, frozenset(_completed_tasks(state))
+
+
+def _state_snapshot(project_dir: Path) -> tuple[dict, frozenset[str]]:
+    """Return ``(raw state, completed headings)`` for *project_dir*.
+
+    The state file is only re-parsed when its ``(mtime_ns, size)`` changes.
+    The returned dict is shared between calls — treat it as read-only.
+    """
+    try:
+        st = runner_state_path(project_dir).stat()
+        key: tuple[int, int] | None = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    return _snapshot_for_key(project_dir, key)
+
+
+def completed_task_set(project_dir: Path) -> frozenset[str]:
+    """Return the project's completed task headings as a frozenset."""
+    return _state_snapshot(project_dir)[1]
+
+
+def _clear_cache() -> None:
+    """Drop the memoised state snapshots (for same-stat rewrites and tests)."""
+    _snapshot_for_key.cache_clear()
+
+
 def task_done(task: str, project_dir: Path) -> bool:
     """Return True if *task* is in the project's completed list."""
-    return task in _completed_tasks(_raw_state(project_dir))
+    return task in completed_task_set(project_dir)
 
 
 def mark_done(task: str, project_dir: Path) -> None:
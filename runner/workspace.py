@@ -4,85 +4,171 @@ import json
 import os
 import platform
 import re
+import shutil
 import subprocess
 import sys
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from runner.config import PROJECTS_ROOT, ROADMAP_FILENAME, _console, slugify
 from runner.state import (
     _completed_tasks,
     _raw_state,
+    _state_snapshot,
     save_project_budget,
 )
 
-# ── Ecosystem detection ────────────────────────────────────────────────────────
+# Process-invariant host facts, resolved once at import.
+_PYTHON_POSIX: str = Path(sys.executable).resolve().as_posix()
+_IS_WINDOWS: bool = platform.system() == "Windows"
+# Default deploy scripts probed in order when the ROADMAP names none.
+_DEPLOY_SCRIPT_CANDIDATES: tuple[str, ...] = (
+    ("scripts/deploy.ps1", "scripts/deploy.sh")
+    if _IS_WINDOWS
+    else ("scripts/deploy.sh",)
+)
 
 
-def get_roadmap_ecosystem(project_dir: Path) -> str | None:
-    """Parse the ``ecosystem`` field from ROADMAP.json, or return None."""
-    roadmap = project_dir / ROADMAP_FILENAME
-    if not roadmap.exists():
+@lru_cache(maxsize=256)
+def _resolve_absolute(path: Path) -> Path:
+    """Memoised ``Path.resolve()`` for an already-absolute *path*."""
+    return path.resolve()
+
+
+def _resolved(path: Path) -> Path:
+    """Return ``path.resolve()``, caching the ``realpath`` walk per absolute path.
+
+    Relative paths are anchored to the current directory first so the cache
+    stays correct if the working directory changes.
+    """
+    if not path.is_absolute():
+        path = Path(os.getcwd(), path)
+    return _resolve_absolute(path)
+
+
+def _name_key(name: str) -> str:
+    """Normalise a file name for membership tests (case-insensitive on Windows)."""
+    return name.lower() if _IS_WINDOWS else name
+
+
+def _dir_entries(directory: Path) -> set[str]:
+    """Return the ``_name_key`` of every entry in *directory* (empty if unreadable)."""
+    try:
+        with os.scandir(directory) as it:
+            return {_name_key(entry.name) for entry in it}
+    except OSError:
+        return set()
+
+
+# ── ROADMAP loading ────────────────────────────────────────────────────────────
+
+
+def _file_key(path: Path) -> tuple[int, int] | None:
+    """Return ``(mtime_ns, size)`` for *path*, or None if it cannot be stat'ed."""
+    try:
+        st = path.stat()
+    except OSError:
         return None
+    return st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=64)
+def _parse_roadmap_file(path: str, key: tuple[int, int]) -> dict:
+    """Decode the ROADMAP at *path*; memoised on its stat *key*."""
+    return json.loads(Path(path).read_bytes())
+
+
+def _roadmap_data(path: Path) -> dict:
+    """Parsed ROADMAP.json at *path*, or ``{}`` if it is missing or invalid.
+
+    Re-parsed only when the file's ``(mtime_ns, size)`` changes.  The returned
+    dict is shared between calls — treat it as read-only.
+    """
+    key = _file_key(path)
+    if key is None:
+        return {}
     try:
-        data = json.loads(roadmap.read_text(encoding="utf-8"))
-        value = data.get("ecosystem", "").strip().lower()
-        if value:
-            return value
+        return _parse_roadmap_file(str(path), key)
     except (json.JSONDecodeError, OSError):
-        pass
-    return None
+        return {}
+
+
+# ── Ecosystem detection ────────────────────────────────────────────────────────
+
+
+def get_roadmap_ecosystem(project_dir: Path) -> str | None:
+    """Parse the ``ecosystem`` field from ROADMAP.json, or return None."""
+    value = (
+        _roadmap_data(project_dir / ROADMAP_FILENAME)
+        .get("ecosystem", "")
+        .strip()
+        .lower()
+    )
+    return value or None
 
 
 def get_roadmap_project_context(project_dir: Path) -> str:
     """Return the ROADMAP preamble text for prompt injection."""
-    roadmap = project_dir / ROADMAP_FILENAME
-    if not roadmap.exists():
-        return ""
-    try:
-        data = json.loads(roadmap.read_text(encoding="utf-8"))
-        preamble = data.get("preamble", "")
-        if isinstance(preamble, list):
-            return "\n".join(preamble).strip()
-        return str(preamble).strip()
-    except (json.JSONDecodeError, OSError):
-        return ""
+    preamble = _roadmap_data(project_dir / ROADMAP_FILENAME).get("preamble", "")
+    if isinstance(preamble, list):
+        return "\n".join(preamble).strip()
+    return str(preamble).strip()
+
+
+# Top-level manifest → ecosystem, checked in priority order (first match wins).
+_ECOSYSTEM_MARKERS: tuple[tuple[str, str], ...] = (
+    ("deno.json", "deno"),
+    ("deno.jsonc", "deno"),
+    ("package.json", "node"),
+    ("go.mod", "go"),
+    ("Cargo.toml", "rust"),
+)
 
 
 def _detect_ecosystem(project_dir: Path) -> str:
-    """Return the primary ecosystem for *project_dir* (ROADMAP field → heuristic → ``'python'``)."""
+    """Return the primary ecosystem for *project_dir* (ROADMAP field → heuristic → ``'python'``).
+
+    The manifest heuristics are answered from a single ``os.scandir`` listing.
+    """
     declared = get_roadmap_ecosystem(project_dir)
     if declared is not None:
         return declared
-    if (project_dir / "deno.json").exists() or (project_dir / "deno.jsonc").exists():
-        return "deno"
-    if (project_dir / "package.json").exists():
-        return "node"
-    if (project_dir / "go.mod").exists():
-        return "go"
-    if (project_dir / "Cargo.toml").exists():
-        return "rust"
+    present = _dir_entries(project_dir)
+    for marker, eco in _ECOSYSTEM_MARKERS:
+        if _name_key(marker) in present:
+            return eco
     return "python"
 
 
-def _pkg_name(project_dir: Path) -> str:
-    """Return the implementation package / source directory name."""
-    eco = _detect_ecosystem(project_dir)
+def _pkg_name_for(project_dir: Path, eco: str) -> str:
+    """``_pkg_name`` for a project whose detected ecosystem is already known."""
     if eco == "python":
         return project_dir.name.replace("-", "_")
     return project_dir.name
 
 
-def src_dir(project_dir: Path) -> Path:
-    """Return the implementation source root for a project."""
-    eco = _detect_ecosystem(project_dir)
+def _src_dir_for(project_dir: Path, eco: str) -> Path:
+    """``src_dir`` for a project whose detected ecosystem is already known."""
     if eco == "python":
-        return project_dir / _pkg_name(project_dir)
+        return project_dir / _pkg_name_for(project_dir, eco)
     if eco in {"deno", "node", "rust"}:
         return project_dir / "src"
     # Go: source lives at the project root itself.
     return project_dir
 
 
+def _pkg_name(project_dir: Path) -> str:
+    """Return the implementation package / source directory name."""
+    return _pkg_name_for(project_dir, _detect_ecosystem(project_dir))
+
+
+def src_dir(project_dir: Path) -> Path:
+    """Return the implementation source root for a project."""
+    return _src_dir_for(project_dir, _detect_ecosystem(project_dir))
+
+
 def tests_dir(project_dir: Path) -> Path:
     """Return ``projects/<name>/tests/``."""
     return project_dir / "tests"
@@ -91,30 +177,35 @@ def tests_dir(project_dir: Path) -> Path:
 # ── Ecosystem scaffold templates ───────────────────────────────────────────────
 
 
-def _write_if_absent(path: Path, content: str) -> bool:
-    """Write *content* to *path* only if the file does not exist; return True if written."""
-    if path.exists():
-        return False
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
-    return True
+# Exclusive create; ``O_BINARY`` keeps Windows from translating newlines.
+_EXCL_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
 
 
-def scaffold_ecosystem_configs(project_dir: Path, eco: str) -> None:
-    """Create ecosystem-specific config and boilerplate files (idempotent)."""
-    written: list[str] = []
-    pkg = _pkg_name(project_dir)
-    _src = src_dir(project_dir)
+def _write_if_absent(path: Path, content: bytes) -> bool:
+    """Write *content* to *path* only if the file does not exist; return True if written.
 
-    # Ensure the source root for this ecosystem exists.
-    if eco != "go":  # Go source lives at project root — already exists
-        _src.mkdir(parents=True, exist_ok=True)
+    The file is created with ``O_EXCL``, so the existence check and the create
+    are one syscall and a file that appears in between is never overwritten.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(path, _EXCL_FLAGS, 0o666)
+    except FileExistsError:
+        return False
+    with open(fd, "wb") as f:
+        f.write(content)
+    return True
 
-    if eco == "python":
-        conftest = project_dir / "conftest.py"
-        if _write_if_absent(
-            conftest,
-            """\
+
+# Per-ecosystem boilerplate: (file name, template, label shown when written).
+# Templates are ASCII bytes written verbatim; ``<pkg>`` is replaced with the
+# package name at scaffold time.  Files that
+# already exist are never overwritten.
+_SCAFFOLD_FILES: dict[str, list[tuple[str, bytes, str]]] = {
+    "python": [
+        (
+            "conftest.py",
+            b"""\
 import sys
 from pathlib import Path
 
@@ -122,13 +213,13 @@ from pathlib import Path
 # needing an editable install.  This mirrors the standard pytest convention.
 sys.path.insert(0, str(Path(__file__).parent))
 """,
-        ):
-            written.append("conftest.py")
-
-    elif eco == "deno":
-        if _write_if_absent(
-            project_dir / "deno.json",
-            """\
+            "conftest.py",
+        ),
+    ],
+    "deno": [
+        (
+            "deno.json",
+            b"""\
 {
   "compilerOptions": {
     "strict": true
@@ -136,13 +227,13 @@ sys.path.insert(0, str(Path(__file__).parent))
   "imports": {}
 }
 """,
-        ):
-            written.append("deno.json")
-
-    elif eco == "node":
-        if _write_if_absent(
-            project_dir / "tsconfig.json",
-            """\
+            "deno.json",
+        ),
+    ],
+    "node": [
+        (
+            "tsconfig.json",
+            b"""\
 {
   "compilerOptions": {
     "target": "ESNext",
@@ -156,42 +247,38 @@ sys.path.insert(0, str(Path(__file__).parent))
   "exclude": ["node_modules"]
 }
 """,
-        ):
-            written.append("tsconfig.json")
-
-        # Write a stub package.json only when none exists at all.
-        if _write_if_absent(
-            project_dir / "package.json",
-            f"""\
-{{
-  "name": "{pkg}",
+            "tsconfig.json",
+        ),
+        # Stub package.json, only when none exists at all.
+        (
+            "package.json",
+            b"""\
+{
+  "name": "<pkg>",
   "version": "0.1.0",
   "type": "module"
-}}
+}
 """,
-        ):
-            written.append("package.json (stub)")
-
-    if eco in ("node", "deno"):
-        _patch_tsconfig_for_tests(project_dir)
-
-    elif eco == "go":
-        if _write_if_absent(
-            project_dir / "go.mod",
-            f"""\
-module github.com/local/{pkg}
+            "package.json (stub)",
+        ),
+    ],
+    "go": [
+        (
+            "go.mod",
+            b"""\
+module github.com/local/<pkg>
 
 go 1.22
 """,
-        ):
-            written.append("go.mod")
-
-    elif eco == "rust":
-        if _write_if_absent(
-            project_dir / "Cargo.toml",
-            f"""\
+            "go.mod",
+        ),
+    ],
+    "rust": [
+        (
+            "Cargo.toml",
+            b"""\
 [package]
-name = "{pkg}"
+name = "<pkg>"
 version = "0.1.0"
 edition = "2021"
 
@@ -199,8 +286,31 @@ edition = "2021"
 
 [dev-dependencies]
 """,
-        ):
-            written.append("Cargo.toml")
+            "Cargo.toml",
+        ),
+    ],
+}
+
+
+def scaffold_ecosystem_configs(project_dir: Path, eco: str) -> None:
+    """Create ecosystem-specific config and boilerplate files (idempotent)."""
+    # Layout follows the project's ecosystem even when *eco* is a task override.
+    project_eco = _detect_ecosystem(project_dir)
+    pkg = _pkg_name_for(project_dir, project_eco).encode("utf-8")
+    _src = _src_dir_for(project_dir, project_eco)
+
+    # Ensure the source root for this ecosystem exists.
+    if eco != "go":  # Go source lives at project root — already exists
+        _src.mkdir(parents=True, exist_ok=True)
+
+    written = [
+        label
+        for name, template, label in _SCAFFOLD_FILES.get(eco, [])
+        if _write_if_absent(project_dir / name, template.replace(b"<pkg>", pkg))
+    ]
+
+    if eco in ("node", "deno"):
+        _patch_tsconfig_for_tests(project_dir)
 
     if written:
         _console.print(f"[dim][[scaffold]][/] {eco}: {', '.join(written)}")
@@ -211,47 +321,78 @@ edition = "2021"
 # Map from npm package name → TypeScript ``compilerOptions.types`` entry.
 # Ordered so that the first matching entry wins when multiple frameworks are
 # present in the same project.
-_TEST_FRAMEWORK_TYPES: list[tuple[str, str]] = [
-    ("@types/jest", "jest"),
-    ("jest", "jest"),
-    ("@vitest/ui", "vitest/globals"),
-]
+_TEST_FRAMEWORK_TYPES: dict[str, str] = {
+    "@types/jest": "jest",
+    "jest": "jest",
+    "@vitest/ui": "vitest/globals",
+}
+
+
+# ``//`` line comments, stripped before tsconfig is handed to ``json.loads``.
+_LINE_COMMENT_RE = re.compile(rb"//[^\n]*")
+
+
+_TsconfigKey = tuple[tuple[int, int], tuple[int, int], tuple[int, int] | None]
+
+# Project dir → input stat keys as of its last successful tsconfig patch.
+_TSCONFIG_PATCHED: dict[Path, _TsconfigKey] = {}
+
+
+def _tsconfig_inputs_key(project_dir: Path) -> _TsconfigKey | None:
+    """Return the stat keys of the patch inputs, or None if a config file is missing."""
+    pkg_key = _file_key(project_dir / "package.json")
+    tsconfig_key = _file_key(project_dir / "tsconfig.json")
+    if pkg_key is None or tsconfig_key is None:
+        return None
+    return pkg_key, tsconfig_key, _file_key(project_dir / "tests")
 
 
 def _patch_tsconfig_for_tests(project_dir: Path) -> None:
-    """Ensure ``tsconfig.json`` has test-framework types, ``tests/**/*`` include, and wide rootDir."""
+    """Ensure ``tsconfig.json`` has test-framework types, ``tests/**/*`` include, and wide rootDir.
+
+    Skipped when ``package.json``, ``tsconfig.json`` and ``tests/`` are
+    unchanged (same ``(mtime_ns, size)``) since the last successful patch in
+    this process; a failed patch is retried on the next call.
+    """
+    key = _tsconfig_inputs_key(project_dir)
+    if key is None or _TSCONFIG_PATCHED.get(project_dir) == key:
+        return
+    if _apply_tsconfig_test_patch(project_dir):
+        # Re-key: the patch itself may have rewritten tsconfig.json.
+        new_key = _tsconfig_inputs_key(project_dir)
+        if new_key is not None:
+            _TSCONFIG_PATCHED[project_dir] = new_key
+
+
+def _apply_tsconfig_test_patch(project_dir: Path) -> bool:
+    """Patch ``tsconfig.json`` in place; return False if either config failed to parse."""
     tsconfig_path = project_dir / "tsconfig.json"
     pkg_path = project_dir / "package.json"
-    if not tsconfig_path.exists() or not pkg_path.exists():
-        return
 
     try:
-        pkg: dict = json.loads(pkg_path.read_text(encoding="utf-8"))
+        pkg: dict = json.loads(pkg_path.read_bytes())
     except Exception:  # noqa: BLE001
-        return
+        return False
 
-    all_deps: dict[str, str] = {
-        **pkg.get("dependencies", {}),
-        **pkg.get("devDependencies", {}),
-    }
+    dep_names = (
+        pkg.get("dependencies", {}).keys() | pkg.get("devDependencies", {}).keys()
+    )
 
     # Collect which type entries are needed for this project's test stack.
     needed_types: list[str] = []
-    for pkg_name, type_entry in _TEST_FRAMEWORK_TYPES:
-        if pkg_name in all_deps and type_entry not in needed_types:
+    for pkg_name, type_entry in _TEST_FRAMEWORK_TYPES.items():
+        if pkg_name in dep_names and type_entry not in needed_types:
             needed_types.append(type_entry)
 
     has_tests_dir = (project_dir / "tests").exists()
     if not needed_types and not has_tests_dir:
-        return  # Nothing to patch.
+        return True  # Nothing to patch.
 
     # Parse tsconfig — strip ``//`` comments first for robustness.
     try:
-        raw = tsconfig_path.read_text(encoding="utf-8")
-        cleaned = re.sub(r"//[^\n]*", "", raw)
-        cfg: dict = json.loads(cleaned)
+        cfg: dict = json.loads(_LINE_COMMENT_RE.sub(b"", tsconfig_path.read_bytes()))
     except Exception:  # noqa: BLE001
-        return
+        return False
 
     changed = False
     opts: dict = cfg.setdefault("compilerOptions", {})
@@ -280,55 +421,112 @@ def _patch_tsconfig_for_tests(project_dir: Path) -> None:
             changed = True
 
     if changed:
-        tsconfig_path.write_text(json.dumps(cfg, indent=2) + "\n", encoding="utf-8")
+        tsconfig_path.write_bytes((json.dumps(cfg, indent=2) + "\n").encode("utf-8"))
         _console.print(
             "[dim][[scaffold]][/] tsconfig.json patched for tests"
             + (f" — types: {needed_types}" if needed_types else "")
         )
+    return True
 
 
 # ── Dependency installation ────────────────────────────────────────────────────
 
-# Ordered list of (manifest filename, shell command template, display label).
+# Ordered list of (manifest filename, argv template, display label).
 # All matching manifests are installed — a full-stack project may have several.
-# Placeholders expanded at call time:
+# Placeholders expanded per argv element at call time:
 #   {manifest} — absolute POSIX path to the manifest file
 #   {dir}      — absolute POSIX path to the project directory
 #   {python}   — current Python interpreter (sys.executable)
-_DEP_INSTALLERS: list[tuple[str, str, str]] = [
+_DEP_INSTALLERS: list[tuple[str, list[str], str]] = [
     (
         "requirements.txt",
-        "{python} -m pip install --prefer-binary -r {manifest}",
+        ["{python}", "-m", "pip", "install", "--prefer-binary", "-r", "{manifest}"],
+        "pip",
+    ),
+    (
+        "pyproject.toml",
+        ["{python}", "-m", "pip", "install", "--prefer-binary", "-e", "{dir}"],
         "pip",
     ),
-    ("pyproject.toml", "{python} -m pip install --prefer-binary -e {dir}", "pip"),
-    ("package.json", "pnpm install", "pnpm"),
-    ("Gemfile", "bundle install", "bundle"),
-    ("go.mod", "go mod download", "go"),
-    ("Cargo.toml", "cargo fetch", "cargo"),
+    ("package.json", ["pnpm", "install"], "pnpm"),
+    ("Gemfile", ["bundle", "install"], "bundle"),
+    ("go.mod", ["go", "mod", "download"], "go"),
+    ("Cargo.toml", ["cargo", "fetch"], "cargo"),
 ]
 
 
+def _resolve_argv(argv: list[str]) -> list[str]:
+    """Resolve ``argv[0]`` on PATH so ``.cmd`` shims work without a shell on Windows."""
+    return [shutil.which(argv[0]) or argv[0], *argv[1:]]
+
+
+def _run_installer(
+    argv: list[str], project_dir: Path
+) -> subprocess.CompletedProcess[str] | OSError:
+    """Run one installer argv, returning the completed process or the launch error."""
+    try:
+        return subprocess.run(
+            _resolve_argv(argv),
+            capture_output=True,
+            text=True,
+            cwd=str(project_dir),
+        )
+    except OSError as exc:
+        return exc
+
+
 def install_project_dependencies(project_dir: Path) -> None:
-    """Install all dependencies declared by the project's manifest files."""
-    python = Path(sys.executable).resolve().as_posix()
-    proj_dir_posix = project_dir.resolve().as_posix()
-    found_any = False
+    """Install all dependencies declared by the project's manifest files.
 
-    for manifest_name, cmd_template, label in _DEP_INSTALLERS:
-        manifest = project_dir / manifest_name
-        if not manifest.exists():
+    Installers for different tools run concurrently; manifests handled by the
+    same tool (e.g. ``requirements.txt`` and ``pyproject.toml`` → pip) run one
+    after another so they never race on the same environment.
+    """
+    python = _PYTHON_POSIX
+    proj_dir_posix = _resolved(project_dir).as_posix()
+
+    present = _dir_entries(project_dir)
+    found: list[tuple[str, list[str], str]] = []
+    for manifest_name, argv_template, label in _DEP_INSTALLERS:
+        if _name_key(manifest_name) not in present:
             continue
-        found_any = True
-        manifest_posix = manifest.resolve().as_posix()
-        cmd = cmd_template.format(
-            manifest=manifest_posix, dir=proj_dir_posix, python=python
-        )
+        manifest = project_dir / manifest_name
+        manifest_posix = _resolved(manifest).as_posix()
+        argv = [
+            arg.format(manifest=manifest_posix, dir=proj_dir_posix, python=python)
+            for arg in argv_template
+        ]
+        found.append((manifest_name, argv, label))
         _console.print(f"[dim][[deps]][/] {manifest_name} → [cyan]{label}[/] ...")
-        result = subprocess.run(
-            cmd, shell=True, capture_output=True, text=True, cwd=str(project_dir)
+
+    if not found:
+        _console.print(
+            f"[dim][deps] No dependency manifest found in {project_dir.name} — skipping.[/]"
         )
-        if result.returncode != 0:
+        return
+
+    # One lane per tool; each lane runs its manifests sequentially.
+    lanes: dict[str, list[tuple[str, list[str]]]] = {}
+    for manifest_name, argv, label in found:
+        lanes.setdefault(label, []).append((manifest_name, argv))
+
+    def _run_lane(
+        jobs: list[tuple[str, list[str]]],
+    ) -> dict[str, subprocess.CompletedProcess[str] | OSError]:
+        return {name: _run_installer(argv, project_dir) for name, argv in jobs}
+
+    results: dict[str, subprocess.CompletedProcess[str] | OSError] = {}
+    with ThreadPoolExecutor(max_workers=len(lanes)) as pool:
+        for lane_results in pool.map(_run_lane, lanes.values()):
+            results.update(lane_results)
+
+    for manifest_name, _argv, _label in found:
+        result = results[manifest_name]
+        if isinstance(result, OSError):
+            _console.print(
+                f"[yellow]⚠ dependency install failed ({manifest_name}):[/] {result}"
+            )
+        elif result.returncode != 0:
             # Show a concise error: extract the last non-blank error line.
             err_lines = [ln.strip() for ln in result.stderr.splitlines() if ln.strip()]
             err_summary = err_lines[-1] if err_lines else "unknown error"
@@ -339,11 +537,6 @@ def install_project_dependencies(project_dir: Path) -> None:
         else:
             _console.print(f"[dim][deps][/] {manifest_name} installed.")
 
-    if not found_any:
-        _console.print(
-            f"[dim][deps] No dependency manifest found in {project_dir.name} — skipping.[/]"
-        )
-
 
 # ── opencode config sync ───────────────────────────────────────────────────────
 
@@ -353,12 +546,12 @@ def _sync_opencode_config(project_dir: Path) -> None:
     src = Path("opencode.jsonc")
     dst = project_dir / "opencode.jsonc"
     if src.exists():
-        dst.write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
+        dst.write_bytes(src.read_bytes())
 
 
 # ── Git helpers ────────────────────────────────────────────────────────────────
 
-# Standard gitignore written into every new project repo.
+# Standard gitignore written into every new project repo (pre-encoded bytes).
 # Covers common artefacts across Python, Node/Deno, Go, and Rust ecosystems.
 _PROJECT_GITIGNORE = """\
 # Python
@@ -392,35 +585,45 @@ opencode.jsonc
 
 # Runner agent logs (per-invocation; auto-generated)
 logs/
-"""
+""".encode()
 
 
-def git_run(cmd: str, project_dir: Path) -> bool:
-    """Run ``git -C <project_dir> <cmd>`` silently; return True on exit code 0."""
-    return (
-        subprocess.run(
-            f'git -C "{project_dir}" {cmd}',
-            shell=True,
-            capture_output=True,
-        ).returncode
-        == 0
-    )
+def _git_returncode(argv: list[str]) -> int:
+    """Run a git *argv* with output discarded (only the exit code is used)."""
+    return subprocess.run(
+        argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    ).returncode
+
+
+def git_run(args: list[str], project_dir: Path) -> bool:
+    """Run ``git -C <project_dir> <args...>`` silently; return True on exit code 0.
+
+    *args* are passed to git verbatim (no shell, no re-splitting), so task
+    titles and paths may contain any characters.
+    """
+    return _git_returncode(["git", "-C", str(project_dir), *args]) == 0
+
+
+@lru_cache(maxsize=64)
+def _origin_configured(repo: str, key: tuple[int, int] | None) -> bool:
+    """Run ``git remote get-url origin`` in *repo*; memoised on ``.git/config``'s stat *key*."""
+    return _git_returncode(["git", "-C", repo, "remote", "get-url", "origin"]) == 0
 
 
 def _git_has_remote(project_dir: Path) -> bool:
-    """Return True if the repo has an 'origin' remote configured."""
-    result = subprocess.run(
-        f'git -C "{project_dir}" remote get-url origin',
-        shell=True,
-        capture_output=True,
-    )
-    return result.returncode == 0
+    """Return True if the repo has an 'origin' remote configured.
 
+    Re-probed only when ``.git/config``'s ``(mtime_ns, size)`` changes, so a
+    remote added while the runner is active is picked up.
+    """
+    repo = _resolved(project_dir)
+    return _origin_configured(str(repo), _file_key(repo / ".git" / "config"))
 
-def _git_push_if_remote(ref: str, project_dir: Path) -> None:
-    """Push *ref* to origin if a remote is configured; skip silently otherwise."""
+
+def _git_push_if_remote(*refs: str, project_dir: Path) -> None:
+    """Push *refs* to origin in one call if a remote is configured; skip otherwise."""
     if _git_has_remote(project_dir):
-        git_run(f"push origin {ref}", project_dir)
+        git_run(["push", "origin", *refs], project_dir)
 
 
 def ensure_project_git(project_dir: Path) -> None:
@@ -429,28 +632,28 @@ def ensure_project_git(project_dir: Path) -> None:
     No-op if ``.git/`` already exists or the project does not opt in to
     runner-managed git (``git.enabled`` in ROADMAP.json).
     """
+    # Cheap stat first — only parse ROADMAP.json when a repo may need creating.
+    if os.path.exists(project_dir / ".git"):
+        return
+
     from runner.roadmap import is_git_managed  # noqa: PLC0415
 
     if not is_git_managed(project_dir):
         return
 
-    git_dir = project_dir / ".git"
-    if git_dir.exists():
-        return
-
     _console.print(
         f"[dim][[git]][/] Initialising project repo in [cyan]{project_dir}[/] ..."
     )
 
     gitignore = project_dir / ".gitignore"
     if not gitignore.exists():
-        gitignore.write_text(_PROJECT_GITIGNORE, encoding="utf-8")
+        gitignore.write_bytes(_PROJECT_GITIGNORE)
 
-    git_run("init", project_dir)
-    git_run("add .", project_dir)
-    git_run('commit -m "chore: initial project scaffold"', project_dir)
-    git_run("branch -M main", project_dir)
-    git_run("checkout -b develop", project_dir)
+    git_run(["init"], project_dir)
+    git_run(["add", "."], project_dir)
+    git_run(["commit", "-m", "chore: initial project scaffold"], project_dir)
+    git_run(["branch", "-M", "main"], project_dir)
+    git_run(["checkout", "-b", "develop"], project_dir)
     _console.print(
         f"[dim][git][/] Repo initialised — branches: [cyan]main[/], [cyan]develop[/]"
     )
@@ -471,12 +674,30 @@ def ensure_feature_branch(task: str, project_dir: Path) -> str | None:
     if not is_git_managed(project_dir):
         return None
     branch = f"feature/{slugify(task)}"
-    if not git_run(f"checkout -b {branch}", project_dir):
-        git_run(f"checkout {branch}", project_dir)
+    if not git_run(["checkout", "-b", branch], project_dir):
+        git_run(["checkout", branch], project_dir)
     _console.print(f"[dim][git] On branch [cyan]{branch}[/cyan][/]")
     return branch
 
 
+# Paths per ``git add`` invocation — keeps the command line well under ARG_MAX.
+_GIT_ADD_CHUNK = 100
+
+
+def _git_add_paths(paths: list[str], project_dir: Path) -> None:
+    """Stage *paths* with one ``git add`` per chunk of ``_GIT_ADD_CHUNK`` paths.
+
+    git rejects the whole command if any pathspec matches nothing, so a failed
+    chunk is retried one path at a time — every other path still gets staged.
+    """
+    for start in range(0, len(paths), _GIT_ADD_CHUNK):
+        chunk = paths[start : start + _GIT_ADD_CHUNK]
+        if git_run(["add", "--", *chunk], project_dir) or len(chunk) == 1:
+            continue
+        for p in chunk:
+            git_run(["add", "--", p], project_dir)
+
+
 def commit_and_merge(
     task: str, project_dir: Path, task_outputs: list[str] | None = None
 ) -> None:
@@ -492,17 +713,16 @@ def commit_and_merge(
     label = _clean_task_label(task)
     # Always include runner state so the completed-task record is part of the commit.
     if (project_dir / ".runner_state.json").exists():
-        git_run('add ".runner_state.json"', project_dir)
+        git_run(["add", ".runner_state.json"], project_dir)
     if task_outputs:
-        for out in task_outputs:
-            git_run(f'add "{out}"', project_dir)
+        _git_add_paths(task_outputs, project_dir)
     else:
-        git_run("add .", project_dir)
-    git_run(f'commit -m "feat: {label}"', project_dir)
-    git_run("checkout develop", project_dir)
-    git_run(f"merge --no-ff {branch}", project_dir)
-    git_run(f"branch -d {branch}", project_dir)
-    _git_push_if_remote("develop", project_dir)
+        git_run(["add", "."], project_dir)
+    git_run(["commit", "-m", f"feat: {label}"], project_dir)
+    git_run(["checkout", "develop"], project_dir)
+    git_run(["merge", "--no-ff", branch], project_dir)
+    git_run(["branch", "-d", branch], project_dir)
+    _git_push_if_remote("develop", project_dir=project_dir)
     _console.print(
         f"[dim][git] Committed [cyan]{label}[/cyan] → develop (branch {branch} merged & deleted)[/]"
     )
@@ -521,11 +741,11 @@ def tag_milestone(version: str, project_dir: Path) -> None:
         )
         return
     _console.print(f"[bold magenta]Milestone:[/] tagging [cyan]v{version}[/]")
-    git_run("add .", project_dir)
-    git_run(f'commit --allow-empty -m "milestone: v{version}"', project_dir)
-    git_run(f"tag v{version}", project_dir)
-    _git_push_if_remote("develop", project_dir)
-    _git_push_if_remote(f"v{version}", project_dir)
+    git_run(["add", "."], project_dir)
+    git_run(["commit", "--allow-empty", "-m", f"milestone: v{version}"], project_dir)
+    git_run(["tag", f"v{version}"], project_dir)
+    # One push for branch and tag: a single connection/auth round trip.
+    _git_push_if_remote("develop", f"v{version}", project_dir=project_dir)
     _console.print(f"[green bold]✔ Tagged v{version} on develop[/]")
 
 
@@ -563,32 +783,28 @@ def try_deploy_hook(task: str | None, project_dir: Path) -> None:
 
     from runner.roadmap import get_deploy_config, is_deploy_task  # noqa: PLC0415
 
-    cfg = get_deploy_config(project_dir)
-    if not cfg.get("enabled", False):
+    # Per-task gating first: most tasks are not marked for deploy, and this
+    # skips building the project deploy config (and any deploy.json read).
+    if task is not None and not is_deploy_task(task, project_dir):
         return
 
-    # Per-task gating: skip unless the task is marked for deploy.
-    if task is not None and not is_deploy_task(task, project_dir):
+    cfg = get_deploy_config(project_dir)
+    if not cfg.get("enabled", False):
         return
 
     # Resolve script path.
     explicit_script = cfg.get("script")
     if explicit_script:
-        script = (project_dir / explicit_script).resolve()
+        script = _resolved(project_dir / explicit_script)
         if not script.exists():
             _console.print(
                 f"[yellow]⚠ deploy.script '{explicit_script}' not found — skipping deploy.[/]"
             )
             return
     else:
-        candidates = (
-            ["scripts/deploy.ps1", "scripts/deploy.sh"]
-            if platform.system() == "Windows"
-            else ["scripts/deploy.sh"]
-        )
         script = None
-        for candidate in candidates:
-            p = (project_dir / candidate).resolve()
+        for candidate in _DEPLOY_SCRIPT_CANDIDATES:
+            p = _resolved(project_dir / candidate)
             if p.exists():
                 script = p
                 break
@@ -598,14 +814,14 @@ def try_deploy_hook(task: str | None, project_dir: Path) -> None:
     deploy_env = {**os.environ, **_load_deploy_config(project_dir)}
 
     cmd = (
-        f'powershell -ExecutionPolicy Bypass -File "{script}"'
-        if platform.system() == "Windows"
-        else f'bash "{script}"'
+        ["powershell", "-ExecutionPolicy", "Bypass", "-File", str(script)]
+        if _IS_WINDOWS
+        else ["bash", str(script)]
     )
     _console.print(
-        f"[dim][deploy] running {script.relative_to(project_dir.resolve())}...[/]"
+        f"[dim][deploy] running {script.relative_to(_resolved(project_dir))}...[/]"
     )
-    result = subprocess.run(cmd, shell=True, cwd=str(project_dir), env=deploy_env)
+    result = subprocess.run(cmd, cwd=str(project_dir), env=deploy_env)
     if result.returncode == 0:
         _console.print("[green bold]✈ Deploy completed.[/]")
     else:
@@ -622,7 +838,7 @@ def ensure_workspace_dirs(project_dir: Path) -> None:
     eco = _detect_ecosystem(project_dir)
     scaffold_ecosystem_configs(project_dir, eco)
     if eco == "python":
-        init = src_dir(project_dir) / "__init__.py"
+        init = _src_dir_for(project_dir, eco) / "__init__.py"
         if not init.exists():
             init.touch()
     tst = tests_dir(project_dir)
@@ -645,19 +861,46 @@ def ensure_workspace_dirs(project_dir: Path) -> None:
         generate_project_agents_md(project_dir)
 
 
+def _has_ignore_line(buf: bytes, entry: bytes) -> bool:
+    """Return True if *entry* appears in *buf* as its own (whitespace-trimmed) line."""
+    pos = buf.find(entry)
+    while pos != -1:
+        line_start = buf.rfind(b"\n", 0, pos) + 1
+        line_end = buf.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(buf)
+        if buf[line_start:line_end].strip() == entry:
+            return True
+        pos = buf.find(entry, pos + 1)
+    return False
+
+
 def _ensure_logs_gitignored(project_dir: Path) -> None:
-    """Append ``logs/`` to the project .gitignore if it is not already listed."""
+    """Append ``logs/`` to the project .gitignore if it is not already listed.
+
+    The file is read and, only on a miss, extended through one ``r+b`` handle.
+    A read-only .gitignore that already lists the entry is left alone.
+    """
     gitignore = project_dir / ".gitignore"
-    entry = "logs/"
-    if gitignore.exists():
-        text = gitignore.read_text(encoding="utf-8")
-        # Check whether the entry (as its own non-commented line) is already present.
-        if any(line.strip() == entry for line in text.splitlines()):
+    entry = b"logs/"
+    try:
+        fh = gitignore.open("r+b")
+    except FileNotFoundError:
+        return
+    except PermissionError:
+        if _has_ignore_line(gitignore.read_bytes(), entry):
+            return
+        raise
+    with fh:
+        buf = fh.read()
+        if _has_ignore_line(buf, entry):
             return
-        gitignore.write_text(
-            text.rstrip("\n")
-            + f"\n\n# Runner agent logs (per-invocation; auto-generated)\n{entry}\n",
-            encoding="utf-8",
+        fh.seek(0, os.SEEK_END)
+        fh.write(
+            (b"" if not buf or buf.endswith(b"\n") else b"\n")
+            + b"\n# Runner agent logs (per-invocation; auto-generated)\n"
+            + entry
+            + b"\n"
         )
 
 
@@ -772,90 +1015,24 @@ _TEST_CMD: dict[str, str] = {
 }
 
 
-def generate_project_agents_md(project_dir: Path) -> None:
-    """Generate (or overwrite) ``AGENTS.md`` in *project_dir*.
-
-    Produces a project-specific agents instruction file derived from the project
-    ROADMAP.json (name, ecosystem, preamble, task list) and the workspace
-    implementation guidelines.  Written in a format that opencode agents working
-    **inside** the project directory can use as authoritative context without
-    needing access to the workspace-level AGENTS.md.
-    """
-    import datetime as _dt  # noqa: PLC0415
-
-    roadmap_path = project_dir / ROADMAP_FILENAME
-    roadmap: dict = {}
-    if roadmap_path.exists():
-        try:
-            roadmap = json.loads(roadmap_path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            pass
-
-    project_name = roadmap.get("name") or project_dir.name
-    eco = _detect_ecosystem(project_dir)
-    preamble = roadmap.get("preamble", "")
-    if isinstance(preamble, list):
-        preamble = "\n".join(preamble)
-    preamble = preamble.strip()
-
-    pkg = _pkg_name(project_dir)
-    _src = src_dir(project_dir)
-    src_rel = _src.relative_to(project_dir).as_posix() if _src != project_dir else "."
-
-    layout = (
-        _ECO_LAYOUT.get(eco, f"`src/` — implementation\n`tests/` — tests")
-        .replace("<pkg>", pkg)
-        .replace("<project>", project_dir.name)
-    )
-    guidelines = _ECO_GUIDELINES.get(
-        eco, "- Follow standard conventions for the ecosystem."
-    )
-    static_check = _STATIC_CHECK.get(eco, "run the project linter")
-    test_cmd = _TEST_CMD.get(eco, "run the project test suite")
-
-    # ── Task summary ──────────────────────────────────────────────────────
-    tasks: list[dict] = roadmap.get("tasks", [])
-    total_tasks = len(tasks)
-    done_tasks = len(_completed_tasks(_raw_state(project_dir)))
-    task_summary = (
-        f"{done_tasks} / {total_tasks} tasks complete"
-        if total_tasks
-        else "No tasks defined yet"
-    )
-
-    # ── Build the document ────────────────────────────────────────────────
-    ts = _dt.datetime.now().strftime("%Y-%m-%d %H:%M")
-    out_lines: list[str] = [
-        f"<!-- auto-generated by runner on {ts} — regenerate via runner menu -->\n",
-        f"# {project_name} — Agent Instructions\n",
+# Static AGENTS.md sections, pre-joined once.  Each slab ends without a
+# trailing separator — ``generate_project_agents_md`` joins parts with "\n".
+_AGENTS_MD_INTRO = "\n".join(
+    [
         "This file is read automatically by opencode agents working inside this\n"
         "project directory. It describes the layout, conventions, and task rules.\n"
         "**Do not edit by hand** — regenerate via the runner menu when the ROADMAP changes.\n",
         "---\n",
         "## Project overview\n",
-        f"| Field      | Value |\n"
-        f"|------------|-------|\n"
-        f"| Name       | {project_name} |\n"
-        f"| Ecosystem  | {eco} |\n"
-        f"| Source     | `{src_rel}/` |\n"
-        f"| Tests      | `tests/` |\n"
-        f"| Progress   | {task_summary} |\n",
     ]
+)
 
-    if preamble:
-        out_lines += [
-            "\n### Description\n",
-            preamble + "\n",
-        ]
-
-    out_lines += [
-        "\n---\n",
-        "## Repository layout\n",
-        layout + "\n",
+_AGENTS_MD_TASKS = "\n".join(
+    [
         "\n---\n",
         "## ROADMAP and tasks\n",
-        f"All tasks are defined in `ROADMAP.json` at the project root.\n"
-        f"The runner passes the current task's full spec to the agent as a prompt.\n",
+        "All tasks are defined in `ROADMAP.json` at the project root.\n"
+        "The runner passes the current task's full spec to the agent as a prompt.\n",
         "\nEach task has this shape:\n",
         "```json\n"
         "{\n"
@@ -876,18 +1053,11 @@ def generate_project_agents_md(project_dir: Path) -> None:
         "\n---\n",
         "## Pipeline phases\n",
         "The runner drives the agent through these phases for each task:\n",
-        "```\n"
-        f"Build    → implement module + unit tests ({src_rel}/ and tests/)\n"
-        f"Test     → {test_cmd}\n"
-        "Fix      → repair failing tests (same session, full test output provided)\n"
-        f"Static   → {static_check}\n"
-        "Stfix    → repair static analysis issues\n"
-        "Document → update README only (no logic changes)\n"
-        "Commit   → runner handles git (feature/<slug> → develop)\n"
-        "```\n",
-        "\n---\n",
-        "## Implementation guidelines\n",
-        guidelines + "\n",
+    ]
+)
+
+_AGENTS_MD_RULES = "\n".join(
+    [
         "\n---\n",
         "## Testing rules\n",
         "- At least one test per public function / method (happy path + task-specified edge cases).\n"
@@ -906,10 +1076,118 @@ def generate_project_agents_md(project_dir: Path) -> None:
         "- Do not run `git push`, `git merge`, `git tag`, or `git commit` — the runner owns git.\n"
         "- Do not add features not listed in `outputs:` or the task body.\n",
     ]
+)
+
+
+def _fmt_escape(text: str) -> str:
+    """Escape literal braces so *text* survives ``str.format``."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+# Whole document as one ``str.format`` template; only the placeholders are
+# filled per call.  ``{description}`` is either empty or a complete section.
+_AGENTS_MD_TEMPLATE = "\n".join(
+    [
+        "<!-- auto-generated by runner on {ts} — regenerate via runner menu -->\n",
+        "# {name} — Agent Instructions\n",
+        _fmt_escape(_AGENTS_MD_INTRO),
+        "| Field      | Value |\n"
+        "|------------|-------|\n"
+        "| Name       | {name} |\n"
+        "| Ecosystem  | {eco} |\n"
+        "| Source     | `{src_rel}/` |\n"
+        "| Tests      | `tests/` |\n"
+        "| Progress   | {task_summary} |\n",
+        "{description}\n---\n",
+        "## Repository layout\n",
+        "{layout}\n",
+        _fmt_escape(_AGENTS_MD_TASKS),
+        "```\n"
+        "Build    → implement module + unit tests ({src_rel}/ and tests/)\n"
+        "Test     → {test_cmd}\n"
+        "Fix      → repair failing tests (same session, full test output provided)\n"
+        "Static   → {static_check}\n"
+        "Stfix    → repair static analysis issues\n"
+        "Document → update README only (no logic changes)\n"
+        "Commit   → runner handles git (feature/<slug> → develop)\n"
+        "```\n",
+        "\n---\n",
+        "## Implementation guidelines\n",
+        "{guidelines}\n",
+        _fmt_escape(_AGENTS_MD_RULES),
+    ]
+)
+
+
+def generate_project_agents_md(project_dir: Path) -> None:
+    """Generate (or overwrite) ``AGENTS.md`` in *project_dir*.
 
-    out = "\n".join(out_lines)
+    Produces a project-specific agents instruction file derived from the project
+    ROADMAP.json (name, ecosystem, preamble, task list) and the workspace
+    implementation guidelines.  Written in a format that opencode agents working
+    **inside** the project directory can use as authoritative context without
+    needing access to the workspace-level AGENTS.md.
+    """
+    import datetime as _dt  # noqa: PLC0415
+
+    roadmap = _roadmap_data(project_dir / ROADMAP_FILENAME)
+
+    project_name = roadmap.get("name") or project_dir.name
+    eco = _detect_ecosystem(project_dir)
+    preamble = roadmap.get("preamble", "")
+    if isinstance(preamble, list):
+        preamble = "\n".join(preamble)
+    preamble = preamble.strip()
+
+    pkg = _pkg_name_for(project_dir, eco)
+    _src = _src_dir_for(project_dir, eco)
+    src_rel = _src.relative_to(project_dir).as_posix() if _src != project_dir else "."
+
+    layout = (
+        _ECO_LAYOUT.get(eco, f"`src/` — implementation\n`tests/` — tests")
+        .replace("<pkg>", pkg)
+        .replace("<project>", project_dir.name)
+    )
+    guidelines = _ECO_GUIDELINES.get(
+        eco, "- Follow standard conventions for the ecosystem."
+    )
+    static_check = _STATIC_CHECK.get(eco, "run the project linter")
+    test_cmd = _TEST_CMD.get(eco, "run the project test suite")
+
+    # ── Task summary ──────────────────────────────────────────────────────
+    tasks: list[dict] = roadmap.get("tasks", [])
+    total_tasks = len(tasks)
+    done_tasks = len(_completed_tasks(_raw_state(project_dir)))
+    task_summary = (
+        f"{done_tasks} / {total_tasks} tasks complete"
+        if total_tasks
+        else "No tasks defined yet"
+    )
+
+    # ── Build the document ────────────────────────────────────────────────
+    ts = _dt.datetime.now().strftime("%Y-%m-%d %H:%M")
+    out = _AGENTS_MD_TEMPLATE.format(
+        ts=ts,
+        name=project_name,
+        eco=eco,
+        src_rel=src_rel,
+        task_summary=task_summary,
+        description=f"\n### Description\n\n{preamble}\n\n" if preamble else "",
+        layout=layout,
+        test_cmd=test_cmd,
+        static_check=static_check,
+        guidelines=guidelines,
+    ).encode("utf-8")
     agents_path = project_dir / "AGENTS.md"
-    agents_path.write_text(out, encoding="utf-8")
+    # Leave the file (and its mtime) alone when only the timestamp line differs.
+    try:
+        existing = agents_path.read_bytes()
+    except OSError:
+        existing = b""
+    if existing.partition(b"\n")[2] == out.partition(b"\n")[2]:
+        _console.print("[dim]AGENTS.md unchanged — not rewritten.[/]")
+        return
+    agents_path.write_bytes(out)
     _console.print(
         f"[green]✔ AGENTS.md[/] generated → [dim]{agents_path.relative_to(project_dir.parent)}[/]"
     )
@@ -920,25 +1198,67 @@ def generate_project_agents_md(project_dir: Path) -> None:
 
 def list_projects() -> list[Path]:
     """Return sorted project directories under PROJECTS_ROOT that contain a ROADMAP.json."""
-    if not PROJECTS_ROOT.exists():
+    try:
+        with os.scandir(PROJECTS_ROOT) as it:
+            # DirEntry.is_dir() reuses the d_type from the listing — no extra stat.
+            names = sorted(
+                entry.name
+                for entry in it
+                if entry.is_dir()
+                and os.path.isfile(os.path.join(entry.path, ROADMAP_FILENAME))
+            )
+    except OSError:
         return []
-    return sorted(
-        p
-        for p in PROJECTS_ROOT.iterdir()
-        if p.is_dir() and (p / ROADMAP_FILENAME).exists()
-    )
+    return [PROJECTS_ROOT / name for name in names]
+
+
+# ``runner.roadmap.get_tasks``, bound on first use — roadmap imports workspace,
+# so it cannot be imported at module load.
+_get_tasks: Callable[[Path], list[str]] | None = None
+
+
+def _resolve_get_tasks() -> Callable[[Path], list[str]]:
+    """Return ``runner.roadmap.get_tasks``, importing it only on the first call."""
+    global _get_tasks
+    if _get_tasks is None:
+        from runner.roadmap import get_tasks  # noqa: PLC0415
+
+        _get_tasks = get_tasks
+    return _get_tasks
+
+
+@lru_cache(maxsize=256)
+def _cached_tasks(proj: Path, key: tuple[int, int] | None) -> tuple[str, ...]:
+    """Task headings of *proj*, memoised on the ROADMAP file's stat *key*."""
+    return tuple(_resolve_get_tasks()(proj))
+
+
+@lru_cache(maxsize=256)
+def _cached_task_index(proj: Path, key: tuple[int, int] | None) -> dict[str, int]:
+    """Heading → 1-based task position for *proj*, memoised like ``_cached_tasks``."""
+    return {task: i for i, task in enumerate(_cached_tasks(proj, key), start=1)}
+
+
+def _clear_cache() -> None:
+    """Drop this module's stat-keyed memos (ROADMAP parses, listings, git probes)."""
+    _parse_roadmap_file.cache_clear()
+    _TSCONFIG_PATCHED.clear()
+    _origin_configured.cache_clear()
+    _cached_tasks.cache_clear()
+    _cached_task_index.cache_clear()
 
 
 def _project_status(proj: Path) -> tuple[str, str]:
-    """Return ``(badge, detail)`` describing the project's completion status."""
-    # Import here to avoid a circular dep: roadmap imports workspace.
-    from runner.roadmap import get_tasks  # noqa: PLC0415
+    """Return ``(badge, detail)`` describing the project's completion status.
 
-    all_tasks = get_tasks(proj)
+    ROADMAP and state parses are cached on each file's ``(mtime_ns, size)``,
+    so repeated listings only re-read projects whose files changed.
+    """
+    roadmap_key = _file_key(proj / ROADMAP_FILENAME)
+    all_tasks = _cached_tasks(proj, roadmap_key)
     total = len(all_tasks)
-    state = _raw_state(proj)
-    done_set = _completed_tasks(state)
-    done = len(done_set)
+    state, completed = _state_snapshot(proj)
+    done = len(completed)
     interrupted = state.get("current_task") is not None
 
     if total == 0:
@@ -946,14 +1266,30 @@ def _project_status(proj: Path) -> tuple[str, str]:
     if done == total:
         return "complete", f"{done} / {total} tasks"
     if interrupted:
-        current = state["current_task"]
-        try:
-            idx = all_tasks.index(current) + 1
-            interrupted_label = f"interrupted at task {idx}"
-        except ValueError:
-            interrupted_label = "interrupted"
+        idx = _cached_task_index(proj, roadmap_key).get(state["current_task"])
+        interrupted_label = (
+            f"interrupted at task {idx}" if idx is not None else "interrupted"
+        )
         return "interrupted", f"{done} / {total} tasks · {interrupted_label}"
     if done == 0:
         return "not started", f"0 / {total} tasks"
     remaining = total - done
     return "in progress", f"{done} / {total} tasks · {remaining} remaining"
+
+
+# Upper bound on threads used to compute project statuses for the picker.
+_STATUS_WORKERS = 8
+
+
+def project_statuses(projects: list[Path]) -> list[tuple[str, str]]:
+    """Return ``_project_status`` for each of *projects*, in the same order.
+
+    Several projects are probed on a thread pool so their stat and read
+    latencies overlap; the per-file caches behind ``_project_status`` are
+    thread-safe.
+    """
+    if len(projects) <= 1:
+        return [_project_status(p) for p in projects]
+    workers = min(_STATUS_WORKERS, len(projects))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_project_status, projects))
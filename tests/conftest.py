@@ -1,16 +1,35 @@
 """Shared fixtures for runner unit tests."""
 
 import json
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
 
 
+def _clear_file_caches() -> None:
+    """Call every runner module's ``_clear_cache`` hook."""
+    from runner import config, opencode, roadmap, state, workspace
+
+    for module in (config, opencode, roadmap, state, workspace):
+        module._clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_file_caches() -> None:
+    """Start every test without file parses memoised by earlier tests."""
+    _clear_file_caches()
+
+
 @pytest.fixture()
-def tmp_project(tmp_path: Path) -> Path:
-    """Create a minimal project directory with a ROADMAP.json and required structure."""
-    project = tmp_path / "test-project"
-    project.mkdir()
+def clear_file_caches() -> Callable[[], None]:
+    """Return the hook that drops all stat-keyed memos (for same-stat rewrites)."""
+    return _clear_file_caches
+
+
+@pytest.fixture(scope="session")
+def _roadmap_bytes() -> bytes:
+    """Serialized ROADMAP.json for ``tmp_project`` — encoded once per session."""
     roadmap = {
         "name": "Test Project v0.1",
         "ecosystem": "python",
@@ -50,17 +69,12 @@ def tmp_project(tmp_path: Path) -> Path:
             },
         ],
     }
-    (project / "ROADMAP.json").write_text(
-        json.dumps(roadmap, indent=2), encoding="utf-8"
-    )
-    (project / "test_project").mkdir()
-    (project / "tests").mkdir()
-    return project
+    return json.dumps(roadmap, separators=(",", ":")).encode("utf-8")
 
 
-@pytest.fixture()
-def budget_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
-    """Write a budget.json to tmp_path and monkeypatch cwd so config.py finds it."""
+@pytest.fixture(scope="session")
+def _budget_bytes() -> bytes:
+    """Serialized budget.json for ``budget_json`` — encoded once per session."""
     budget = {
         "monthly_limit_tokens": 100_000,
         "per_task_limit_tokens": 50_000,
@@ -73,7 +87,65 @@ def budget_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
             "cache_write": 3.75,
         },
     }
+    return json.dumps(budget).encode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def shared_prompts(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Read-only prompts directory with the templates used by render_prompt tests."""
+    prompts = tmp_path_factory.mktemp("prompts")
+    templates = {
+        "test_tmpl.md": "Task: {{TASK}}\nBody: {{BODY}}",
+        "partial.md": "A: {{A}} B: {{B}}",
+        "simple.md": "Hello {{NAME}}",
+        "nested.md": "{{A}} / {{B}}",
+    }
+    for name, text in templates.items():
+        (prompts / name).write_bytes(text.encode("utf-8"))
+    return prompts
+
+
+@pytest.fixture()
+def tmp_project(tmp_path: Path, _roadmap_bytes: bytes) -> Path:
+    """Create a minimal project directory with a ROADMAP.json and required structure."""
+    project = tmp_path / "test-project"
+    project.mkdir()
+    (project / "ROADMAP.json").write_bytes(_roadmap_bytes)
+    (project / "test_project").mkdir()
+    (project / "tests").mkdir()
+    return project
+
+
+@pytest.fixture()
+def make_project(tmp_path: Path) -> Callable[..., Path]:
+    """Factory that creates ``tmp_path/<name>`` holding *roadmap* and extra files.
+
+    ``files`` maps project-relative paths to their bytes; parent directories are
+    created as needed.  Calling it again with the same *name* rewrites the
+    project's ROADMAP in place.
+    """
+
+    def _make(
+        roadmap: dict, files: dict[str, bytes] | None = None, name: str = "proj"
+    ) -> Path:
+        project = tmp_path / name
+        project.mkdir(parents=True, exist_ok=True)
+        (project / "ROADMAP.json").write_bytes(json.dumps(roadmap).encode("utf-8"))
+        for rel, data in (files or {}).items():
+            path = project / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        return project
+
+    return _make
+
+
+@pytest.fixture()
+def budget_json(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, _budget_bytes: bytes
+) -> Path:
+    """Write a budget.json to tmp_path and monkeypatch cwd so config.py finds it."""
     path = tmp_path / "budget.json"
-    path.write_text(json.dumps(budget), encoding="utf-8")
+    path.write_bytes(_budget_bytes)
     monkeypatch.chdir(tmp_path)
     return path
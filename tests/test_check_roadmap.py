@@ -1,11 +1,13 @@
 """Tests for helpers.check_roadmap -- ROADMAP.json structural validator."""
 
+import copy
 import json
 from pathlib import Path
 
 import pytest
 
 from helpers.check_roadmap import (
+    CheckContext,
     check_architecture,
     check_checkpoint_refs,
     check_depends_on,
@@ -18,36 +20,70 @@ from helpers.check_roadmap import (
     check_titles,
     parse_roadmap,
     run_checks,
+    run_checks_dict,
 )
 
 # -- Helpers -------------------------------------------------------------------
 
 
+# Shared minimal valid ROADMAP.  Never mutate it — use ``_roadmap()`` for a copy.
+_BASE_ROADMAP: dict = {
+    "name": "Test",
+    "ecosystem": "python",
+    "preamble": "",
+    "tasks": [
+        {
+            "id": 1,
+            "title": "Alpha",
+            "depends_on": [],
+            "outputs": ["x.py"],
+            "acceptance": "ok",
+            "description": "Do alpha.",
+        }
+    ],
+}
+
+
 def _roadmap(**overrides) -> dict:
-    """Return a minimal valid ROADMAP dict, with optional overrides."""
-    base = {
-        "name": "Test",
-        "ecosystem": "python",
-        "preamble": "",
-        "tasks": [
-            {
-                "id": 1,
-                "title": "Alpha",
-                "depends_on": [],
-                "outputs": ["x.py"],
-                "acceptance": "ok",
-                "description": "Do alpha.",
-            }
-        ],
-    }
-    base.update(overrides)
-    return base
+    """Return a fresh copy of the minimal valid ROADMAP dict, with optional overrides."""
+    return {**copy.deepcopy(_BASE_ROADMAP), **overrides}
+
+
+def _roadmap_ro() -> dict:
+    """Return the shared minimal ROADMAP dict for tests that only read it."""
+    return _BASE_ROADMAP
+
+
+_PARSE_CACHE: dict[int, tuple] = {}
+
+
+def _parse(data: dict) -> tuple:
+    """``parse_roadmap(data)``, memoised by identity for the shared ``_BASE_ROADMAP``.
+
+    Only the shared template is cached: it lives for the whole session, so its
+    ``id()`` can never be recycled by another dict.
+    """
+    if data is not _BASE_ROADMAP:
+        return parse_roadmap(data)
+    key = id(data)
+    cached = _PARSE_CACHE.get(key)
+    if cached is None:
+        cached = _PARSE_CACHE[key] = parse_roadmap(data)
+    return cached
+
+
+def _has(issues: list, substr: str = "", level: str | None = None) -> bool:
+    """True if any issue's message contains *substr* (and matches *level*, if given)."""
+    for i in issues:
+        if substr in i.message and (level is None or i.level == level):
+            return True
+    return False
 
 
 def _write(path: Path, data: dict) -> Path:
     """Write a ROADMAP.json and return the path."""
     f = path / "ROADMAP.json"
-    f.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    f.write_bytes(json.dumps(data).encode("utf-8"))
     return f
 
 
@@ -134,8 +170,8 @@ class TestParseRoadmap:
 
 class TestCheckPreamble:
     def test_valid_ecosystem(self) -> None:
-        data = _roadmap()
-        _, tasks = parse_roadmap(data)
+        data = _roadmap_ro()
+        _, tasks = _parse(data)
         issues = check_preamble(data, tasks)
         assert not issues
 
@@ -144,13 +180,13 @@ class TestCheckPreamble:
         del data["ecosystem"]
         _, tasks = parse_roadmap(data)
         issues = check_preamble(data, tasks)
-        assert not any(i.level == "ERROR" for i in issues)
+        assert not _has(issues, level="ERROR")
 
     def test_unknown_ecosystem_warns(self) -> None:
         data = _roadmap(ecosystem="java")
         _, tasks = parse_roadmap(data)
         issues = check_preamble(data, tasks)
-        assert any(i.level == "WARNING" and "Unknown" in i.message for i in issues)
+        assert _has(issues, "Unknown", "WARNING")
 
 
 # -- check_git_block -----------------------------------------------------------
@@ -158,8 +194,8 @@ class TestCheckPreamble:
 
 class TestCheckGitBlock:
     def test_no_git_block(self) -> None:
-        data = _roadmap()
-        _, tasks = parse_roadmap(data)
+        data = _roadmap_ro()
+        _, tasks = _parse(data)
         assert not check_git_block(data, tasks)
 
     def test_valid_git_block(self) -> None:
@@ -171,97 +207,72 @@ class TestCheckGitBlock:
         data = _roadmap(git="yes")
         _, tasks = parse_roadmap(data)
         issues = check_git_block(data, tasks)
-        assert any(i.level == "ERROR" and "object" in i.message for i in issues)
+        assert _has(issues, "object", "ERROR")
 
     def test_enabled_not_bool(self) -> None:
         data = _roadmap(git={"enabled": "true"})
         _, tasks = parse_roadmap(data)
         issues = check_git_block(data, tasks)
-        assert any(i.level == "ERROR" and "boolean" in i.message for i in issues)
+        assert _has(issues, "boolean", "ERROR")
 
     def test_unknown_field_warns(self) -> None:
         data = _roadmap(git={"enabled": True, "auto_push": True})
         _, tasks = parse_roadmap(data)
         issues = check_git_block(data, tasks)
-        assert any(i.level == "WARNING" and "auto_push" in i.message for i in issues)
+        assert _has(issues, "auto_push", "WARNING")
 
 
 # -- check_numbering -----------------------------------------------------------
 
 
-class TestCheckNumbering:
-    def test_sequential(self) -> None:
-        data = _roadmap(
-            tasks=[
-                {
-                    "id": 1,
-                    "title": "A",
-                    "depends_on": [],
-                    "outputs": ["x"],
-                    "acceptance": "ok",
-                },
-                {
-                    "id": 2,
-                    "title": "B",
-                    "depends_on": [1],
-                    "outputs": ["y"],
-                    "acceptance": "ok",
-                },
-            ]
-        )
-        _, tasks = parse_roadmap(data)
-        issues = check_numbering(data, tasks)
-        assert not issues
+def _numbering_tasks(*ids: int) -> list[dict]:
+    """Minimal task dicts with the given ids (only the first is a root)."""
+    return [
+        {
+            "id": n,
+            "title": chr(ord("A") + i),
+            "depends_on": [] if i == 0 else [ids[0]],
+            "outputs": [f"out{i}"],
+            "acceptance": "ok",
+        }
+        for i, n in enumerate(ids)
+    ]
 
-    def test_gap_detected(self) -> None:
-        data = _roadmap(
-            tasks=[
-                {
-                    "id": 1,
-                    "title": "A",
-                    "depends_on": [],
-                    "outputs": ["x"],
-                    "acceptance": "ok",
-                },
-                {
-                    "id": 3,
-                    "title": "C",
-                    "depends_on": [1],
-                    "outputs": ["z"],
-                    "acceptance": "ok",
-                },
-            ]
-        )
-        _, tasks = parse_roadmap(data)
-        issues = check_numbering(data, tasks)
-        assert any(i.level == "ERROR" and "002" in i.message for i in issues)
 
-    def test_duplicate_detected(self) -> None:
-        data = _roadmap(
-            tasks=[
-                {
-                    "id": 1,
-                    "title": "A",
-                    "depends_on": [],
-                    "outputs": ["x"],
-                    "acceptance": "ok",
-                },
-                {
-                    "id": 1,
-                    "title": "B",
-                    "depends_on": [],
-                    "outputs": ["y"],
-                    "acceptance": "ok",
-                },
-            ]
-        )
-        _, tasks = parse_roadmap(data)
-        issues = check_numbering(data, tasks)
-        assert any(i.level == "ERROR" and "Duplicate" in i.message for i in issues)
+def _numbering_case(tasks: list[dict] | None) -> tuple[dict, list]:
+    if tasks is None:
+        return {}, []
+    data = _roadmap(tasks=tasks)
+    return data, parse_roadmap(data)[1]
 
-    def test_no_tasks(self) -> None:
-        issues = check_numbering({}, [])
-        assert any(i.level == "ERROR" and "No tasks" in i.message for i in issues)
+
+# case -> (data, parsed tasks, expected ERROR substring or None for no issues).
+# Parsed once at import; the checks only read them.
+_NUMBERING_CASES: dict[str, tuple[dict, list, str | None]] = {
+    "sequential": (*_numbering_case(_numbering_tasks(1, 2)), None),
+    "gap": (*_numbering_case(_numbering_tasks(1, 3)), "002"),
+    "duplicate": (*_numbering_case(_numbering_tasks(1, 1)), "Duplicate"),
+    "none": (*_numbering_case(None), "No tasks"),
+}
+
+
+@pytest.fixture
+def roadmap_case(request: pytest.FixtureRequest) -> tuple[dict, list, str | None]:
+    """Resolve an indirect case name to its prebuilt ``(data, tasks, expected)``."""
+    return _NUMBERING_CASES[request.param]
+
+
+class TestCheckNumbering:
+    @pytest.mark.parametrize(
+        "roadmap_case", ["sequential", "gap", "duplicate", "none"], indirect=True
+    )
+    def test_cases(self, roadmap_case: tuple[dict, list, str | None]) -> None:
+        data, tasks, expected = roadmap_case
+        issues = check_numbering(data, tasks)
+        if expected is None:
+            assert not issues
+        else:
+            assert _has(issues, expected, "ERROR")
 
 
 # -- check_fields --------------------------------------------------------------
@@ -269,8 +280,8 @@ class TestCheckNumbering:
 
 class TestCheckFields:
     def test_all_required_present(self) -> None:
-        data = _roadmap()
-        _, tasks = parse_roadmap(data)
+        data = _roadmap_ro()
+        _, tasks = _parse(data)
         issues = check_fields(data, tasks)
         assert not issues
 
@@ -280,7 +291,7 @@ class TestCheckFields:
         )
         _, tasks = parse_roadmap(data)
         issues = check_fields(data, tasks)
-        assert any("outputs" in i.message for i in issues)
+        assert _has(issues, "outputs")
 
     def test_missing_acceptance(self) -> None:
         data = _roadmap(
@@ -288,7 +299,7 @@ class TestCheckFields:
         )
         _, tasks = parse_roadmap(data)
         issues = check_fields(data, tasks)
-        assert any("acceptance" in i.message for i in issues)
+        assert _has(issues, "acceptance")
 
     def test_missing_depends_on(self) -> None:
         data = _roadmap(
@@ -296,7 +307,7 @@ class TestCheckFields:
         )
         _, tasks = parse_roadmap(data)
         issues = check_fields(data, tasks)
-        assert any("depends_on" in i.message for i in issues)
+        assert _has(issues, "depends_on")
 
     def test_invalid_agent_warns(self) -> None:
         data = _roadmap(
@@ -313,7 +324,7 @@ class TestCheckFields:
         )
         _, tasks = parse_roadmap(data)
         issues = check_fields(data, tasks)
-        assert any(i.level == "WARNING" and "agent" in i.message for i in issues)
+        assert _has(issues, "agent", "WARNING")
 
     def test_milestone_skips_outputs_acceptance(self) -> None:
         data = _roadmap(
@@ -329,7 +340,7 @@ class TestCheckFields:
         )
         _, tasks = parse_roadmap(data)
         issues = check_fields(data, tasks)
-        assert not any(i.level == "ERROR" for i in issues)
+        assert not _has(issues, level="ERROR")
 
 
 # -- check_titles --------------------------------------------------------------
@@ -365,7 +376,7 @@ class TestCheckTitles:
         )
         _, tasks = parse_roadmap(data)
         issues = check_titles(data, tasks)
-        assert any(i.level == "ERROR" and "words" in i.message for i in issues)
+        assert _has(issues, "words", "ERROR")
 
 
 # -- check_depends_on ---------------------------------------------------------
@@ -408,7 +419,7 @@ class TestCheckDependsOn:
         )
         _, tasks = parse_roadmap(data)
         issues = check_depends_on(data, tasks)
-        assert any("non-existent" in i.message for i in issues)
+        assert _has(issues, "non-existent")
 
     def test_forward_reference(self) -> None:
         data = _roadmap(
@@ -431,7 +442,7 @@ class TestCheckDependsOn:
         )
         _, tasks = parse_roadmap(data)
         issues = check_depends_on(data, tasks)
-        assert any("forward reference" in i.message for i in issues)
+        assert _has(issues, "forward reference")
 
     def test_self_reference(self) -> None:
         data = _roadmap(
@@ -447,7 +458,32 @@ class TestCheckDependsOn:
         )
         _, tasks = parse_roadmap(data)
         issues = check_depends_on(data, tasks)
-        assert any("depends on itself" in i.message for i in issues)
+        assert _has(issues, "depends on itself")
+
+    def test_uses_supplied_context(self) -> None:
+        data = _roadmap(
+            tasks=[
+                {
+                    "id": 1,
+                    "title": "A",
+                    "depends_on": [],
+                    "outputs": ["x"],
+                    "acceptance": "ok",
+                },
+                {
+                    "id": 2,
+                    "title": "B",
+                    "depends_on": [1],
+                    "outputs": ["y"],
+                    "acceptance": "ok",
+                },
+            ]
+        )
+        _, tasks = parse_roadmap(data)
+        assert not check_depends_on(data, tasks, CheckContext.from_tasks(tasks))
+        # The supplied lookup is trusted as-is rather than rebuilt from *tasks*.
+        ctx = CheckContext(numbers=frozenset({2}), by_deps={})
+        assert _has(check_depends_on(data, tasks, ctx), "non-existent")
 
 
 # -- check_architecture -------------------------------------------------------
@@ -497,7 +533,29 @@ class TestCheckArchitecture:
         )
         _, tasks = parse_roadmap(data)
         issues = check_architecture(data, tasks)
-        assert any("Architecture violation" in i.message for i in issues)
+        assert _has(issues, "Architecture violation")
+
+    def test_lookalike_prefix_is_not_a_namespace(self) -> None:
+        data = _roadmap(
+            tasks=[
+                {
+                    "id": 1,
+                    "title": "A",
+                    "depends_on": [],
+                    "outputs": ["src/renderer/view.ts", "lib/src/render/x.ts"],
+                    "acceptance": "ok",
+                },
+                {
+                    "id": 2,
+                    "title": "B",
+                    "depends_on": [1],
+                    "outputs": ["src/core/model.ts"],
+                    "acceptance": "ok",
+                },
+            ]
+        )
+        _, tasks = parse_roadmap(data)
+        assert not check_architecture(data, tasks)
 
 
 # -- check_checkpoint_refs ----------------------------------------------------
@@ -535,7 +593,7 @@ class TestCheckCheckpointRefs:
         )
         _, tasks = parse_roadmap(data)
         issues = check_checkpoint_refs(data, tasks)
-        assert any("999" in i.message for i in issues)
+        assert _has(issues, "999")
 
 
 # -- check_single_root_task ----------------------------------------------------
@@ -543,8 +601,8 @@ class TestCheckCheckpointRefs:
 
 class TestCheckSingleRootTask:
     def test_single_root_ok(self) -> None:
-        data = _roadmap()
-        _, tasks = parse_roadmap(data)
+        data = _roadmap_ro()
+        _, tasks = _parse(data)
         issues = check_single_root_task(data, tasks)
         assert len(issues) == 0
 
@@ -642,8 +700,8 @@ class TestCheckDisjointParallelOutputs:
         assert len(issues) == 0
 
     def test_single_task_in_group_ok(self) -> None:
-        data = _roadmap()
-        _, tasks = parse_roadmap(data)
+        data = _roadmap_ro()
+        _, tasks = _parse(data)
         issues = check_disjoint_parallel_outputs(data, tasks)
         assert len(issues) == 0
 
@@ -652,15 +710,17 @@ class TestCheckDisjointParallelOutputs:
 
 
 class TestRunChecks:
-    def test_clean_roadmap_returns_zero(self, tmp_path: Path) -> None:
-        f = _write(tmp_path, _roadmap())
-        assert run_checks(f) == 0
+    def test_clean_roadmap_returns_zero(self) -> None:
+        assert run_checks_dict(_roadmap_ro()) == 0
 
-    def test_errors_return_one(self, tmp_path: Path) -> None:
+    def test_errors_return_one(self) -> None:
         data = _roadmap()
         data["tasks"] = []  # no tasks is an ERROR
-        f = _write(tmp_path, data)
-        assert run_checks(f) == 1
+        assert run_checks_dict(data) == 1
+
+    def test_reads_roadmap_file(self, tmp_path: Path) -> None:
+        f = _write(tmp_path, _roadmap_ro())
+        assert run_checks(f) == 0
 
     def test_invalid_json(self, tmp_path: Path) -> None:
         f = tmp_path / "ROADMAP.json"
@@ -42,48 +42,58 @@ class TestSlugify:
 class TestRenderPrompt:
     """Verify prompt template loading and placeholder substitution."""
 
-    def test_substitutes_placeholders(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-        prompts = tmp_path / "prompts"
-        prompts.mkdir()
-        (prompts / "test_tmpl.md").write_text("Task: {{TASK}}\nBody: {{BODY}}", encoding="utf-8")
-
-        # Patch PROMPTS_DIR to use our temp dir
+    def test_substitutes_placeholders(self, shared_prompts: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Patch PROMPTS_DIR to use the shared template dir
         import runner.config as cfg
-        monkeypatch.setattr(cfg, "PROMPTS_DIR", prompts)
+        monkeypatch.setattr(cfg, "PROMPTS_DIR", shared_prompts)
 
         result = cfg.render_prompt("test_tmpl", TASK="## 001 - Foo", BODY="hello")
         assert "Task: ## 001 - Foo" in result
         assert "Body: hello" in result
 
-    def test_missing_template_raises(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-        prompts = tmp_path / "prompts"
-        prompts.mkdir()
+    def test_missing_template_raises(self, shared_prompts: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         import runner.config as cfg
-        monkeypatch.setattr(cfg, "PROMPTS_DIR", prompts)
+        monkeypatch.setattr(cfg, "PROMPTS_DIR", shared_prompts)
 
         with pytest.raises(FileNotFoundError, match="Prompt template not found"):
             cfg.render_prompt("nonexistent")
 
-    def test_unknown_placeholders_left_intact(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-        prompts = tmp_path / "prompts"
-        prompts.mkdir()
-        (prompts / "partial.md").write_text("A: {{A}} B: {{B}}", encoding="utf-8")
+    def test_unknown_placeholders_left_intact(self, shared_prompts: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         import runner.config as cfg
-        monkeypatch.setattr(cfg, "PROMPTS_DIR", prompts)
+        monkeypatch.setattr(cfg, "PROMPTS_DIR", shared_prompts)
 
         result = cfg.render_prompt("partial", A="filled")
         assert "A: filled" in result
         assert "{{B}}" in result
 
-    def test_extra_kwargs_ignored(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_extra_kwargs_ignored(self, shared_prompts: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        import runner.config as cfg
+        monkeypatch.setattr(cfg, "PROMPTS_DIR", shared_prompts)
+
+        result = cfg.render_prompt("simple", NAME="World", EXTRA="ignored")
+        assert result == "Hello World"
+
+    def test_values_are_not_rescanned(self, shared_prompts: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        import runner.config as cfg
+        monkeypatch.setattr(cfg, "PROMPTS_DIR", shared_prompts)
+
+        result = cfg.render_prompt("nested", A="literal {{B}}", B="b")
+        assert result == "literal {{B}} / b"
+
+    def test_edited_template_is_reloaded(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        import os
         prompts = tmp_path / "prompts"
         prompts.mkdir()
-        (prompts / "simple.md").write_text("Hello {{NAME}}", encoding="utf-8")
+        tmpl = prompts / "greet.md"
+        tmpl.write_text("Hello {{NAME}}", encoding="utf-8")
         import runner.config as cfg
         monkeypatch.setattr(cfg, "PROMPTS_DIR", prompts)
 
-        result = cfg.render_prompt("simple", NAME="World", EXTRA="ignored")
-        assert result == "Hello World"
+        assert cfg.render_prompt("greet", NAME="A") == "Hello A"
+        assert cfg.render_prompt("greet", NAME="B") == "Hello B"
+        tmpl.write_text("Bye {{NAME}}", encoding="utf-8")
+        os.utime(tmpl, ns=(1, 1))
+        assert cfg.render_prompt("greet", NAME="A") == "Bye A"
 
 
 # ── Verbosity mode ───────────────────────────────────────────────────────────────
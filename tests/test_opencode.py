@@ -1,9 +1,8 @@
 """Tests for runner.opencode — JSONC parsing, model check helpers, milestone agent."""
 
 import json
-import textwrap
+from collections.abc import Callable
 from pathlib import Path
-from unittest.mock import patch, MagicMock
 
 import pytest
 
@@ -12,6 +11,8 @@ from runner.opencode import _strip_jsonc_comments
 
 # ── _strip_jsonc_comments ──────────────────────────────────────────────────────
 
+_MULTI_COMMENT_INPUT = '{\n  // first comment\n  "a": 1,\n  // second comment\n  "b": 2\n}\n'
+
 
 class TestStripJsoncComments:
     def test_removes_line_comments(self) -> None:
@@ -39,15 +40,7 @@ class TestStripJsoncComments:
         assert parsed == {"key": 1}
 
     def test_multiple_comments(self) -> None:
-        text = textwrap.dedent("""\
-            {
-              // first comment
-              "a": 1,
-              // second comment
-              "b": 2
-            }
-        """)
-        result = _strip_jsonc_comments(text)
+        result = _strip_jsonc_comments(_MULTI_COMMENT_INPUT)
         parsed = json.loads(result)
         assert parsed == {"a": 1, "b": 2}
 
@@ -55,6 +48,10 @@ class TestStripJsoncComments:
         text = '{"key": "value"}'
         assert _strip_jsonc_comments(text) == text
 
+    def test_comment_after_string_with_slashes(self) -> None:
+        text = '{"url": "http://x"} // trailing\n'
+        assert json.loads(_strip_jsonc_comments(text)) == {"url": "http://x"}
+
     def test_empty_string(self) -> None:
         assert _strip_jsonc_comments("") == ""
 
@@ -65,70 +62,161 @@ class TestStripJsoncComments:
         parsed = json.loads(result)
         assert parsed["model"] == "anthropic/claude-sonnet-4-20250514"
 
+    def test_escaped_backslash_before_closing_quote(self) -> None:
+        """An even run of backslashes does not escape the closing quote."""
+        text = '{"path": "C:\\\\", // trailing\n"url": "a//b"}'
+        result = _strip_jsonc_comments(text)
+        assert json.loads(result) == {"path": "C:\\", "url": "a//b"}
+
+    def test_comment_on_last_line_without_newline(self) -> None:
+        assert _strip_jsonc_comments('{"a": 1} // end') == '{"a": 1} '
+
+
+# ── _load_opencode_config ──────────────────────────────────────────────────────
+
+
+class TestLoadOpencodeConfig:
+    def test_reparsed_only_after_change(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import runner.opencode as oc
+
+        monkeypatch.chdir(tmp_path)
+        cfg = tmp_path / "opencode.jsonc"
+        cfg.write_text('{"model": "a/b"} // default\n', encoding="utf-8")
+        assert oc._load_opencode_config() == {"model": "a/b"}
+        assert oc._load_opencode_config() == {"model": "a/b"}
+        assert oc._parse_opencode_config.cache_info().misses == 1
+
+        cfg.write_text('{"model": "github-copilot/x"}\n', encoding="utf-8")
+        assert oc._is_copilot_only() is True
+        assert oc._parse_opencode_config.cache_info().misses == 2
+
+    def test_missing_file_raises(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        import runner.opencode as oc
+
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(FileNotFoundError):
+            oc._load_opencode_config()
+
 
 # ── run_opencode_milestone ─────────────────────────────────────────────────────
 
 
+def _milestone_roadmap(name: str) -> dict:
+    return {
+        "name": name,
+        "ecosystem": "python",
+        "preamble": "",
+        "tasks": [
+            {
+                "id": 1,
+                "title": "Release",
+                "agent": "milestone",
+                "version": "0.1.0",
+                "depends_on": [],
+            }
+        ],
+    }
+
+
 class TestRunOpencodeMilestone:
     """Verify run_opencode_milestone builds the prompt and invokes the agent."""
 
-    def test_builds_prompt_and_invokes(self, tmp_path: Path) -> None:
+    def _spy_invoke(self, monkeypatch: pytest.MonkeyPatch, rc: int) -> "list[tuple]":
+        """Replace _invoke_opencode with a recorder; return its ``(args, kwargs)`` list."""
+        import runner.opencode as oc
+        calls: list[tuple] = []
+
+        def fake_invoke(*args, **kwargs) -> int:
+            calls.append((args, kwargs))
+            return rc
+
+        monkeypatch.setattr(oc, "_invoke_opencode", fake_invoke)
+        return calls
+
+    def test_builds_prompt_and_invokes(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         from runner.opencode import run_opencode_milestone
 
-        # Minimal project structure
-        import json as _json
-        roadmap = {
-            "name": "Demo v0.1",
-            "ecosystem": "python",
-            "preamble": "",
-            "tasks": [
-                {"id": 1, "title": "Release", "agent": "milestone", "version": "0.1.0", "depends_on": []}
-            ],
-        }
-        (tmp_path / "ROADMAP.json").write_text(_json.dumps(roadmap), encoding="utf-8")
-        (tmp_path / "src").mkdir()
-        (tmp_path / "src" / "main.py").write_text("print('hi')", encoding="utf-8")
-
-        with patch("runner.opencode._invoke_opencode", return_value=500) as mock_invoke:
-            result = run_opencode_milestone("## 001 - Release", "0.1.0", tmp_path)
+        project = make_project(
+            _milestone_roadmap("Demo v0.1"), {"src/main.py": b"print('hi')"}
+        )
+
+        calls = self._spy_invoke(monkeypatch, rc=500)
+        result = run_opencode_milestone("## 001 - Release", "0.1.0", project)
 
         assert result == 500
-        mock_invoke.assert_called_once()
-        call_kwargs = mock_invoke.call_args
-        assert call_kwargs.kwargs["agent"] == "milestone"
-        assert call_kwargs.kwargs["phase"] == "milestone"
+        assert len(calls) == 1
+        args, kwargs = calls[0]
+        assert kwargs["agent"] == "milestone"
+        assert kwargs["phase"] == "milestone"
         # Prompt should contain version and project name
-        prompt_arg = call_kwargs.args[0] if call_kwargs.args else call_kwargs.kwargs.get("prompt", "")
+        prompt_arg = args[0] if args else kwargs.get("prompt", "")
         assert "0.1.0" in prompt_arg
-        assert tmp_path.name in prompt_arg
+        assert project.name in prompt_arg
 
-    def test_skips_git_and_pycache(self, tmp_path: Path) -> None:
+    def test_skips_git_and_pycache(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         from runner.opencode import run_opencode_milestone
 
-        import json as _json
-        roadmap = {
-            "name": "Demo",
-            "ecosystem": "python",
-            "preamble": "",
-            "tasks": [
-                {"id": 1, "title": "Release", "agent": "milestone", "version": "0.1.0", "depends_on": []}
-            ],
-        }
-        (tmp_path / "ROADMAP.json").write_text(_json.dumps(roadmap), encoding="utf-8")
-        (tmp_path / ".git").mkdir()
-        (tmp_path / ".git" / "config").write_text("x", encoding="utf-8")
-        (tmp_path / "__pycache__").mkdir()
-        (tmp_path / "__pycache__" / "mod.pyc").write_text("x", encoding="utf-8")
-        (tmp_path / "real.py").write_text("x", encoding="utf-8")
-
-        with patch("runner.opencode._invoke_opencode", return_value=0) as mock_invoke:
-            run_opencode_milestone("## 001 - Release", "0.1.0", tmp_path)
-
-        prompt = mock_invoke.call_args.args[0]
+        files = {".git/config": b"x", "__pycache__/mod.pyc": b"x", "real.py": b"x"}
+        project = make_project(_milestone_roadmap("Demo"), files)
+
+        calls = self._spy_invoke(monkeypatch, rc=0)
+        run_opencode_milestone("## 001 - Release", "0.1.0", project)
+
+        prompt = calls[0][0][0]
         assert ".git" not in prompt
         assert "__pycache__" not in prompt
         assert "real.py" in prompt
 
+    def test_listing_is_sorted_and_pruned(self, tmp_path: Path) -> None:
+        from runner.opencode import _list_project_files
+
+        for rel in ("b.py", "a-c.py", "a/z.py", "a/node_modules/dep.js", "a/b/c.py"):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("x", encoding="utf-8")
+
+        assert _list_project_files(tmp_path) == ["a/b/c.py", "a/z.py", "a-c.py", "b.py"]
+
+    def test_unreadable_directory_is_skipped(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import runner.opencode as oc
+
+        for rel in ("ok.py", "locked/secret.py"):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("x", encoding="utf-8")
+        real_scandir = oc.os.scandir
+
+        def scandir(path: str) -> object:
+            if str(path).endswith("locked"):
+                raise PermissionError(13, "Permission denied", str(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr(oc.os, "scandir", scandir)
+        assert oc._list_project_files(tmp_path) == ["ok.py"]
+
+
+# ── _strip_ansi ─────────────────────────────────────────────────────────────────
+
+
+class TestStripAnsi:
+    def test_plain_text_returned_unchanged(self) -> None:
+        from runner.opencode import _strip_ansi
+
+        line = "plain agent output\n"
+        assert _strip_ansi(line) is line
+
+    def test_removes_csi_and_osc_sequences(self) -> None:
+        from runner.opencode import _strip_ansi
+
+        line = "\x1b[1;32mok\x1b[0m \x1b]0;title\x07done\n"
+        assert _strip_ansi(line) == "ok done\n"
+
 
 # ── _run_with_log ───────────────────────────────────────────────────────────────
 
@@ -188,6 +276,36 @@ class TestRunWithLog:
 
         assert rc == 42
 
+    def test_argv_list_runs_without_shell(self, tmp_path: Path) -> None:
+        from runner.opencode import _run_with_log
+        import sys
+
+        log = tmp_path / "argv.log"
+        code = "import sys; print(sys.argv[1])"
+        argv = [sys.executable, "-c", code, "two words; $HOME"]
+        rc = _run_with_log(argv, log, echo=False)
+
+        assert rc == 0
+        assert log.read_text(encoding="utf-8") == "two words; $HOME\n"
+
+    def test_split_writes_decoded_like_text_mode(self, tmp_path: Path) -> None:
+        from runner.opencode import _run_with_log
+        import sys
+
+        script = tmp_path / "emit.py"
+        script.write_text(
+            "import sys, time\n"
+            "out = sys.stdout.buffer\n"
+            "parts = (b'caf\\xc3', b'\\xa9\\r\\n\\x1b[31mred', b'\\x1b[0m\\ntail')\n"
+            "for part in parts:\n"
+            "    out.write(part); out.flush(); time.sleep(0.01)\n",
+            encoding="utf-8",
+        )
+        log = tmp_path / "out.log"
+        _run_with_log(f'"{sys.executable}" "{script}"', log, echo=False)
+
+        assert log.read_bytes() == "café\nred\ntail".encode()
+
 
 # ── _tail_log ──────────────────────────────────────────────────────────────────────
 
@@ -221,6 +339,15 @@ class TestTailLog:
 
         _tail_log(tmp_path / "nonexistent.log")  # must not raise
 
+    def test_reads_only_the_tail_of_a_large_log(self, tmp_path: Path) -> None:
+        from runner.opencode import _read_tail_lines
+
+        log = tmp_path / "big.log"
+        lines = [f"line {i} " + "x" * 200 for i in range(2000)]
+        log.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        assert _read_tail_lines(log, 40) == lines[-40:]
+        assert _read_tail_lines(log, 5000) == lines
+
 
 # ── _invoke_opencode: echo mode and log filename format ──────────────────────────
 
@@ -228,16 +355,13 @@ class TestTailLog:
 class TestInvokeOpencodeLogBehavior:
     """Verify echo mode selection and log-file naming in _invoke_opencode."""
 
-    def _make_project(self, tmp_path: Path) -> Path:
-        import json as _j
-        project = tmp_path / "proj"
-        project.mkdir()
-        roadmap = {
+    @pytest.fixture
+    def project(self, make_project: Callable[..., Path]) -> Path:
+        """A one-task python project for the invocation under test."""
+        return make_project({
             "name": "P", "ecosystem": "python", "preamble": "",
             "tasks": [{"id": 1, "title": "T", "depends_on": []}],
-        }
-        (project / "ROADMAP.json").write_text(_j.dumps(roadmap), encoding="utf-8")
-        return project
+        })
 
     def _patch_invoke(self, monkeypatch: pytest.MonkeyPatch, rc: int = 0) -> "list[dict]":
         """Patch _run_with_log, get_token_stats, record_project_spend; return call-info list."""
@@ -247,7 +371,7 @@ class TestInvokeOpencodeLogBehavior:
         def fake_run(cmd: str, log_path: Path, *, echo: bool) -> int:
             log_path.parent.mkdir(parents=True, exist_ok=True)
             log_path.write_text("fake\nlog\noutput", encoding="utf-8")
-            calls.append({"log_path": log_path, "echo": echo})
+            calls.append({"cmd": cmd, "log_path": log_path, "echo": echo})
             return rc
 
         monkeypatch.setattr(oc, "_run_with_log", fake_run)
@@ -255,62 +379,84 @@ class TestInvokeOpencodeLogBehavior:
         monkeypatch.setattr(oc, "record_project_spend", lambda *a, **kw: 0)
         return calls
 
-    def test_compact_mode_echo_false(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_compact_mode_echo_false(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         import runner.config as cfg
         import runner.opencode as oc
         monkeypatch.setattr(cfg, "_verbose", False)
         calls = self._patch_invoke(monkeypatch)
-        project = self._make_project(tmp_path)
 
         oc._invoke_opencode("prompt", agent="build", project_dir=project,
                             continue_session=False, task="## 001 - Test", phase="build")
         assert calls[0]["echo"] is False
 
-    def test_verbose_mode_echo_true(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_passes_argv_list(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import runner.config as cfg
+        import runner.opencode as oc
+        monkeypatch.setattr(cfg, "_verbose", False)
+        calls = self._patch_invoke(monkeypatch)
+
+        oc._invoke_opencode("prompt", agent="fix", project_dir=project,
+                            continue_session=True, task="## 001 - Test", phase="fix")
+        cmd = calls[0]["cmd"]
+        assert isinstance(cmd, list)
+        assert cmd[1:3] == ["run", "Execute the task in the attached file."]
+        assert cmd[cmd.index("--agent") + 1] == "fix"
+        assert cmd[cmd.index("--dir") + 1] == project.resolve().as_posix()
+        assert "--continue" in cmd
+
+    def test_verbose_mode_echo_true(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         import runner.config as cfg
         import runner.opencode as oc
         monkeypatch.setattr(cfg, "_verbose", True)
         calls = self._patch_invoke(monkeypatch)
-        project = self._make_project(tmp_path)
 
         oc._invoke_opencode("prompt", agent="build", project_dir=project,
                             continue_session=False, task="## 001 - Test", phase="build")
         assert calls[0]["echo"] is True
 
-    def test_capture_overrides_verbose(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_capture_overrides_verbose(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """capture=True must force echo=False even when verbose mode is on."""
         import runner.config as cfg
         import runner.opencode as oc
         monkeypatch.setattr(cfg, "_verbose", True)
         calls = self._patch_invoke(monkeypatch)
-        project = self._make_project(tmp_path)
 
         oc._invoke_opencode("prompt", agent="build", project_dir=project,
                             continue_session=False, task="## 001 - Test", phase="build",
                             capture=True)
         assert calls[0]["echo"] is False
 
-    def test_log_filename_timestamp_first(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_log_filename_timestamp_first(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Log filename must start with a YYYYMMDD_HHMMSS timestamp."""
         import re as _re
         import runner.config as cfg
         import runner.opencode as oc
         monkeypatch.setattr(cfg, "_verbose", False)
         calls = self._patch_invoke(monkeypatch)
-        project = self._make_project(tmp_path)
 
         oc._invoke_opencode("prompt", agent="build", project_dir=project,
                             continue_session=False, task="## 001 - Test", phase="build")
         log_name = calls[0]["log_path"].name
         assert _re.match(r"^\d{8}_\d{6}_", log_name), f"unexpected log name: {log_name}"
 
-    def test_compact_failure_calls_tail_log(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_compact_failure_calls_tail_log(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """_tail_log must be called when rc != 0 in compact mode."""
         import runner.config as cfg
         import runner.opencode as oc
         monkeypatch.setattr(cfg, "_verbose", False)
         self._patch_invoke(monkeypatch, rc=1)
-        project = self._make_project(tmp_path)
 
         tailed: list[Path] = []
         monkeypatch.setattr(oc, "_tail_log", lambda p: tailed.append(p))
@@ -319,13 +465,14 @@ class TestInvokeOpencodeLogBehavior:
                             continue_session=False, task="## 001 - Test", phase="build")
         assert len(tailed) == 1
 
-    def test_verbose_failure_no_tail(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_verbose_failure_no_tail(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """_tail_log must NOT be called in verbose mode (output already streamed)."""
         import runner.config as cfg
         import runner.opencode as oc
         monkeypatch.setattr(cfg, "_verbose", True)
         self._patch_invoke(monkeypatch, rc=1)
-        project = self._make_project(tmp_path)
 
         tailed: list[Path] = []
         monkeypatch.setattr(oc, "_tail_log", lambda p: tailed.append(p))
@@ -1,33 +1,60 @@
 """Tests for runner.roadmap -- ROADMAP.json parsing, graph resolution."""
 
-import json
+import copy
+import os
+import re
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
 
+import runner.roadmap as roadmap_mod
+import runner.workspace as workspace_mod
+from runner.roadmap import (
+    _task_number,
+    get_deploy_config,
+    get_ready_tasks,
+    get_task_agent,
+    get_task_body,
+    get_task_context_files,
+    get_task_ecosystem,
+    get_task_outputs,
+    get_task_version,
+    get_tasks,
+    is_deploy_task,
+    is_git_managed,
+    is_milestone_task,
+    parse_task_graph,
+    print_dependency_graph,
+)
+from runner.state import mark_done
+
 # -- helpers -------------------------------------------------------------------
 
+# SGR colour/style sequences emitted by Rich when printing to the captured stdout.
+_SGR_RE = re.compile(r"\x1b\[[0-9;]*m")
+
 
-def _write_roadmap(project: Path, data: dict) -> None:
-    (project / "ROADMAP.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+_BASE_ROADMAP = {
+    "name": "P",
+    "ecosystem": "python",
+    "preamble": "",
+    "tasks": [
+        {
+            "id": 1,
+            "title": "Only Task",
+            "depends_on": [],
+            "outputs": ["x.py"],
+            "acceptance": "ok",
+            "description": "Do something.",
+        }
+    ],
+}
 
 
 def _minimal_roadmap(**overrides) -> dict:
-    base = {
-        "name": "P",
-        "ecosystem": "python",
-        "preamble": "",
-        "tasks": [
-            {
-                "id": 1,
-                "title": "Only Task",
-                "depends_on": [],
-                "outputs": ["x.py"],
-                "acceptance": "ok",
-                "description": "Do something.",
-            }
-        ],
-    }
+    # Deep copy: several tests mutate ``tasks[0]`` in place.
+    base = copy.deepcopy(_BASE_ROADMAP)
     base.update(overrides)
     return base
 
@@ -37,52 +64,112 @@ def _minimal_roadmap(**overrides) -> dict:
 
 class TestGetTasks:
     def test_extracts_all_task_headings(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_tasks
-
         tasks = get_tasks(tmp_project)
         assert len(tasks) == 4
         assert tasks[0] == "## 001 - First Task"
         assert tasks[3] == "## 004 - Integration Task"
 
-    def test_single_task(self, tmp_path: Path) -> None:
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
-        from runner.roadmap import get_tasks
+    def test_single_task(self, make_project: Callable[..., Path]) -> None:
+        project = make_project(_minimal_roadmap())
 
         tasks = get_tasks(project)
         assert len(tasks) == 1
         assert tasks[0] == "## 001 - Only Task"
 
-    def test_empty_roadmap(self, tmp_path: Path) -> None:
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, {"name": "Empty", "ecosystem": "python", "tasks": []})
-        from runner.roadmap import get_tasks
+    def test_empty_roadmap(self, make_project: Callable[..., Path]) -> None:
+        project = make_project({"name": "Empty", "ecosystem": "python", "tasks": []})
 
         assert get_tasks(project) == []
 
+    def test_clear_cache_picks_up_same_stat_rewrite(
+        self,
+        make_project: Callable[..., Path],
+        clear_file_caches: Callable[[], None],
+    ) -> None:
+        project = make_project(_minimal_roadmap())
+        path = project / "ROADMAP.json"
+        assert get_tasks(project) == ["## 001 - Only Task"]
+
+        st = path.stat()
+        data = _minimal_roadmap()
+        data["tasks"][0]["title"] = "Only Tusk"
+        make_project(data)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert get_tasks(project) == ["## 001 - Only Task"]
+
+        clear_file_caches()
+        assert get_tasks(project) == ["## 001 - Only Tusk"]
+
+    def test_clear_cache_covers_state_and_status_caches(
+        self,
+        make_project: Callable[..., Path],
+        clear_file_caches: Callable[[], None],
+    ) -> None:
+        from runner import state as state_mod
+        from runner.workspace import _project_status
+
+        project = make_project(_minimal_roadmap())
+        state_mod._write_state(project, {"completed": ["## 001 - Only Task"]})
+        _project_status(project)
+        clear_file_caches()
+        assert state_mod._snapshot_for_key.cache_info().currsize == 0
+        assert workspace_mod._cached_tasks.cache_info().currsize == 0
+
+    def test_missing_roadmap_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            get_tasks(tmp_path)
+
+
+# -- ROADMAP memoisation -------------------------------------------------------
+
+
+class TestRoadmapMemoisation:
+    @pytest.mark.parametrize(
+        "cache",
+        [
+            workspace_mod._parse_roadmap_file,
+            roadmap_mod._task_entries,
+            roadmap_mod._task_index,
+            roadmap_mod._task_graph,
+        ],
+        ids=["parse", "entries", "index", "graph"],
+    )
+    def test_rebuilt_only_after_roadmap_changes(
+        self, make_project: Callable[..., Path], cache: Callable[..., object]
+    ) -> None:
+        data = _minimal_roadmap()
+        project = make_project(data)
+        for _ in range(2):
+            assert get_tasks(project) == ["## 001 - Only Task"]
+            assert "Do something." in get_task_body("## 001 - Only Task", project)
+            assert is_git_managed(project) is False
+            assert parse_task_graph(project) == {"## 001 - Only Task": []}
+        assert cache.cache_info().misses == 1
+
+        data["tasks"].append(
+            {"id": 2, "title": "Next", "depends_on": [1], "outputs": ["y.py"]}
+        )
+        make_project(data)
+        assert get_tasks(project) == ["## 001 - Only Task", "## 002 - Next"]
+        assert "depends_on: 001" in get_task_body("## 002 - Next", project)
+        assert parse_task_graph(project)["## 002 - Next"] == ["## 001 - Only Task"]
+        assert cache.cache_info().misses == 2
+
 
 # -- get_task_body -------------------------------------------------------------
 
 
 class TestGetTaskBody:
     def test_returns_body_with_metadata(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_task_body
-
         body = get_task_body("## 001 - First Task", tmp_project)
         assert "depends_on: none" in body
         assert "Implement module one" in body
 
     def test_body_does_not_include_other_tasks(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_task_body
-
         body = get_task_body("## 001 - First Task", tmp_project)
         assert "Second Task" not in body
 
     def test_nonexistent_task_returns_empty(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_task_body
-
         body = get_task_body("## 999 - Does Not Exist", tmp_project)
         assert body == ""
 
@@ -92,204 +179,161 @@ class TestGetTaskBody:
 
 class TestGetTaskEcosystem:
     def test_uses_project_ecosystem_by_default(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_task_ecosystem
-
         assert get_task_ecosystem("## 001 - First Task", tmp_project) == "python"
 
-    def test_task_level_override(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_ecosystem
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        data = _minimal_roadmap()
-        data["tasks"][0]["ecosystem"] = "deno"
-        _write_roadmap(project, data)
-        assert get_task_ecosystem("## 001 - Only Task", project) == "deno"
-
-    def test_custom_ecosystem_accepted(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_ecosystem
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        data = _minimal_roadmap()
-        data["tasks"][0]["ecosystem"] = "custom"
-        _write_roadmap(project, data)
-        result = get_task_ecosystem("## 001 - Only Task", project)
-        assert result == "custom"
+    @pytest.mark.parametrize("ecosystem", ["deno", "custom"])
+    def test_task_level_override(
+        self, make_project: Callable[..., Path], ecosystem: str
+    ) -> None:
+        roadmap = _minimal_roadmap()
+        roadmap["tasks"][0]["ecosystem"] = ecosystem
+        project = make_project(roadmap)
+        assert get_task_ecosystem("## 001 - Only Task", project) == ecosystem
 
 
 # -- is_git_managed ------------------------------------------------------------
 
 
 class TestIsGitManaged:
-    def test_enabled_true(self, tmp_path: Path) -> None:
-        from runner.roadmap import is_git_managed
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap(git={"enabled": True}))
-        assert is_git_managed(project) is True
-
-    def test_enabled_false(self, tmp_path: Path) -> None:
-        from runner.roadmap import is_git_managed
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap(git={"enabled": False}))
-        assert is_git_managed(project) is False
-
-    def test_no_git_block(self, tmp_path: Path) -> None:
-        from runner.roadmap import is_git_managed
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
-        assert is_git_managed(project) is False
-
-    def test_git_block_empty(self, tmp_path: Path) -> None:
-        from runner.roadmap import is_git_managed
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap(git={}))
-        assert is_git_managed(project) is False
+    @pytest.mark.parametrize(
+        ("overrides", "expected"),
+        [
+            ({"git": {"enabled": True}}, True),
+            ({"git": {"enabled": False}}, False),
+            ({}, False),
+            ({"git": {}}, False),
+        ],
+        ids=["enabled_true", "enabled_false", "no_git_block", "git_block_empty"],
+    )
+    def test_is_git_managed(
+        self, make_project: Callable[..., Path], overrides: dict, expected: bool
+    ) -> None:
+        project = make_project(_minimal_roadmap(**overrides))
+        assert is_git_managed(project) is expected
 
 
 # -- get_task_context_files ----------------------------------------------------
 
 
 class TestGetTaskContextFiles:
-    def test_loads_existing_files(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_context_files
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        (project / "src").mkdir()
-        (project / "src" / "mod.py").write_text("# module", encoding="utf-8")
+    def test_loads_existing_files(self, make_project: Callable[..., Path]) -> None:
         data = _minimal_roadmap()
         data["tasks"][0]["context"] = ["src/mod.py"]
-        _write_roadmap(project, data)
+        project = make_project(data, {"src/mod.py": b"# module"})
         result = get_task_context_files("## 001 - Only Task", project)
         assert "src/mod.py" in result
         assert result["src/mod.py"] == "# module"
 
-    def test_skips_missing_files(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_context_files
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_skips_missing_files(self, make_project: Callable[..., Path]) -> None:
         data = _minimal_roadmap()
         data["tasks"][0]["context"] = ["missing/file.py"]
-        _write_roadmap(project, data)
+        project = make_project(data)
         result = get_task_context_files("## 001 - Only Task", project)
         assert result == {}
 
-    def test_no_context_field(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_context_files
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
+    def test_no_context_field(self, make_project: Callable[..., Path]) -> None:
+        project = make_project(_minimal_roadmap())
         assert get_task_context_files("## 001 - Only Task", project) == {}
 
-    def test_multiple_files(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_context_files
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        (project / "a.py").write_text("A", encoding="utf-8")
-        (project / "b.py").write_text("B", encoding="utf-8")
+    def test_multiple_files(self, make_project: Callable[..., Path]) -> None:
         data = _minimal_roadmap()
         data["tasks"][0]["context"] = ["a.py", "b.py"]
-        _write_roadmap(project, data)
+        project = make_project(data, {"a.py": b"A", "b.py": b"B"})
         result = get_task_context_files("## 001 - Only Task", project)
         assert len(result) == 2
         assert result["a.py"] == "A"
         assert result["b.py"] == "B"
 
+    def test_many_files_keep_roadmap_order(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        names = [f"f{i:02d}.py" for i in range(20, 0, -1)]
+        data = _minimal_roadmap()
+        data["tasks"][0]["context"] = [*names[:10], "missing.py", *names[10:]]
+        project = make_project(data, {name: name.encode() for name in names})
+        result = get_task_context_files("## 001 - Only Task", project)
+        assert list(result) == names
+        assert all(result[name] == name for name in names)
+
+    def test_skips_entry_under_regular_file(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        data = _minimal_roadmap()
+        data["tasks"][0]["context"] = ["a.py/nested.py", "a.py"]
+        project = make_project(data, {"a.py": b"A"})
+        result = get_task_context_files("## 001 - Only Task", project)
+        assert result == {"a.py": "A"}
+
 
 # -- _task_number --------------------------------------------------------------
 
 
 class TestTaskNumber:
     def test_valid_heading(self) -> None:
-        from runner.roadmap import _task_number
-
         assert _task_number("## 001 - First Task") == 1
         assert _task_number("## 042 - Something") == 42
         assert _task_number("## 120 - Last") == 120
 
     def test_invalid_heading(self) -> None:
-        from runner.roadmap import _task_number
-
         assert _task_number("# Not a task") == -1
         assert _task_number("## No Number") == -1
 
+    def test_requires_exact_prefix(self) -> None:
+        assert _task_number("## 01 - Short") == -1
+        assert _task_number("## 0012 - Long") == -1
+        assert _task_number("## 001 Title") == -1
+        assert _task_number("## 0²1 - Superscript") == -1
+        assert _task_number("") == -1
+
 
 # -- get_task_agent ------------------------------------------------------------
 
 
 class TestGetTaskAgent:
-    def test_default_is_build(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_agent
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
-        assert get_task_agent("## 001 - Only Task", project) == "build"
-
-    def test_explicit_agent(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_agent
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        data = _minimal_roadmap()
-        data["tasks"][0]["agent"] = "milestone"
-        _write_roadmap(project, data)
-        assert get_task_agent("## 001 - Only Task", project) == "milestone"
+    @pytest.mark.parametrize(
+        ("fields", "expected"),
+        [({}, "build"), ({"agent": "milestone"}, "milestone")],
+        ids=["default_is_build", "explicit_agent"],
+    )
+    def test_agent(
+        self, make_project: Callable[..., Path], fields: dict, expected: str
+    ) -> None:
+        roadmap = _minimal_roadmap()
+        roadmap["tasks"][0].update(fields)
+        project = make_project(roadmap)
+        assert get_task_agent("## 001 - Only Task", project) == expected
 
 
 # -- get_task_version ----------------------------------------------------------
 
 
 class TestGetTaskVersion:
-    def test_returns_version(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_version
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        data = _minimal_roadmap()
-        data["tasks"][0]["version"] = "0.2.0"
-        _write_roadmap(project, data)
-        assert get_task_version("## 001 - Only Task", project) == "0.2.0"
-
-    def test_returns_none_when_absent(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_version
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
-        assert get_task_version("## 001 - Only Task", project) is None
+    @pytest.mark.parametrize(
+        ("fields", "expected"),
+        [({"version": "0.2.0"}, "0.2.0"), ({}, None)],
+        ids=["returns_version", "returns_none_when_absent"],
+    )
+    def test_version(
+        self, make_project: Callable[..., Path], fields: dict, expected: str | None
+    ) -> None:
+        roadmap = _minimal_roadmap()
+        roadmap["tasks"][0].update(fields)
+        project = make_project(roadmap)
+        assert get_task_version("## 001 - Only Task", project) == expected
 
 
 # -- is_milestone_task ---------------------------------------------------------
 
 
 class TestIsMilestoneTask:
-    def test_detects_milestone(self, tmp_path: Path) -> None:
-        from runner.roadmap import is_milestone_task
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_detects_milestone(self, make_project: Callable[..., Path]) -> None:
         data = _minimal_roadmap()
         data["tasks"][0]["agent"] = "milestone"
         data["tasks"][0]["version"] = "0.1.0"
-        _write_roadmap(project, data)
+        project = make_project(data)
         assert is_milestone_task("## 001 - Only Task", project) is True
 
     def test_build_is_not_milestone(self, tmp_project: Path) -> None:
-        from runner.roadmap import is_milestone_task
-
         assert is_milestone_task("## 001 - First Task", tmp_project) is False
 
 
@@ -297,29 +341,19 @@ class TestIsMilestoneTask:
 
 
 class TestGetTaskOutputs:
-    def test_parses_list(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_outputs
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
+    def test_parses_list(self, make_project: Callable[..., Path]) -> None:
+        project = make_project(_minimal_roadmap())
         result = get_task_outputs("## 001 - Only Task", project)
         assert result == ["x.py"]
 
     def test_multiple_outputs(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_task_outputs
-
         result = get_task_outputs("## 001 - First Task", tmp_project)
         assert result == ["src/mod.py", "tests/test_mod.py"]
 
-    def test_no_outputs(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_task_outputs
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_no_outputs(self, make_project: Callable[..., Path]) -> None:
         data = _minimal_roadmap()
         del data["tasks"][0]["outputs"]
-        _write_roadmap(project, data)
+        project = make_project(data)
         assert get_task_outputs("## 001 - Only Task", project) == []
 
 
@@ -328,8 +362,6 @@ class TestGetTaskOutputs:
 
 class TestParseTaskGraph:
     def test_builds_correct_graph(self, tmp_project: Path) -> None:
-        from runner.roadmap import parse_task_graph
-
         graph = parse_task_graph(tmp_project)
         assert len(graph) == 4
         assert graph["## 001 - First Task"] == []
@@ -340,11 +372,8 @@ class TestParseTaskGraph:
         assert "## 002 - Second Task" in deps_004
         assert "## 003 - Third Task" in deps_004
 
-    def test_depends_on_none(self, tmp_path: Path) -> None:
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
-        from runner.roadmap import parse_task_graph
+    def test_depends_on_none(self, make_project: Callable[..., Path]) -> None:
+        project = make_project(_minimal_roadmap())
 
         graph = parse_task_graph(project)
         assert graph["## 001 - Only Task"] == []
@@ -355,16 +384,14 @@ class TestParseTaskGraph:
 
 class TestGetReadyTasks:
     def test_initial_state_returns_root_tasks(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_ready_tasks, get_tasks, parse_task_graph
-
         all_tasks = get_tasks(tmp_project)
         graph = parse_task_graph(tmp_project)
-        ready = get_ready_tasks(all_tasks, graph, done=set(), project_dir=tmp_project)
+        ready = get_ready_tasks(
+            all_tasks, graph, done=set(), project_dir=tmp_project
+        )
         assert ready == ["## 001 - First Task"]
 
     def test_after_root_done_parallel_tasks_ready(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_ready_tasks, get_tasks, parse_task_graph
-
         all_tasks = get_tasks(tmp_project)
         graph = parse_task_graph(tmp_project)
         done = {"## 001 - First Task"}
@@ -376,8 +403,6 @@ class TestGetReadyTasks:
     def test_integration_task_not_ready_until_all_deps_done(
         self, tmp_project: Path
     ) -> None:
-        from runner.roadmap import get_ready_tasks, get_tasks, parse_task_graph
-
         all_tasks = get_tasks(tmp_project)
         graph = parse_task_graph(tmp_project)
         done = {"## 001 - First Task", "## 002 - Second Task"}
@@ -386,22 +411,41 @@ class TestGetReadyTasks:
         assert "## 003 - Third Task" in ready
 
     def test_all_done_returns_empty(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_ready_tasks, get_tasks, parse_task_graph
-
         all_tasks = get_tasks(tmp_project)
         graph = parse_task_graph(tmp_project)
         done = set(all_tasks)
         assert get_ready_tasks(all_tasks, graph, done, project_dir=tmp_project) == []
 
     def test_preserves_roadmap_order(self, tmp_project: Path) -> None:
-        from runner.roadmap import get_ready_tasks, get_tasks, parse_task_graph
-
         all_tasks = get_tasks(tmp_project)
         graph = parse_task_graph(tmp_project)
         done = {"## 001 - First Task"}
         ready = get_ready_tasks(all_tasks, graph, done, project_dir=tmp_project)
         assert ready.index("## 002 - Second Task") < ready.index("## 003 - Third Task")
 
+    def test_milestone_gets_own_layer_and_is_checked_once_per_task(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        data = _minimal_roadmap()
+        data["tasks"] += [
+            {"id": 2, "title": "Release", "agent": "milestone", "depends_on": [1]},
+            {"id": 3, "title": "Side", "depends_on": [1]},
+        ]
+        project = make_project(data)
+        checked: list[str] = []
+        real_is_milestone = roadmap_mod.is_milestone_task
+
+        def counting_is_milestone(task: str, project_dir: Path) -> bool:
+            checked.append(task)
+            return real_is_milestone(task, project_dir)
+
+        monkeypatch.setattr(roadmap_mod, "is_milestone_task", counting_is_milestone)
+        all_tasks = get_tasks(project)
+        graph = parse_task_graph(project)
+        done = {"## 001 - Only Task"}
+        assert get_ready_tasks(all_tasks, graph, done, project) == ["## 002 - Release"]
+        assert sorted(checked) == sorted(all_tasks)
+
 
 # -- print_dependency_graph ----------------------------------------------------
 
@@ -409,15 +453,11 @@ class TestGetReadyTasks:
 class TestPrintDependencyGraph:
     @staticmethod
     def _strip_ansi(text: str) -> str:
-        import re
-
-        return re.sub(r"\x1b\[[0-9;]*m", "", text)
+        return _SGR_RE.sub("", text)
 
     def test_prints_all_tasks(
         self, tmp_project: Path, capsys: pytest.CaptureFixture[str]
     ) -> None:
-        from runner.roadmap import print_dependency_graph
-
         print_dependency_graph(tmp_project)
         out = self._strip_ansi(capsys.readouterr().out)
         assert "001" in out
@@ -427,9 +467,6 @@ class TestPrintDependencyGraph:
     def test_shows_done_status(
         self, tmp_project: Path, capsys: pytest.CaptureFixture[str]
     ) -> None:
-        from runner.roadmap import print_dependency_graph
-        from runner.state import mark_done
-
         mark_done("## 001 - First Task", tmp_project)
         print_dependency_graph(tmp_project)
         out = self._strip_ansi(capsys.readouterr().out)
@@ -440,11 +477,9 @@ class TestPrintDependencyGraph:
 
 
 class TestGetDeployConfig:
-    def test_returns_roadmap_deploy_block(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_deploy_config
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_returns_roadmap_deploy_block(
+        self, make_project: Callable[..., Path]
+    ) -> None:
         roadmap = _minimal_roadmap(
             deploy={
                 "enabled": True,
@@ -452,43 +487,36 @@ class TestGetDeployConfig:
                 "env": {"app": "myapp"},
             }
         )
-        _write_roadmap(project, roadmap)
+        project = make_project(roadmap)
         cfg = get_deploy_config(project)
         assert cfg["enabled"] is True
         assert cfg["script"] == "scripts/deploy.sh"
         assert cfg["env"] == {"app": "myapp"}
 
-    def test_falls_back_to_deploy_json(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_deploy_config
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())  # no deploy block
-        (project / "deploy.json").write_text(
-            json.dumps({"provider": "fly", "app": "x"}), encoding="utf-8"
-        )
+    def test_falls_back_to_deploy_json(self, make_project: Callable[..., Path]) -> None:
+        project = make_project(_minimal_roadmap())  # no deploy block
+        (project / "deploy.json").write_bytes(b'{"provider": "fly", "app": "x"}')
         cfg = get_deploy_config(project)
         assert cfg["enabled"] is True
         assert cfg["env"] == {"provider": "fly", "app": "x"}
 
-    def test_legacy_deploy_false(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_deploy_config
+    def test_roadmap_block_ignores_deploy_json(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        project = make_project(_minimal_roadmap(deploy={"env": {"app": "new"}}))
+        (project / "deploy.json").write_bytes(b'{"deploy": false, "app": "old"}')
+        cfg = get_deploy_config(project)
+        assert cfg["enabled"] is True
+        assert cfg["env"] == {"app": "new"}
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
-        (project / "deploy.json").write_text(
-            json.dumps({"deploy": False, "app": "x"}), encoding="utf-8"
-        )
+    def test_legacy_deploy_false(self, make_project: Callable[..., Path]) -> None:
+        project = make_project(_minimal_roadmap())
+        (project / "deploy.json").write_bytes(b'{"deploy": false, "app": "x"}')
         cfg = get_deploy_config(project)
         assert cfg["enabled"] is False
 
-    def test_no_deploy_config(self, tmp_path: Path) -> None:
-        from runner.roadmap import get_deploy_config
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
+    def test_no_deploy_config(self, make_project: Callable[..., Path]) -> None:
+        project = make_project(_minimal_roadmap())
         cfg = get_deploy_config(project)
         assert cfg["enabled"] is False
 
@@ -497,28 +525,19 @@ class TestGetDeployConfig:
 
 
 class TestIsDeployTask:
-    def test_deploy_true(self, tmp_path: Path) -> None:
-        from runner.roadmap import is_deploy_task
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    @pytest.mark.parametrize(
+        ("fields", "task", "expected"),
+        [
+            ({"deploy": True}, "## 001 - Only Task", True),
+            ({}, "## 001 - Only Task", False),
+            ({}, "## 999 - Ghost", False),
+        ],
+        ids=["deploy_true", "deploy_absent", "unknown_task"],
+    )
+    def test_is_deploy_task(
+        self, make_project: Callable[..., Path], fields: dict, task: str, expected: bool
+    ) -> None:
         roadmap = _minimal_roadmap()
-        roadmap["tasks"][0]["deploy"] = True
-        _write_roadmap(project, roadmap)
-        assert is_deploy_task("## 001 - Only Task", project) is True
-
-    def test_deploy_absent(self, tmp_path: Path) -> None:
-        from runner.roadmap import is_deploy_task
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
-        assert is_deploy_task("## 001 - Only Task", project) is False
-
-    def test_unknown_task(self, tmp_path: Path) -> None:
-        from runner.roadmap import is_deploy_task
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _minimal_roadmap())
-        assert is_deploy_task("## 999 - Ghost", project) is False
+        roadmap["tasks"][0].update(fields)
+        project = make_project(roadmap)
+        assert is_deploy_task(task, project) is expected
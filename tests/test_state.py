@@ -1,90 +1,163 @@
 """Tests for runner.state — state persistence, budget tracking, token formatting."""
 
 import json
-from datetime import date, datetime, timezone
 from pathlib import Path
-from unittest.mock import patch
+from subprocess import CompletedProcess
 
 import pytest
 
-# ── _parse_tokens ──────────────────────────────────────────────────────────────
-
-
-class TestParseTokens:
-    def test_plain_number(self) -> None:
-        from runner.state import _parse_tokens
+import runner.state as state_mod
+from runner.config import _PRICES
+from runner.state import (
+    _BLENDED_USD_PER_TOKEN,
+    _format_duration,
+    _format_tokens,
+    _parse_tokens,
+    _tokens_to_usd,
+    get_token_stats,
+    load_project_budget,
+    load_runner_state,
+    mark_done,
+    record_project_spend,
+    runner_state_path,
+    save_runner_state,
+    task_done,
+)
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """Empty ``proj`` directory — no state or budget file yet."""
+    project = tmp_path / "proj"
+    project.mkdir()
+    return project
+
+
+def _seed_state(project: Path, data: bytes = b"{}") -> None:
+    """Write *data* as *project*'s ``.runner_state.json`` (empty state by default)."""
+    runner_state_path(project).write_bytes(data)
+
+
+def _roundtrip(
+    project: Path, task: str, attempt: int = 0, fix_logs: str | None = None
+) -> dict | None:
+    """Save *task* as the in-progress task of *project* and load it back."""
+    save_runner_state(project, task, attempt=attempt, fix_logs=fix_logs)
+    return load_runner_state(project)
+
+
+# Heading shared by the single-task state and budget tests.
+_TASK = "## 001 - Task"
+
+# Longer than the 3000 characters ``save_runner_state`` keeps.
+_LONG_LOGS = "x" * 5000
+
+# Old-format budget.json: no ``total_calls``, two recorded sessions.
+_LEGACY_BUDGET_BYTES = json.dumps(
+    {
+        "project": "proj",
+        "total_tokens": 100_000,
+        "sessions": [
+            {
+                "date": "2026-01-01",
+                "task": "## 001 - X",
+                "phase": "build",
+                "tokens": 50_000,
+                "attempt": 0,
+            },
+            {
+                "date": "2026-01-01",
+                "task": "## 002 - Y",
+                "phase": "build",
+                "tokens": 50_000,
+                "attempt": 0,
+            },
+        ],
+    }
+).encode("utf-8")
 
-        assert _parse_tokens("500") == 500.0
 
-    def test_thousands(self) -> None:
-        from runner.state import _parse_tokens
-
-        assert _parse_tokens("128.7K") == pytest.approx(128_700.0)
-
-    def test_millions(self) -> None:
-        from runner.state import _parse_tokens
+# ── _parse_tokens ──────────────────────────────────────────────────────────────
 
-        assert _parse_tokens("1.2M") == 1_200_000.0
 
-    def test_whitespace(self) -> None:
-        from runner.state import _parse_tokens
+class TestParseTokens:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("500", 500.0),
+            ("128.7K", 128_700.0),
+            ("1.2M", 1_200_000.0),
+            ("  42  ", 42.0),
+        ],
+        ids=["plain_number", "thousands", "millions", "whitespace"],
+    )
+    def test_parse_tokens(self, text: str, expected: float) -> None:
+        assert _parse_tokens(text) == pytest.approx(expected)
+
+
+# ── get_token_stats ────────────────────────────────────────────────────────────
+
+
+class TestGetTokenStats:
+    @pytest.fixture
+    def stats_output(self, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+        """Stub ``opencode stats``; tests append the stdout it should return."""
+        outputs: list[str] = []
+
+        def fake_run(cmd, **kwargs) -> CompletedProcess:
+            return CompletedProcess(cmd, 0, outputs[-1], "")
+
+        monkeypatch.setattr(state_mod.subprocess, "run", fake_run)
+        return outputs
+
+    def test_parses_all_counters(self, stats_output: list[str]) -> None:
+        stats_output.append(
+            "│ Input            12.5K │\n"
+            "│ Output            1.2M │\n"
+            "│ Cache Read         500 │\n"
+            "│ Cache Write        2K  │\n"
+        )
+        stats = get_token_stats()
+        assert stats == {
+            "input": 12_500,
+            "output": 1_200_000,
+            "cache_read": 500,
+            "cache_write": 2_000,
+            "total": 12_500 + 1_200_000 + 500 + 2_000,
+        }
 
-        assert _parse_tokens("  42  ") == 42.0
+    def test_missing_counters_default_to_zero(self, stats_output: list[str]) -> None:
+        stats_output.append("Output 7\n")
+        stats = get_token_stats()
+        assert stats["output"] == 7
+        assert stats["input"] == stats["cache_read"] == stats["cache_write"] == 0
+        assert stats["total"] == 7
 
 
 # ── _format_tokens ─────────────────────────────────────────────────────────────
 
 
 class TestFormatTokens:
-    def test_small(self) -> None:
-        from runner.state import _format_tokens
-
-        assert _format_tokens(850) == "850"
-
-    def test_thousands(self) -> None:
-        from runner.state import _format_tokens
-
-        assert _format_tokens(12500) == "12.5K"
-
-    def test_millions(self) -> None:
-        from runner.state import _format_tokens
-
-        assert _format_tokens(3_200_000) == "3.2M"
-
-    def test_exact_thousand(self) -> None:
-        from runner.state import _format_tokens
-
-        assert _format_tokens(1000) == "1.0K"
+    @pytest.mark.parametrize(
+        ("n", "expected"),
+        [(850, "850"), (12500, "12.5K"), (3_200_000, "3.2M"), (1000, "1.0K")],
+        ids=["small", "thousands", "millions", "exact_thousand"],
+    )
+    def test_format_tokens(self, n: int, expected: str) -> None:
+        assert _format_tokens(n) == expected
 
 
 # ── _format_duration ───────────────────────────────────────────────────────────
 
 
 class TestFormatDuration:
-    def test_seconds(self) -> None:
-        from runner.state import _format_duration
-
-        assert _format_duration(45) == "45s"
-
-    def test_minutes(self) -> None:
-        from runner.state import _format_duration
-
-        assert _format_duration(130) == "2m 10s"
-
-    def test_hours(self) -> None:
-        from runner.state import _format_duration
-
-        assert _format_duration(3720) == "1h 2m"
-
-    def test_exact_minute(self) -> None:
-        from runner.state import _format_duration
-
-        assert _format_duration(60) == "1m"
-
-    def test_exact_hour(self) -> None:
-        from runner.state import _format_duration
-
-        assert _format_duration(3600) == "1h"
+    @pytest.mark.parametrize(
+        ("seconds", "expected"),
+        [(45, "45s"), (130, "2m 10s"), (3720, "1h 2m"), (60, "1m"), (3600, "1h")],
+        ids=["seconds", "minutes", "hours", "exact_minute", "exact_hour"],
+    )
+    def test_format_duration(self, seconds: float, expected: str) -> None:
+        assert _format_duration(seconds) == expected
 
 
 # ── _tokens_to_usd ────────────────────────────────────────────────────────────
@@ -92,65 +165,44 @@ class TestFormatDuration:
 
 class TestTokensToUsd:
     def test_zero_tokens(self) -> None:
-        from runner.state import _tokens_to_usd
-
         stats = {"input": 0, "output": 0, "cache_read": 0, "cache_write": 0}
         assert _tokens_to_usd(stats) == 0.0
 
     def test_known_cost(self) -> None:
-        from runner.state import _tokens_to_usd
-
         # 1M input tokens at $1.25/M = $1.25
         stats = {"input": 1_000_000, "output": 0, "cache_read": 0, "cache_write": 0}
         result = _tokens_to_usd(stats)
         assert result == 1.25
 
+    def test_blended_rate_is_mean_price_per_token(self) -> None:
+        mean_per_million = sum(_PRICES.values()) / len(_PRICES)
+        assert _BLENDED_USD_PER_TOKEN * 1_000_000 == pytest.approx(mean_per_million)
+
 
 # ── Runner state persistence ──────────────────────────────────────────────────
 
 
 class TestRunnerState:
-    def test_save_and_load(self, tmp_path: Path) -> None:
-        from runner.state import load_runner_state, save_runner_state
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        # Create empty state file to start
-        (project / ".runner_state.json").write_text("{}", encoding="utf-8")
-
-        save_runner_state(project, "## 001 - Task", attempt=0, fix_logs=None)
-        state = load_runner_state(project)
+    def test_save_and_load(self, project: Path) -> None:
+        _seed_state(project)
+        state = _roundtrip(project, _TASK)
 
         assert state is not None
-        assert state["current_task"] == "## 001 - Task"
+        assert state["current_task"] == _TASK
         assert state["attempt"] == 0
         assert state["fix_logs"] is None
 
-    def test_load_returns_none_when_no_current(self, tmp_path: Path) -> None:
-        from runner.state import load_runner_state
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        (project / ".runner_state.json").write_text("{}", encoding="utf-8")
+    def test_load_returns_none_when_no_current(self, project: Path) -> None:
+        _seed_state(project)
         assert load_runner_state(project) is None
 
-    def test_load_no_state_file(self, tmp_path: Path) -> None:
-        from runner.state import load_runner_state
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_load_no_state_file(self, project: Path) -> None:
         assert load_runner_state(project) is None
 
-    def test_fix_logs_truncated_on_save(self, tmp_path: Path) -> None:
-        from runner.state import load_runner_state, save_runner_state
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        (project / ".runner_state.json").write_text("{}", encoding="utf-8")
+    def test_fix_logs_truncated_on_save(self, project: Path) -> None:
+        _seed_state(project)
 
-        long_logs = "x" * 5000
-        save_runner_state(project, "## 001 - Task", attempt=1, fix_logs=long_logs)
-        state = load_runner_state(project)
+        state = _roundtrip(project, _TASK, attempt=1, fix_logs=_LONG_LOGS)
         assert state is not None
         assert len(state["fix_logs"]) == 3000
 
@@ -159,38 +211,26 @@ class TestRunnerState:
 
 
 class TestMarkDone:
-    def test_marks_task_complete(self, tmp_path: Path) -> None:
-        from runner.state import mark_done, save_runner_state, task_done
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        (project / ".runner_state.json").write_text("{}", encoding="utf-8")
-
-        save_runner_state(project, "## 001 - Task", 0, None)
-        assert not task_done("## 001 - Task", project)
+    def test_marks_task_complete(self, project: Path) -> None:
+        _seed_state(project)
 
-        mark_done("## 001 - Task", project)
-        assert task_done("## 001 - Task", project)
+        save_runner_state(project, _TASK, 0, None)
+        assert not task_done(_TASK, project)
 
-    def test_clears_in_progress_fields(self, tmp_path: Path) -> None:
-        from runner.state import load_runner_state, mark_done, save_runner_state
+        mark_done(_TASK, project)
+        assert task_done(_TASK, project)
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        (project / ".runner_state.json").write_text("{}", encoding="utf-8")
+    def test_clears_in_progress_fields(self, project: Path) -> None:
+        _seed_state(project)
 
-        save_runner_state(project, "## 001 - Task", 2, "some logs")
-        mark_done("## 001 - Task", project)
+        save_runner_state(project, _TASK, 2, "some logs")
+        mark_done(_TASK, project)
 
         # After marking done, load_runner_state should return None (no current task)
         assert load_runner_state(project) is None
 
-    def test_multiple_tasks_done(self, tmp_path: Path) -> None:
-        from runner.state import mark_done, save_runner_state, task_done
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        (project / ".runner_state.json").write_text("{}", encoding="utf-8")
+    def test_multiple_tasks_done(self, project: Path) -> None:
+        _seed_state(project)
 
         save_runner_state(project, "## 001 - First", 0, None)
         mark_done("## 001 - First", project)
@@ -202,72 +242,78 @@ class TestMarkDone:
         assert task_done("## 002 - Second", project)
         assert not task_done("## 003 - Third", project)
 
+    def test_completed_set_reparsed_only_after_change(self, project: Path) -> None:
+        assert state_mod.completed_task_set(project) == frozenset()
+
+        state_mod.save_runner_state(project, "## 001 - First", 0, None)
+        state_mod._snapshot_for_key.cache_clear()
+        assert state_mod.completed_task_set(project) == frozenset()
+        assert not state_mod.task_done("## 001 - First", project)
+        assert state_mod._snapshot_for_key.cache_info().misses == 1
+
+        state_mod.mark_done("## 001 - First", project)
+        assert state_mod.completed_task_set(project) == frozenset({"## 001 - First"})
+
 
 # ── Project budget ─────────────────────────────────────────────────────────────
 
 
 class TestProjectBudget:
-    def test_load_fresh(self, tmp_path: Path) -> None:
-        from runner.state import load_project_budget
+    @pytest.fixture(autouse=True)
+    def _budget_state_in_tmp(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Keep the monthly call counter out of the working directory."""
+        monkeypatch.setattr(
+            state_mod, "_BUDGET_STATE_FILE", tmp_path / ".budget_state.json"
+        )
 
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_load_fresh(self, project: Path) -> None:
         budget = load_project_budget(project)
         assert budget["project"] == "proj"
         assert budget["total_tokens"] == 0
         assert budget["total_calls"] == 0
         assert budget["sessions"] == []
 
-    def test_record_spend(self, tmp_path: Path) -> None:
-        from runner.state import load_project_budget, record_project_spend
-
-        project = tmp_path / "proj"
-        project.mkdir()
-
-        total = record_project_spend(
-            project, "## 001 - Task", "build", 50_000, attempt=0
-        )
+    def test_record_spend(self, project: Path) -> None:
+        total = record_project_spend(project, _TASK, "build", 50_000, attempt=0)
         assert total == 50_000
 
         budget = load_project_budget(project)
         assert budget["total_tokens"] == 50_000
         assert budget["total_calls"] == 1
         assert len(budget["sessions"]) == 1
-        assert budget["sessions"][0]["task"] == "## 001 - Task"
+        assert budget["sessions"][0]["task"] == _TASK
         assert budget["sessions"][0]["phase"] == "build"
         assert budget["sessions"][0]["tokens"] == 50_000
 
-    def test_cumulative_spend(self, tmp_path: Path) -> None:
-        from runner.state import load_project_budget, record_project_spend
-
-        project = tmp_path / "proj"
-        project.mkdir()
-
-        record_project_spend(project, "## 001 - A", "build", 10_000)
-        total = record_project_spend(project, "## 002 - B", "build", 20_000)
-        assert total == 30_000
+    def test_budget_files_stay_human_readable(self, project: Path) -> None:
+        record_project_spend(project, _TASK, "build", 1_000)
+        assert b'\n  "total_tokens": 1000' in (project / "budget.json").read_bytes()
+        assert state_mod._BUDGET_STATE_FILE.read_bytes().startswith(b"{\n  ")
+
+    @pytest.mark.parametrize(
+        ("spends", "expected_total"),
+        [
+            ([("## 001 - A", 10_000), ("## 002 - B", 20_000)], 30_000),
+            # A call with 0 tokens still counts as an API invocation.
+            ([("## 001 - A", 0)], 0),
+        ],
+        ids=["cumulative_spend", "zero_delta_still_records_call"],
+    )
+    def test_spend_accumulates(
+        self, project: Path, spends: list[tuple[str, int]], expected_total: int
+    ) -> None:
+        for task, tokens in spends:
+            total = record_project_spend(project, task, "build", tokens)
+        assert total == expected_total
 
         budget = load_project_budget(project)
-        assert budget["total_calls"] == 2
-
-    def test_zero_delta_still_records_call(self, tmp_path: Path) -> None:
-        from runner.state import load_project_budget, record_project_spend
+        assert budget["total_tokens"] == expected_total
+        assert budget["total_calls"] == len(spends)
+        assert len(budget["sessions"]) == len(spends)
 
-        project = tmp_path / "proj"
-        project.mkdir()
-
-        record_project_spend(project, "## 001 - A", "build", 0)
-        budget = load_project_budget(project)
-        assert budget["total_tokens"] == 0
-        # A call with 0 tokens still counts as an API invocation.
-        assert budget["total_calls"] == 1
-        assert len(budget["sessions"]) == 1
-
-    def test_parallel_batch_recorded(self, tmp_path: Path) -> None:
-        from runner.state import load_project_budget, record_project_spend
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_parallel_batch_recorded(self, project: Path) -> None:
         batch = ["## 002 - Board Grid", "## 003 - Scoring Engine"]
 
         record_project_spend(
@@ -281,44 +327,14 @@ class TestProjectBudget:
         for session in budget["sessions"]:
             assert session["parallel_with"] == batch
 
-    def test_solo_task_has_no_parallel_with(self, tmp_path: Path) -> None:
-        from runner.state import load_project_budget, record_project_spend
-
-        project = tmp_path / "proj"
-        project.mkdir()
-
+    def test_solo_task_has_no_parallel_with(self, project: Path) -> None:
         record_project_spend(project, "## 001 - Solo", "build", 5_000)
         budget = load_project_budget(project)
         assert "parallel_with" not in budget["sessions"][0]
 
-    def test_legacy_budget_without_total_calls(self, tmp_path: Path) -> None:
+    def test_legacy_budget_without_total_calls(self, project: Path) -> None:
         """Old budget.json files missing total_calls derive it from session count."""
-        from runner.state import load_project_budget
-
-        project = tmp_path / "proj"
-        project.mkdir()
-        # Simulate old format without total_calls
-        old_data = {
-            "project": "proj",
-            "total_tokens": 100_000,
-            "sessions": [
-                {
-                    "date": "2026-01-01",
-                    "task": "## 001 - X",
-                    "phase": "build",
-                    "tokens": 50_000,
-                    "attempt": 0,
-                },
-                {
-                    "date": "2026-01-01",
-                    "task": "## 002 - Y",
-                    "phase": "build",
-                    "tokens": 50_000,
-                    "attempt": 0,
-                },
-            ],
-        }
-        (project / "budget.json").write_text(json.dumps(old_data), encoding="utf-8")
+        (project / "budget.json").write_bytes(_LEGACY_BUDGET_BYTES)
         budget = load_project_budget(project)
         # Should derive total_calls from number of sessions
         assert budget["total_calls"] == 2
@@ -330,29 +346,20 @@ class TestProjectBudget:
 class TestLegacyState:
     """Verify old .runner_state.json formats are handled gracefully."""
 
-    def test_bare_string_completed(self, tmp_path: Path) -> None:
-        from runner.state import task_done
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_bare_string_completed(self, project: Path) -> None:
         # Old format: completed was a list of strings, not dicts
-        state = {
-            "current_task": None,
-            "attempt": 0,
-            "fix_logs": None,
-            "completed": ["## 001 - Old Task"],
-        }
-        (project / ".runner_state.json").write_text(json.dumps(state), encoding="utf-8")
+        _seed_state(
+            project,
+            b'{"current_task":null,"attempt":0,"fix_logs":null,'
+            b'"completed":["## 001 - Old Task"]}',
+        )
         assert task_done("## 001 - Old Task", project)
 
-    def test_old_task_key(self, tmp_path: Path) -> None:
-        from runner.state import load_runner_state
-
-        project = tmp_path / "proj"
-        project.mkdir()
+    def test_old_task_key(self, project: Path) -> None:
         # Old format used 'task' instead of 'current_task'
-        state = {"task": "## 001 - Legacy", "attempt": 1, "fix_logs": "err"}
-        (project / ".runner_state.json").write_text(json.dumps(state), encoding="utf-8")
+        _seed_state(
+            project, b'{"task":"## 001 - Legacy","attempt":1,"fix_logs":"err"}'
+        )
         loaded = load_runner_state(project)
         assert loaded is not None
         assert loaded["current_task"] == "## 001 - Legacy"
@@ -1,6 +1,7 @@
 """Tests for runner.workspace -- ecosystem detection, scaffolding, git ops, deploy."""
 
 import json
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
@@ -8,10 +9,6 @@ import pytest
 # -- helpers -------------------------------------------------------------------
 
 
-def _write_roadmap(project: Path, data: dict) -> None:
-    (project / "ROADMAP.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
-
-
 def _simple_roadmap(ecosystem: str = "python", **overrides) -> dict:
     base: dict = {
         "name": "P",
@@ -35,86 +32,112 @@ def _simple_roadmap(ecosystem: str = "python", **overrides) -> dict:
 
 
 class TestDetectEcosystem:
-    def test_roadmap_ecosystem_declaration(self, tmp_path: Path) -> None:
-        from runner.workspace import _detect_ecosystem
+    def test_marker_case_insensitive_on_windows(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from runner import workspace as ws
 
         project = tmp_path / "proj"
         project.mkdir()
-        _write_roadmap(project, _simple_roadmap("deno"))
+        (project / "Package.json").write_text("{}", encoding="utf-8")
+        assert ws._detect_ecosystem(project) == "python"
+        monkeypatch.setattr(ws, "_IS_WINDOWS", True)
+        assert ws._detect_ecosystem(project) == "node"
+
+    def test_roadmap_ecosystem_declaration(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        from runner.workspace import _detect_ecosystem
+
+        project = make_project(_simple_roadmap("deno"))
         assert _detect_ecosystem(project) == "deno"
 
-    def test_deno_json_heuristic(self, tmp_path: Path) -> None:
+    def test_deno_json_heuristic(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _detect_ecosystem
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(ecosystem=""))
+        project = make_project(_simple_roadmap(ecosystem=""))
         (project / "deno.json").write_text("{}", encoding="utf-8")
         assert _detect_ecosystem(project) == "deno"
 
-    def test_package_json_heuristic(self, tmp_path: Path) -> None:
+    def test_package_json_heuristic(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _detect_ecosystem
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(ecosystem=""))
+        project = make_project(_simple_roadmap(ecosystem=""))
         (project / "package.json").write_text("{}", encoding="utf-8")
         assert _detect_ecosystem(project) == "node"
 
-    def test_go_mod_heuristic(self, tmp_path: Path) -> None:
+    def test_go_mod_heuristic(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _detect_ecosystem
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(ecosystem=""))
+        project = make_project(_simple_roadmap(ecosystem=""))
         (project / "go.mod").write_text("module test\n", encoding="utf-8")
         assert _detect_ecosystem(project) == "go"
 
-    def test_cargo_toml_heuristic(self, tmp_path: Path) -> None:
+    def test_cargo_toml_heuristic(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _detect_ecosystem
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(ecosystem=""))
+        project = make_project(_simple_roadmap(ecosystem=""))
         (project / "Cargo.toml").write_text("[package]\n", encoding="utf-8")
         assert _detect_ecosystem(project) == "rust"
 
-    def test_fallback_python(self, tmp_path: Path) -> None:
+    def test_fallback_python(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _detect_ecosystem
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(ecosystem=""))
+        project = make_project(_simple_roadmap(ecosystem=""))
         assert _detect_ecosystem(project) == "python"
 
-    def test_roadmap_overrides_heuristic(self, tmp_path: Path) -> None:
+    def test_roadmap_overrides_heuristic(
+        self, make_project: Callable[..., Path]
+    ) -> None:
         from runner.workspace import _detect_ecosystem
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap("python"))
+        project = make_project(_simple_roadmap("python"))
         (project / "package.json").write_text("{}", encoding="utf-8")
         assert _detect_ecosystem(project) == "python"
 
+    def test_marker_priority_when_several_present(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        from runner.workspace import _detect_ecosystem
+
+        project = make_project(_simple_roadmap(ecosystem=""))
+        for name in ("Cargo.toml", "go.mod", "package.json", "deno.jsonc"):
+            (project / name).write_text("{}", encoding="utf-8")
+        assert _detect_ecosystem(project) == "deno"
+
+    def test_probes_share_one_directory_listing(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import runner.workspace as ws
+
+        project = make_project(_simple_roadmap(ecosystem=""))
+        (project / "Cargo.toml").write_text("[package]\n", encoding="utf-8")
+        listed: list[Path] = []
+        real_dir_entries = ws._dir_entries
+
+        def counting_dir_entries(directory: Path) -> set[str]:
+            listed.append(directory)
+            return real_dir_entries(directory)
+
+        monkeypatch.setattr(ws, "_dir_entries", counting_dir_entries)
+        assert ws._detect_ecosystem(project) == "rust"
+        assert listed == [project]
+
 
 # -- _pkg_name -----------------------------------------------------------------
 
 
 class TestPkgName:
-    def test_python_replaces_hyphens(self, tmp_path: Path) -> None:
+    def test_python_replaces_hyphens(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _pkg_name
 
-        project = tmp_path / "my-project"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap("python"))
+        project = make_project(_simple_roadmap("python"), name="my-project")
         assert _pkg_name(project) == "my_project"
 
-    def test_non_python_uses_dirname(self, tmp_path: Path) -> None:
+    def test_non_python_uses_dirname(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _pkg_name
 
-        project = tmp_path / "my-app"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap("node"))
+        project = make_project(_simple_roadmap("node"), name="my-app")
         assert _pkg_name(project) == "my-app"
 
 
@@ -122,30 +145,41 @@ class TestPkgName:
 
 
 class TestDirs:
-    def test_python_src_dir(self, tmp_path: Path) -> None:
+    def test_python_src_dir(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import src_dir
 
-        project = tmp_path / "my-proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap("python"))
+        project = make_project(_simple_roadmap("python"), name="my-proj")
         assert src_dir(project) == project / "my_proj"
 
-    def test_node_src_dir(self, tmp_path: Path) -> None:
+    def test_node_src_dir(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import src_dir
 
-        project = tmp_path / "app"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap("node"))
+        project = make_project(_simple_roadmap("node"), name="app")
         assert src_dir(project) == project / "src"
 
-    def test_go_src_dir(self, tmp_path: Path) -> None:
+    def test_go_src_dir(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import src_dir
 
-        project = tmp_path / "app"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap("go"))
+        project = make_project(_simple_roadmap("go"), name="app")
         assert src_dir(project) == project
 
+    def test_python_src_dir_detects_ecosystem_once(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import runner.workspace as ws
+
+        project = make_project(_simple_roadmap("python"), name="my-proj")
+        detected: list[Path] = []
+        real_detect = ws._detect_ecosystem
+
+        def counting_detect(project_dir: Path) -> str:
+            detected.append(project_dir)
+            return real_detect(project_dir)
+
+        monkeypatch.setattr(ws, "_detect_ecosystem", counting_detect)
+        assert ws.src_dir(project) == project / "my_proj"
+        assert detected == [project]
+
     def test_tests_dir(self, tmp_path: Path) -> None:
         from runner.workspace import tests_dir
 
@@ -162,7 +196,7 @@ class TestWriteIfAbsent:
         from runner.workspace import _write_if_absent
 
         f = tmp_path / "new.txt"
-        assert _write_if_absent(f, "content") is True
+        assert _write_if_absent(f, b"content") is True
         assert f.read_text() == "content"
 
     def test_skips_existing_file(self, tmp_path: Path) -> None:
@@ -170,49 +204,85 @@ class TestWriteIfAbsent:
 
         f = tmp_path / "existing.txt"
         f.write_text("original", encoding="utf-8")
-        assert _write_if_absent(f, "overwrite") is False
+        assert _write_if_absent(f, b"overwrite") is False
         assert f.read_text() == "original"
 
     def test_creates_parent_dirs(self, tmp_path: Path) -> None:
         from runner.workspace import _write_if_absent
 
         f = tmp_path / "deep" / "nested" / "file.txt"
-        assert _write_if_absent(f, "deep") is True
+        assert _write_if_absent(f, b"deep") is True
         assert f.exists()
 
 
+# -- _resolved -----------------------------------------------------------------
+
+
+class TestResolved:
+    def test_relative_path_follows_cwd(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from runner.workspace import _resolved
+
+        (tmp_path / "a" / "proj").mkdir(parents=True)
+        (tmp_path / "b" / "proj").mkdir(parents=True)
+        monkeypatch.chdir(tmp_path / "a")
+        assert _resolved(Path("proj")) == (tmp_path / "a" / "proj").resolve()
+        monkeypatch.chdir(tmp_path / "b")
+        assert _resolved(Path("proj")) == (tmp_path / "b" / "proj").resolve()
+
+
 # -- get_roadmap_project_context -----------------------------------------------
 
 
 class TestGetRoadmapProjectContext:
-    def test_returns_preamble_text(self, tmp_path: Path) -> None:
+    def test_returns_preamble_text(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import get_roadmap_project_context
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(preamble="Some architecture notes."))
+        project = make_project(_simple_roadmap(preamble="Some architecture notes."))
         ctx = get_roadmap_project_context(project)
         assert "architecture notes" in ctx
 
-    def test_empty_when_no_preamble(self, tmp_path: Path) -> None:
+    def test_empty_when_no_preamble(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import get_roadmap_project_context
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(preamble=""))
+        project = make_project(_simple_roadmap(preamble=""))
         ctx = get_roadmap_project_context(project)
         assert ctx.strip() == ""
 
+    def test_missing_or_invalid_roadmap(self, tmp_path: Path) -> None:
+        from runner.workspace import get_roadmap_project_context
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        assert get_roadmap_project_context(project) == ""
+        (project / "ROADMAP.json").write_text("{not json", encoding="utf-8")
+        assert get_roadmap_project_context(project) == ""
+
+    def test_reparses_only_after_change(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        import runner.workspace as ws
+
+        project = make_project(_simple_roadmap(preamble="first"))
+        ws._parse_roadmap_file.cache_clear()
+        assert ws.get_roadmap_project_context(project) == "first"
+        assert ws.get_roadmap_project_context(project) == "first"
+        assert ws._parse_roadmap_file.cache_info().misses == 1
+
+        make_project(_simple_roadmap(preamble="second, longer"))
+        assert ws.get_roadmap_project_context(project) == "second, longer"
+
 
 # -- _load_deploy_config -------------------------------------------------------
 
 
 class TestLoadDeployConfig:
-    def test_loads_from_roadmap_deploy_block(self, tmp_path: Path) -> None:
+    def test_loads_from_roadmap_deploy_block(
+        self, make_project: Callable[..., Path]
+    ) -> None:
         from runner.workspace import _load_deploy_config
 
-        project = tmp_path / "proj"
-        project.mkdir()
         roadmap = _simple_roadmap(
             deploy={
                 "enabled": True,
@@ -220,7 +290,7 @@ class TestLoadDeployConfig:
                 "env": {"provider": "fly", "app": "myapp", "region": "fra"},
             }
         )
-        _write_roadmap(project, roadmap)
+        project = make_project(roadmap)
         result = _load_deploy_config(project)
         assert result == {
             "DEPLOY_PROVIDER": "fly",
@@ -228,12 +298,12 @@ class TestLoadDeployConfig:
             "DEPLOY_REGION": "fra",
         }
 
-    def test_loads_from_legacy_deploy_json(self, tmp_path: Path) -> None:
+    def test_loads_from_legacy_deploy_json(
+        self, make_project: Callable[..., Path]
+    ) -> None:
         from runner.workspace import _load_deploy_config
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap())  # no deploy block
+        project = make_project(_simple_roadmap())  # no deploy block
         config = {"provider": "fly", "app": "myapp", "region": "fra"}
         (project / "deploy.json").write_text(json.dumps(config), encoding="utf-8")
         result = _load_deploy_config(project)
@@ -243,20 +313,16 @@ class TestLoadDeployConfig:
             "DEPLOY_REGION": "fra",
         }
 
-    def test_missing_file(self, tmp_path: Path) -> None:
+    def test_missing_file(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _load_deploy_config
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap())
+        project = make_project(_simple_roadmap())
         assert _load_deploy_config(project) == {}
 
-    def test_malformed_json(self, tmp_path: Path) -> None:
+    def test_malformed_json(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _load_deploy_config
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap())
+        project = make_project(_simple_roadmap())
         (project / "deploy.json").write_text("{bad json", encoding="utf-8")
         assert _load_deploy_config(project) == {}
 
@@ -266,18 +332,17 @@ class TestLoadDeployConfig:
 
 class TestListProjects:
     def test_finds_projects_with_roadmap(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        make_project: Callable[..., Path],
     ) -> None:
         import runner.workspace as ws
 
         projects_root = tmp_path / "projects"
         projects_root.mkdir()
-        p1 = projects_root / "alpha"
-        p1.mkdir()
-        _write_roadmap(p1, _simple_roadmap())
-        p2 = projects_root / "beta"
-        p2.mkdir()
-        _write_roadmap(p2, _simple_roadmap())
+        make_project(_simple_roadmap(), name="projects/alpha")
+        make_project(_simple_roadmap(), name="projects/beta")
         p3 = projects_root / "gamma"
         p3.mkdir()
 
@@ -298,60 +363,123 @@ class TestListProjects:
         monkeypatch.setattr(ws, "PROJECTS_ROOT", projects_root)
         assert ws.list_projects() == []
 
+    def test_missing_projects_root(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import runner.workspace as ws
+
+        monkeypatch.setattr(ws, "PROJECTS_ROOT", tmp_path / "nope")
+        assert ws.list_projects() == []
+
+    def test_sorted_and_skips_plain_files(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        make_project: Callable[..., Path],
+    ) -> None:
+        import runner.workspace as ws
+
+        projects_root = tmp_path / "projects"
+        for name in ("zeta", "alpha"):
+            make_project(_simple_roadmap(), name=f"projects/{name}")
+        (projects_root / "notes.txt").write_text("x", encoding="utf-8")
+        monkeypatch.setattr(ws, "PROJECTS_ROOT", projects_root)
+        assert ws.list_projects() == [projects_root / "alpha", projects_root / "zeta"]
+
 
 # -- _project_status -----------------------------------------------------------
 
 
 class TestProjectStatus:
-    def test_no_tasks(self, tmp_path: Path) -> None:
+    def test_no_tasks(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _project_status
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(tasks=[]))
+        project = make_project(_simple_roadmap(tasks=[]))
         badge, _ = _project_status(project)
         assert badge == "no tasks"
 
-    def test_not_started(self, tmp_path: Path) -> None:
+    def test_not_started(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import _project_status
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap())
+        project = make_project(_simple_roadmap())
         badge, detail = _project_status(project)
         assert badge == "not started"
         assert "0 / 1" in detail
 
-    def test_complete(self, tmp_path: Path) -> None:
+    def test_complete(self, make_project: Callable[..., Path]) -> None:
         from runner.state import mark_done, save_runner_state
         from runner.workspace import _project_status
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap())
+        project = make_project(_simple_roadmap())
         (project / ".runner_state.json").write_text("{}", encoding="utf-8")
         save_runner_state(project, "## 001 - A", 0, None)
         mark_done("## 001 - A", project)
         badge, _ = _project_status(project)
         assert badge == "complete"
 
+    def test_interrupted_reports_task_position(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        from runner.workspace import _project_status
+
+        roadmap = _simple_roadmap()
+        roadmap["tasks"].append(
+            {"id": 2, "title": "B", "depends_on": [1], "outputs": ["y.py"]}
+        )
+        project = make_project(roadmap)
+        (project / ".runner_state.json").write_text(
+            json.dumps({"current_task": "## 002 - B"}), encoding="utf-8"
+        )
+        badge, detail = _project_status(project)
+        assert badge == "interrupted"
+        assert detail.endswith("interrupted at task 2")
+
+    def test_project_statuses_keep_input_order(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        from runner.workspace import project_statuses
+
+        projects = []
+        for i, state in enumerate(["{}", '{"completed": ["## 001 - A"]}'] * 3):
+            project = make_project(_simple_roadmap(), name=f"proj{i}")
+            (project / ".runner_state.json").write_text(state, encoding="utf-8")
+            projects.append(project)
+
+        badges = [badge for badge, _ in project_statuses(projects)]
+        assert badges == ["not started", "complete"] * 3
+
+    def test_unchanged_files_are_not_reparsed(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        import runner.state as state_mod
+        import runner.workspace as ws
+
+        project = make_project(_simple_roadmap())
+        assert ws._project_status(project)[0] == "not started"
+        assert ws._project_status(project)[0] == "not started"
+        assert state_mod._snapshot_for_key.cache_info().misses == 1
+
+        (project / ".runner_state.json").write_text(
+            '{"completed": ["## 001 - A"]}', encoding="utf-8"
+        )
+        assert ws._project_status(project)[0] == "complete"
+        assert state_mod._snapshot_for_key.cache_info().misses == 2
+
 
 # -- commit_and_merge (selective staging) --------------------------------------
 
 
 class TestCommitAndMergeSelective:
     def test_selective_adds_only_listed_files(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         from runner.workspace import commit_and_merge
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(git={"enabled": True}))
+        project = make_project(_simple_roadmap(git={"enabled": True}))
 
-        calls: list[str] = []
+        calls: list[list[str]] = []
 
-        def fake_git_run(cmd: str, proj: Path) -> bool:
+        def fake_git_run(cmd: list[str], proj: Path) -> bool:
             calls.append(cmd)
             return True
 
@@ -361,24 +489,62 @@ class TestCommitAndMergeSelective:
             "## 001 - Task", project, task_outputs=["src/a.py", "src/b.py"]
         )
 
-        assert 'add "src/a.py"' in calls
-        assert 'add "src/b.py"' in calls
-        assert "add ." not in calls
+        assert ["add", "--", "src/a.py", "src/b.py"] in calls
+        assert ["add", "."] not in calls
         # Verify commit message strips ## prefix.
-        assert 'commit -m "feat: 001 - Task"' in calls
+        assert ["commit", "-m", "feat: 001 - Task"] in calls
 
-    def test_no_outputs_does_add_all(
+    def test_quote_in_task_title_passed_verbatim(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from runner.workspace import commit_and_merge
+
+        project = make_project(_simple_roadmap(git={"enabled": True}))
+
+        calls: list[list[str]] = []
+
+        def fake_git_run(cmd: list[str], proj: Path) -> bool:
+            calls.append(cmd)
+            return True
+
+        monkeypatch.setattr("runner.workspace.git_run", fake_git_run)
+        monkeypatch.setattr("runner.workspace._git_has_remote", lambda p: False)
+        commit_and_merge('## 003 - Support 12" displays', project, ['a "b.py'])
+
+        assert ["add", "--", 'a "b.py'] in calls
+        assert ["commit", "-m", 'feat: 003 - Support 12" displays'] in calls
+
+    def test_failed_batch_add_retries_each_path(
         self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from runner.workspace import _git_add_paths
+
+        calls: list[list[str]] = []
+
+        def fake_git_run(cmd: list[str], proj: Path) -> bool:
+            calls.append(cmd)
+            return "missing.py" not in cmd
+
+        monkeypatch.setattr("runner.workspace.git_run", fake_git_run)
+        _git_add_paths(["a.py", "missing.py", "b.py"], tmp_path)
+
+        assert calls == [
+            ["add", "--", "a.py", "missing.py", "b.py"],
+            ["add", "--", "a.py"],
+            ["add", "--", "missing.py"],
+            ["add", "--", "b.py"],
+        ]
+
+    def test_no_outputs_does_add_all(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         from runner.workspace import commit_and_merge
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(git={"enabled": True}))
+        project = make_project(_simple_roadmap(git={"enabled": True}))
 
-        calls: list[str] = []
+        calls: list[list[str]] = []
 
-        def fake_git_run(cmd: str, proj: Path) -> bool:
+        def fake_git_run(cmd: list[str], proj: Path) -> bool:
             calls.append(cmd)
             return True
 
@@ -386,20 +552,43 @@ class TestCommitAndMergeSelective:
         monkeypatch.setattr("runner.workspace._git_has_remote", lambda p: True)
         commit_and_merge("## 001 - Task", project, task_outputs=None)
 
-        assert "add ." in calls
+        assert ["add", "."] in calls
 
-    def test_push_skipped_when_no_remote(
+    def test_remote_probed_once_per_config_version(
         self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import runner.workspace as ws
+
+        probes: list[list[str]] = []
+
+        def fake_returncode(argv: list[str]) -> int:
+            probes.append(argv)
+            return 0
+
+        monkeypatch.setattr(ws, "_git_returncode", fake_returncode)
+        config = tmp_path / ".git" / "config"
+        config.parent.mkdir()
+        config.write_bytes(b"[core]\n")
+        assert ws._git_has_remote(tmp_path) is True
+        (tmp_path / "sub").mkdir()
+        assert ws._git_has_remote(tmp_path / "sub" / "..") is True
+        assert len(probes) == 1
+
+        # ``git remote add`` rewrites .git/config — the probe must rerun.
+        config.write_bytes(b'[core]\n[remote "origin"]\n')
+        assert ws._git_has_remote(tmp_path) is True
+        assert len(probes) == 2
+
+    def test_push_skipped_when_no_remote(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         from runner.workspace import commit_and_merge
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(git={"enabled": True}))
+        project = make_project(_simple_roadmap(git={"enabled": True}))
 
-        calls: list[str] = []
+        calls: list[list[str]] = []
 
-        def fake_git_run(cmd: str, proj: Path) -> bool:
+        def fake_git_run(cmd: list[str], proj: Path) -> bool:
             calls.append(cmd)
             return True
 
@@ -410,17 +599,15 @@ class TestCommitAndMergeSelective:
         assert not any("push" in c for c in calls)
 
     def test_skipped_when_git_not_managed(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         from runner.workspace import commit_and_merge
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap())  # no git block
+        project = make_project(_simple_roadmap())  # no git block
 
-        calls: list[str] = []
+        calls: list[list[str]] = []
 
-        def fake_git_run(cmd: str, proj: Path) -> bool:
+        def fake_git_run(cmd: list[str], proj: Path) -> bool:
             calls.append(cmd)
             return True
 
@@ -430,22 +617,183 @@ class TestCommitAndMergeSelective:
         assert calls == []  # no git commands should run
 
 
+# -- _patch_tsconfig_for_tests ------------------------------------------------
+
+
+class TestPatchTsconfigForTests:
+    def test_adds_types_from_dev_dependencies(self, tmp_path: Path) -> None:
+        from runner.workspace import _patch_tsconfig_for_tests
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "package.json").write_text(
+            json.dumps(
+                {"dependencies": {"zod": "1"}, "devDependencies": {"jest": "29"}}
+            ),
+            encoding="utf-8",
+        )
+        (project / "tsconfig.json").write_text(
+            '{\n  // comment\n  "compilerOptions": {}\n}\n', encoding="utf-8"
+        )
+        _patch_tsconfig_for_tests(project)
+        cfg = json.loads((project / "tsconfig.json").read_bytes())
+        assert cfg["compilerOptions"]["types"] == ["jest"]
+
+    def test_no_test_stack_leaves_file_untouched(self, tmp_path: Path) -> None:
+        from runner.workspace import _patch_tsconfig_for_tests
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "package.json").write_text("{}", encoding="utf-8")
+        original = '{"compilerOptions": {}}'
+        (project / "tsconfig.json").write_text(original, encoding="utf-8")
+        _patch_tsconfig_for_tests(project)
+        assert (project / "tsconfig.json").read_text(encoding="utf-8") == original
+
+    def test_skips_when_inputs_unchanged(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import os
+
+        from runner import workspace as ws
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        pkg = project / "package.json"
+        pkg.write_text(json.dumps({"devDependencies": {"jest": "29"}}), "utf-8")
+        tsconfig = project / "tsconfig.json"
+        tsconfig.write_text('{"compilerOptions": {}}', encoding="utf-8")
+        applied: list[Path] = []
+        real_apply = ws._apply_tsconfig_test_patch
+
+        def counting_apply(project_dir: Path) -> bool:
+            applied.append(project_dir)
+            return real_apply(project_dir)
+
+        monkeypatch.setattr(ws, "_apply_tsconfig_test_patch", counting_apply)
+        ws._patch_tsconfig_for_tests(project)
+        ws._patch_tsconfig_for_tests(project)
+        assert len(applied) == 1
+        assert json.loads(tsconfig.read_bytes())["compilerOptions"]["types"] == ["jest"]
+
+        # A package.json change invalidates the recorded patch.
+        st = pkg.stat()
+        os.utime(pkg, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        ws._patch_tsconfig_for_tests(project)
+        assert len(applied) == 2
+        assert not list(project.glob(".runner_*"))
+
+    def test_failed_patch_is_retried(self, tmp_path: Path) -> None:
+        from runner import workspace as ws
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "package.json").write_text('{"devDependencies": {"jest": "29"}}')
+        tsconfig = project / "tsconfig.json"
+        tsconfig.write_text("{not json", encoding="utf-8")
+        ws._patch_tsconfig_for_tests(project)
+        assert project not in ws._TSCONFIG_PATCHED
+
+        tsconfig.write_text('{"compilerOptions": {}}', encoding="utf-8")
+        ws._patch_tsconfig_for_tests(project)
+        assert json.loads(tsconfig.read_bytes())["compilerOptions"]["types"] == ["jest"]
+        assert project in ws._TSCONFIG_PATCHED
+
+
+# -- install_project_dependencies ----------------------------------------------
+
+
+class TestInstallProjectDependencies:
+    def test_runs_every_manifest_and_keeps_pip_order(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import subprocess
+        import threading
+
+        from runner.workspace import install_project_dependencies
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        for name in ("requirements.txt", "pyproject.toml", "package.json"):
+            (project / name).write_text("", encoding="utf-8")
+
+        seen: list[list[str]] = []
+        lock = threading.Lock()
+
+        def spy_run(argv: list[str], **kwargs: object) -> subprocess.CompletedProcess:
+            with lock:
+                seen.append(argv)
+            return subprocess.CompletedProcess(argv, 0, "", "")
+
+        monkeypatch.setattr("runner.workspace.subprocess.run", spy_run)
+        install_project_dependencies(project)
+
+        assert len(seen) == 3
+        pip_calls = [a for a in seen if "pip" in a]
+        assert "-r" in pip_calls[0] and "-e" in pip_calls[1]
+        assert any(a[-1] == "install" and "pip" not in a for a in seen)
+
+
+# -- ensure_project_git --------------------------------------------------------
+
+
+class TestEnsureProjectGit:
+    def test_existing_repo_skips_roadmap_parse(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from runner.workspace import ensure_project_git
+
+        project = tmp_path / "proj"
+        (project / ".git").mkdir(parents=True)
+
+        def boom(_p: Path) -> bool:
+            raise AssertionError("ROADMAP should not be consulted")
+
+        monkeypatch.setattr("runner.roadmap.is_git_managed", boom)
+        ensure_project_git(project)
+
+    def test_bootstrap_steps_run_independently(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import subprocess
+
+        from runner.workspace import ensure_project_git
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        seen: list[list[str]] = []
+
+        def spy_run(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess:
+            seen.append(cmd[3:])
+            return subprocess.CompletedProcess(cmd, 1 if "commit" in cmd else 0)
+
+        monkeypatch.setattr("runner.roadmap.is_git_managed", lambda _p: True)
+        monkeypatch.setattr("runner.workspace.subprocess.run", spy_run)
+        ensure_project_git(project)
+        # A failed initial commit must not skip the branch setup.
+        assert seen == [
+            ["init"],
+            ["add", "."],
+            ["commit", "-m", "chore: initial project scaffold"],
+            ["branch", "-M", "main"],
+            ["checkout", "-b", "develop"],
+        ]
+
+
 # -- tag_milestone -------------------------------------------------------------
 
 
 class TestTagMilestone:
     def test_git_commands_sequence(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         from runner.workspace import tag_milestone
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap(git={"enabled": True}))
+        project = make_project(_simple_roadmap(git={"enabled": True}))
 
-        calls: list[str] = []
+        calls: list[list[str]] = []
 
-        def fake_git_run(cmd: str, proj: Path) -> bool:
+        def fake_git_run(cmd: list[str], proj: Path) -> bool:
             calls.append(cmd)
             return True
 
@@ -454,25 +802,22 @@ class TestTagMilestone:
         tag_milestone("0.2.0", project)
 
         assert calls == [
-            "add .",
-            'commit --allow-empty -m "milestone: v0.2.0"',
-            "tag v0.2.0",
-            "push origin develop",
-            "push origin v0.2.0",
+            ["add", "."],
+            ["commit", "--allow-empty", "-m", "milestone: v0.2.0"],
+            ["tag", "v0.2.0"],
+            ["push", "origin", "develop", "v0.2.0"],
         ]
 
     def test_skipped_when_git_not_managed(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         from runner.workspace import tag_milestone
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap())  # no git block
+        project = make_project(_simple_roadmap())  # no git block
 
-        calls: list[str] = []
+        calls: list[list[str]] = []
 
-        def fake_git_run(cmd: str, proj: Path) -> bool:
+        def fake_git_run(cmd: list[str], proj: Path) -> bool:
             calls.append(cmd)
             return True
 
@@ -487,17 +832,14 @@ class TestTagMilestone:
 
 class TestTryDeployHookDeployFalse:
     def test_skips_when_deploy_disabled(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """ROADMAP deploy.enabled=false must suppress the hook entirely."""
         import subprocess
 
         from runner.workspace import try_deploy_hook
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        roadmap = _simple_roadmap(deploy={"enabled": False})
-        _write_roadmap(project, roadmap)
+        project = make_project(_simple_roadmap(deploy={"enabled": False}))
         # Create a deploy script so the hook *would* run if not blocked.
         scripts = project / "scripts"
         scripts.mkdir()
@@ -517,16 +859,14 @@ class TestTryDeployHookDeployFalse:
         assert ran == [], "deploy hook should have been skipped"
 
     def test_skips_when_legacy_deploy_false(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Legacy deploy.json with deploy=false must suppress the hook."""
         import subprocess
 
         from runner.workspace import try_deploy_hook
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap())  # no deploy block
+        project = make_project(_simple_roadmap())  # no deploy block
         (project / "deploy.json").write_text(
             json.dumps({"deploy": False, "app": "x"}), encoding="utf-8"
         )
@@ -548,17 +888,15 @@ class TestTryDeployHookDeployFalse:
         assert ran == [], "deploy hook should have been skipped"
 
     def test_runs_when_deploy_enabled(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """ROADMAP deploy.enabled=true should run the hook."""
         from runner.workspace import try_deploy_hook
 
-        project = tmp_path / "proj"
-        project.mkdir()
         roadmap = _simple_roadmap(deploy={"enabled": True, "env": {"app": "x"}})
         # Mark the task for deploy
         roadmap["tasks"][0]["deploy"] = True
-        _write_roadmap(project, roadmap)
+        project = make_project(roadmap)
         scripts = project / "scripts"
         scripts.mkdir()
         (scripts / "deploy.ps1").write_text("# no-op", encoding="utf-8")
@@ -582,6 +920,22 @@ class TestTryDeployHookDeployFalse:
         try_deploy_hook("## 001 - A", project)
         assert called_cmds, "deploy hook should have run"
 
+    def test_unflagged_task_skips_deploy_config(
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A task without ``deploy: true`` returns before loading deploy config."""
+        import runner.roadmap as roadmap_mod
+        from runner.workspace import try_deploy_hook
+
+        project = make_project(_simple_roadmap(deploy={"enabled": True}))
+        monkeypatch.delenv("RUNNER_NO_DEPLOY", raising=False)
+
+        def fail(_project_dir: Path) -> dict:
+            raise AssertionError("deploy config should not be loaded")
+
+        monkeypatch.setattr(roadmap_mod, "get_deploy_config", fail)
+        try_deploy_hook("## 001 - A", project)
+
 
 # -- _ensure_logs_gitignored --------------------------------------------------
 
@@ -610,6 +964,36 @@ class TestEnsureLogsGitignored:
         # 'logs/' must appear exactly once.
         assert content.count("logs/") == 1
 
+    def test_commented_or_nested_entry_does_not_count(self, tmp_path: Path) -> None:
+        from runner.workspace import _ensure_logs_gitignored
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        gitignore = project / ".gitignore"
+        gitignore.write_text("# logs/\nbuild/logs/", encoding="utf-8")
+        _ensure_logs_gitignored(project)
+        lines = gitignore.read_text(encoding="utf-8").splitlines()
+        assert lines[:2] == ["# logs/", "build/logs/"]
+        assert lines[-1] == "logs/"
+
+    def test_read_only_gitignore_already_listing_logs(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from runner.workspace import _ensure_logs_gitignored
+
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / ".gitignore").write_text("logs/\n", encoding="utf-8")
+        real_open = Path.open
+
+        def read_only_open(self: Path, mode: str = "r", *args, **kwargs):
+            if "+" in mode or "a" in mode or "w" in mode:
+                raise PermissionError(13, "Permission denied", str(self))
+            return real_open(self, mode, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "open", read_only_open)
+        _ensure_logs_gitignored(project)  # must not raise
+
     def test_no_gitignore_does_nothing(self, tmp_path: Path) -> None:
         from runner.workspace import _ensure_logs_gitignored
 
@@ -628,15 +1012,12 @@ class TestGenerateProjectAgentsMd:
 
     def _make_project(
         self,
-        tmp_path: Path,
+        make_project: Callable[..., Path],
         ecosystem: str = "python",
         name: str = "My Project",
         preamble: str = "",
     ) -> Path:
-        project = tmp_path / "my_project"
-        project.mkdir()
-        _write_roadmap(
-            project,
+        return make_project(
             {
                 "name": name,
                 "ecosystem": ecosystem,
@@ -658,61 +1039,67 @@ class TestGenerateProjectAgentsMd:
                     },
                 ],
             },
+            name="my_project",
         )
-        return project
 
-    def test_creates_file(self, tmp_path: Path) -> None:
+    def test_creates_file(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path)
+        project = self._make_project(make_project)
         generate_project_agents_md(project)
         assert (project / "AGENTS.md").exists()
 
-    def test_contains_project_name(self, tmp_path: Path) -> None:
+    def test_contains_project_name(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path, name="Awesome Engine")
+        project = self._make_project(make_project, name="Awesome Engine")
         generate_project_agents_md(project)
         content = (project / "AGENTS.md").read_text(encoding="utf-8")
         assert "Awesome Engine" in content
 
-    def test_contains_preamble(self, tmp_path: Path) -> None:
+    def test_contains_preamble(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path, preamble="A retro space shooter game.")
+        project = self._make_project(
+            make_project, preamble="A retro space shooter game."
+        )
         generate_project_agents_md(project)
         content = (project / "AGENTS.md").read_text(encoding="utf-8")
         assert "A retro space shooter game." in content
 
-    def test_ecosystem_python_guidelines(self, tmp_path: Path) -> None:
+    def test_ecosystem_python_guidelines(
+        self, make_project: Callable[..., Path]
+    ) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path, ecosystem="python")
+        project = self._make_project(make_project, ecosystem="python")
         generate_project_agents_md(project)
         content = (project / "AGENTS.md").read_text(encoding="utf-8")
         assert "ruff" in content.lower()
         assert "pytest" in content.lower()
 
-    def test_ecosystem_deno_guidelines(self, tmp_path: Path) -> None:
+    def test_ecosystem_deno_guidelines(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path, ecosystem="deno")
+        project = self._make_project(make_project, ecosystem="deno")
         generate_project_agents_md(project)
         content = (project / "AGENTS.md").read_text(encoding="utf-8")
         assert "deno check" in content.lower()
 
-    def test_ecosystem_node_guidelines(self, tmp_path: Path) -> None:
+    def test_ecosystem_node_guidelines(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path, ecosystem="node")
+        project = self._make_project(make_project, ecosystem="node")
         generate_project_agents_md(project)
         content = (project / "AGENTS.md").read_text(encoding="utf-8")
         assert "tsc" in content.lower()
 
-    def test_contains_roadmap_task_format(self, tmp_path: Path) -> None:
+    def test_contains_roadmap_task_format(
+        self, make_project: Callable[..., Path]
+    ) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path)
+        project = self._make_project(make_project)
         generate_project_agents_md(project)
         content = (project / "AGENTS.md").read_text(encoding="utf-8")
         # Should document the task JSON fields.
@@ -720,44 +1107,48 @@ class TestGenerateProjectAgentsMd:
         assert '"depends_on"' in content
         assert '"acceptance"' in content
 
-    def test_contains_scope_rules(self, tmp_path: Path) -> None:
+    def test_contains_scope_rules(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path)
+        project = self._make_project(make_project)
         generate_project_agents_md(project)
         content = (project / "AGENTS.md").read_text(encoding="utf-8")
         assert "outputs" in content
         assert "git push" in content or "git commit" in content
 
-    def test_contains_pipeline_phases(self, tmp_path: Path) -> None:
+    def test_contains_pipeline_phases(self, make_project: Callable[..., Path]) -> None:
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path)
+        project = self._make_project(make_project)
         generate_project_agents_md(project)
         content = (project / "AGENTS.md").read_text(encoding="utf-8")
         assert "Build" in content
         assert "Document" in content
 
-    def test_overwrite_on_second_call(self, tmp_path: Path) -> None:
-        """Calling the function twice rewrites the file (no duplicate content)."""
+    def test_unchanged_content_not_rewritten(
+        self, make_project: Callable[..., Path]
+    ) -> None:
+        """A second call with the same ROADMAP leaves the file untouched."""
+        import os
+
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path)
+        project = self._make_project(make_project)
         generate_project_agents_md(project)
-        first = (project / "AGENTS.md").read_text(encoding="utf-8")
+        agents = project / "AGENTS.md"
+        first = agents.read_text(encoding="utf-8")
+        os.utime(agents, ns=(1_000_000_000, 1_000_000_000))
         generate_project_agents_md(project)
-        second = (project / "AGENTS.md").read_text(encoding="utf-8")
-        # Timestamps differ so content will differ slightly — but the heading
-        # should appear exactly once (not doubled).
+        assert agents.stat().st_mtime_ns == 1_000_000_000
+        second = agents.read_text(encoding="utf-8")
+        assert first == second
         assert second.count("## Project overview") == 1
-        # Core content is still present.
-        assert "## Scope rules" in second
 
-    def test_not_in_gitignore(self, tmp_path: Path) -> None:
+    def test_not_in_gitignore(self, make_project: Callable[..., Path]) -> None:
         """AGENTS.md must NOT be added to .gitignore — it should be committed."""
         from runner.workspace import generate_project_agents_md
 
-        project = self._make_project(tmp_path)
+        project = self._make_project(make_project)
         gitignore = project / ".gitignore"
         gitignore.write_text("node_modules/\nlogs/\n", encoding="utf-8")
         generate_project_agents_md(project)
@@ -765,7 +1156,7 @@ class TestGenerateProjectAgentsMd:
         assert "AGENTS.md" not in content
 
     def test_auto_called_first_run_in_ensure_workspace_dirs(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """ensure_workspace_dirs generates AGENTS.md when it does not yet exist."""
         from runner import workspace as ws
@@ -781,15 +1172,13 @@ class TestGenerateProjectAgentsMd:
         monkeypatch.setattr(ws, "ensure_project_git", lambda _p: None)
         monkeypatch.setattr(ws, "_ensure_logs_gitignored", lambda _p: None)
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap("python"))
+        project = make_project(_simple_roadmap("python"))
         # AGENTS.md absent → should call generate.
         ws.ensure_workspace_dirs(project)
         assert calls == [project]
 
     def test_not_auto_called_when_agents_md_exists(
-        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+        self, make_project: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """ensure_workspace_dirs skips generation when AGENTS.md already exists."""
         from runner import workspace as ws
@@ -805,9 +1194,7 @@ class TestGenerateProjectAgentsMd:
         monkeypatch.setattr(ws, "ensure_project_git", lambda _p: None)
         monkeypatch.setattr(ws, "_ensure_logs_gitignored", lambda _p: None)
 
-        project = tmp_path / "proj"
-        project.mkdir()
-        _write_roadmap(project, _simple_roadmap("python"))
+        project = make_project(_simple_roadmap("python"))
         (project / "AGENTS.md").write_text("# existing\n", encoding="utf-8")
         # AGENTS.md present → should NOT call generate.
         ws.ensure_workspace_dirs(project)